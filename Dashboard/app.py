@@ -1,20 +1,30 @@
 import streamlit as st
 import datetime
+import gzip
 import os
-import pickle
-import airportsdata
+
+# Encoders, airport names and the dataset are loaded once per server process
+# and shared read-only by every session (see resources.py)
+from resources import (get_airport_names, get_delay_model, get_label_encoders, get_origin_classes,
+                       get_risk_cube, get_score_cache, get_snapshot, resource_stats_frame, tracked)
+# Section timings of this run and of each fragment's last run (add ?timing=1 to the URL)
+from rerun_timing import RerunTimer, timings_frame
+# Process-wide latency histograms of the hot paths (DASHBOARD_METRICS=1, admin page at ?admin=1)
+import metrics
+
+timer = RerunTimer('app')
+SHOW_TIMING = st.query_params.get('timing') == '1'
 
 # configure encoders
-# Note: This assumes './Dashboard/label_encoders.pkl' exists relative to where the app is run.
-try:
-    with open('./Dashboard/label_encoders.pkl', 'rb') as file:
-        data = pickle.load(file)
-except FileNotFoundError:
-    st.error("Error: label_encoders.pkl not found. Please ensure the file is in the correct path.")
-    data = None # Set data to None if file not found
-except Exception as e:
-    st.error(f"Error loading label encoders: {e}")
-    data = None
+with timer.section('label encoders'):
+    try:
+        data = get_label_encoders()
+    except FileNotFoundError:
+        st.error("Error: label_encoders.pkl not found. Please ensure the file is in the correct path.")
+        data = None # Set data to None if file not found
+    except Exception as e:
+        st.error(f"Error loading label encoders: {e}")
+        data = None
 
 
 # ==========================================
@@ -41,47 +51,45 @@ except ImportError:
 # ==========================================
 # 2. DATA LOADING
 # ==========================================
+from flight_store import sample_flights
+from sampling import DEFAULT_STRATA
+from snapshot import snapshot_params
+
 # Set the CSV file path - assumes it's in the same directory as app.py
 script_dir = os.path.dirname(os.path.abspath(__file__))
 CSV_FILE_PATH = os.path.join(script_dir, 'procesed_flight_data.csv.gz')
+# Partitioned Parquet copy of the CSV (built with flight_store.py); preferred when present
+STORE_DIR = os.path.join(script_dir, 'flight_store')
 
-@st.cache_data
-def load_data(file_path):
+# Sample mix: 70% very low (0.1-25), 20% medium (25-60), 10% high (60+) of 5000 flights.
+# Each stratum is (lower, upper, share) with lower < weatherScore <= upper.
+SAMPLE_SIZE = 5000
+SAMPLE_STRATA = DEFAULT_STRATA
+# Years left out of the viewer's flight picker
+VIEWER_EXCLUDED_YEARS = [2020, 2021, 2022]
+
+
+def load_snapshot_for(file_path):
+    """The memory-mapped snapshot (built with snapshot.py) if it is fresh for `file_path` and STORE_DIR, else None."""
+    if not HAS_PANDAS:
+        return None
+    params = snapshot_params(SAMPLE_SIZE, SAMPLE_STRATA, 42, VIEWER_EXCLUDED_YEARS)
+    try:
+        return get_snapshot(file_path, params, STORE_DIR)
+    except Exception as e:
+        st.warning(f"Ignoring the dashboard snapshot: {e}")
+        return None
+
+
+@st.cache_resource
+@tracked('dataset')
+@metrics.timed('load_data')
+def load_data(file_path, store_dir=STORE_DIR, total=SAMPLE_SIZE, strata=SAMPLE_STRATA, seed=42):
     """Load data with bias toward lower weatherScore to show most flights have low risk."""
     if not HAS_PANDAS:
         return None
     try:
-        chunks = pd.read_csv(file_path, compression='gzip', chunksize=10000)
-        df = pd.concat(chunk.sample(n=5000, random_state=42) for chunk in chunks if len(chunk) >= 5000)
-        df.columns = df.columns.str.strip()
-    
-        if len(df) == 0:
-            return None
-        
-        # Stratified sampling adjusted for actual data distribution
-        # 70% very low (0.1-25), 20% medium (25-60), 10% high (60+)
-        very_low_score = df[(df['weatherScore'] > 0) & (df['weatherScore'] <= 25)]
-        medium_score = df[(df['weatherScore'] > 25) & (df['weatherScore'] < 60)]
-        high_score = df[df['weatherScore'] >= 60]
-        
-        # Calculate target sample sizes (total 5000)
-        n_very_low = int(5000 * 0.70)   # 3500 flights
-        n_medium = int(5000 * 0.20)     # 1000 flights  
-        n_high = int(5000 * 0.10)       # 500 flights
-        
-        # Sample from each stratum
-        sampled_parts = []
-        if len(very_low_score) > 0:
-            sampled_parts.append(very_low_score.sample(n=min(n_very_low, len(very_low_score)), random_state=42))
-        if len(medium_score) > 0:
-            sampled_parts.append(medium_score.sample(n=min(n_medium, len(medium_score)), random_state=42))
-        if len(high_score) > 0:
-            sampled_parts.append(high_score.sample(n=min(n_high, len(high_score)), random_state=42))
-        
-        # Combine and shuffle
-        result = pd.concat(sampled_parts, ignore_index=True).sample(frac=1, random_state=42)
-        return result if len(result) > 0 else df.sample(n=min(5000, len(df)), random_state=42)
-        
+        return sample_flights(file_path, store_dir, total=total, strata=strata, seed=seed)
     except FileNotFoundError:
         st.error(f"File not found: {file_path}")
         return None
@@ -89,23 +97,49 @@ def load_data(file_path):
         st.error(f"Error loading data: {e}")
         return None
 
-TEST_DATA_DF = load_data(CSV_FILE_PATH)
-
 
 # ==========================================
 # FILTER: Only keep flights with Risk > 0
 # ==========================================
-if TEST_DATA_DF is not None and 'weatherScore' in TEST_DATA_DF.columns:
-    TEST_DATA_DF = TEST_DATA_DF[TEST_DATA_DF['weatherScore'] > 0]
-elif TEST_DATA_DF is None:
+@st.cache_resource
+@tracked('flight_sample')
+def load_flight_sample(file_path):
+    """The sample restricted to flights with Risk > 0, filtered once per process."""
+    snapshot = load_snapshot_for(file_path)
+    if snapshot is not None:
+        # Already filtered; the columns are views of the mapped files
+        return snapshot.frame
+    df = load_data(file_path)
+    if df is None or 'weatherScore' not in df.columns:
+        return df
+    return df[df['weatherScore'] > 0]
+
+with timer.section('dataset'):
+    TEST_DATA_DF = load_flight_sample(CSV_FILE_PATH)
+
+if TEST_DATA_DF is None:
     st.error("Cannot load flight data. Stopping execution.")
-    # don't stop here if user only wants to use custom page, but as requested we preserve original behavior:
-    st.stop()
-elif data is None:
-    st.error("Cannot load label encoders. Stopping execution.")
     st.stop()
 
 
+# ==========================================
+# VIEWER INDEX: built once per loaded sample
+# ==========================================
+@st.cache_resource
+@tracked('viewer_index')
+def load_viewer_index(file_path):
+    """Filters the sample for the viewer and precomputes both dropdowns' options."""
+    snapshot = load_snapshot_for(file_path)
+    if snapshot is not None:
+        return snapshot.viewer_frame(), snapshot.flights, snapshot.routes
+    # Flight numbers (6 low / 3 medium / 1 high risk), shuffled to mix them up in the dropdown
+    df, flight_numbers = viewer_flights(load_flight_sample(file_path), VIEWER_EXCLUDED_YEARS, seed=42)
+    # Route options per flight number, so picking a flight is a dictionary hit
+    with metrics.timer('route_index'):
+        routes = route_options(build_flight_index(df), flight_numbers, get_origin_classes(), get_airport_names())
+    return df, flight_numbers, routes
+
+
 # ==========================================
 # 3. SOUTHWEST STYLING (CSS) - THEME UPGRADE
 # ==========================================
@@ -214,7 +248,6 @@ SOUTHWEST_CSS = """
     }
 </style>
 """
-st.markdown(SOUTHWEST_CSS, unsafe_allow_html=True)
 
 # --- FORCE expander headers to be white-on-blue, no matter what ---
 NUKE_EXPANDER_CSS = """
@@ -238,41 +271,27 @@ summary div {
 }
 </style>
 """
-st.markdown(NUKE_EXPANDER_CSS, unsafe_allow_html=True)
+# Injected once per full run; fragment reruns leave it in place
+with timer.section('css'):
+    st.markdown(SOUTHWEST_CSS + NUKE_EXPANDER_CSS, unsafe_allow_html=True)
 
 
 # ==========================================
 # 4. LOGIC & HEURISTIC ENGINE
 # ==========================================
-def calculate_risk_score(weather, flight_data):
-    """Calculates the 'Weather Delay Risk' Score (0-100)."""
-    risk = 0.0
-    
-    if weather['wspd'] > 40:
-        risk += 30
-    elif weather['wspd'] > 25:
-        risk += 15
-    
-    if weather['prcp'] > 15:
-        risk += 35
-    elif weather['prcp'] > 0:
-        risk += 10
-    
-    if weather['snow'] > 0:
-        risk += 40
-    
-    if weather['pres'] < 1005:
-        risk += 25
-    elif weather['pres'] > 1020:
-        risk += 10
-    
-    if flight_data['dep_time'] > 1800:
-        risk += 5
-    
-    if flight_data['distance'] > 2000:
-        risk += 5
-    
-    return max(0.0, min(100.0, risk))
+# The heuristic, the status tiers and the factor explanations live in
+# scoring.py so they can run without Streamlit (see service.py) and score whole
+# DataFrames or column arrays at once.
+from scoring import contributing_factors, risk_tier
+# The exported LightGBM model (if any) is loaded once per process; without it
+# predict_row falls back to the heuristic score. Single-flight scores and
+# predictions go through a process-wide LRU/TTL cache keyed on quantized
+# inputs (see score_cache.py).
+from score_cache import cached_predict_row, cached_risk_score
+from flight_index import build_flight_index, route_options, viewer_flights
+from bulk_scoring import (MAX_DOWNLOAD_MB, MAX_UPLOAD_MB, SCHEDULE_COLUMNS, new_result_path, read_result,
+                          remove_expired, score_schedule)
+from sweep import MAX_STEPS, SWEEP_INPUTS, axis_label, axis_values, display_grid, sweep_csv, sweep_scores
 
 
 # ==========================================
@@ -281,272 +300,216 @@ def calculate_risk_score(weather, flight_data):
 # We will have a top-level sidebar with two pages:
 # - "Flight Risk Viewer" (existing flow)
 # - "Custom Weather Calculator" (new)
+# Widgets inside an @st.fragment rerun only that fragment: the CSS, the
+# dataset checks and the other pages are not evaluated again.
 if 'viewer_page' not in st.session_state:
     st.session_state.viewer_page = 'landing'  # internal state for the flight viewer sub-pages
 if 'selected_flight' not in st.session_state:
     st.session_state.selected_flight = None
 
-# Sidebar navigation (Option C)
-page_selection = st.sidebar.radio(
-    "Navigation Bar",
-    options=["✈️ Flight Risk Viewer", "📊 Custom Score Calculator"],
-    index=0
-)
+
+def publish_timing(run_timer):
+    """Keeps this run's section timings for the timing panel."""
+    if SHOW_TIMING:
+        st.session_state.setdefault('rerun_timings', {})[run_timer.scope] = run_timer.rows()
+
+
+def show_fragment_timing(run_timer):
+    """Publishes a fragment run's timings and shows them under it; the sidebar panel only redraws on full runs."""
+    if SHOW_TIMING:
+        publish_timing(run_timer)
+        st.caption("⏱️ " + " · ".join(f"{row['section']} {row['ms']:.1f} ms" for row in run_timer.rows()))
+
+
+with timer.section('sidebar'):
+    # Sidebar navigation (Option C)
+    page_selection = st.sidebar.radio(
+        "Navigation Bar",
+        options=["✈️ Flight Risk Viewer", "📊 Custom Score Calculator", "🗺️ Network Risk Heatmap",
+                 "📤 Bulk Schedule Scoring"]
+                + (["🛠️ Admin Metrics"] if st.query_params.get('admin') == '1' else []),
+        index=0
+    )
+
+    # Resource cache instrumentation: load counts and memory footprint (add ?debug=1 to the URL)
+    if st.query_params.get('debug') == '1':
+        with st.sidebar.expander("⚙️ Resource Cache", expanded=True):
+            st.dataframe(resource_stats_frame(), hide_index=True, use_container_width=True)
+        with st.sidebar.expander("⚙️ Score Cache", expanded=True):
+            st.json(get_score_cache().stats())
 
 # --- LOGO & TITLE SECTION (top of page, shared) ---
-col_logo, col_text = st.columns([2, 3])
-with col_logo:
-    # Use st.image for better size control in a column
-    st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/c/c4/Southwest_Airlines_logo_2014.svg/320px-Southwest_Airlines_logo_2014.svg.png", width=500)
+with timer.section('header'):
+    col_logo, col_text = st.columns([2, 3])
+    with col_logo:
+        # Use st.image for better size control in a column
+        st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/c/c4/Southwest_Airlines_logo_2014.svg/320px-Southwest_Airlines_logo_2014.svg.png", width=500)
 
-st.markdown('<div class="sw-stripe"></div>', unsafe_allow_html=True)
+    st.markdown('<div class="sw-stripe"></div>', unsafe_allow_html=True)
 
 
 # ---------------------------
 # PAGE: Flight Risk Viewer
 # ---------------------------
-if page_selection == "✈️ Flight Risk Viewer":
-    # Keep original behavior: if no CSV or encoders, app previously stops; replicate that
-    if TEST_DATA_DF is None:
-        st.error("❌ CSV file not found!")
-        st.info(f"Looking for: {CSV_FILE_PATH}")
-        st.stop()
-    if data is None:
-        st.stop() # already handled error above
+def safe_float(value):
+    try:
+        v = float(value)
+        return 0 if pd.isna(v) else v
+    except:
+        return 0
 
-    # Subpage: landing (picker) or result
-    if st.session_state.viewer_page == 'landing':
-        # FIX: Load airport data once for better dropdown display
-        airports = airportsdata.load('IATA') 
-        st.title("Flight Delay Predictor ✈️")
-        st.markdown("""
-            <div style='
-                text-align: left; 
-                color: #000000; 
-                font-size: 20px; 
-                font-family: "Helvetica Neue", Helvetica, Arial, sans-serif;
-                font-weight: 800; 
-                margin-bottom: 50px; 
-            '>
-                Enter your flight number to get started!
-            </div>
-        """, unsafe_allow_html=True)
-        
-        TEST_DATA_DF = TEST_DATA_DF[~TEST_DATA_DF['Year'].isin([2020, 2021, 2022])]
-
-        # Step 1: Get unique flight numbers with balanced risk distribution
-        # Separate flights by risk category
-        low_risk_flights = TEST_DATA_DF[TEST_DATA_DF['weatherScore'] < 35]
-        medium_risk_flights = TEST_DATA_DF[(TEST_DATA_DF['weatherScore'] >= 35) & (TEST_DATA_DF['weatherScore'] < 65)]
-        high_risk_flights = TEST_DATA_DF[TEST_DATA_DF['weatherScore'] >= 65]
-
-        flight_numbers = []
-
-        # Helper function to extract unique flight numbers from a dataframe
-        def get_unique_flights(df, max_count):
-            flights = []
-            for index, row in df.iterrows():
-                flight_num = row.get('Flight_Number_Reporting_Airline', 'N/A')
-                if flight_num != 'N/A':
-                    try:
-                        flight_num = f"WN{int(float(flight_num))}"
-                    except:
-                        flight_num = f"WN{flight_num}"
-                if flight_num not in flights and flight_num not in flight_numbers:
-                    flights.append(flight_num)
-                    if len(flights) >= max_count:
-                        break
-            return flights
-
-        # Get 6 low-risk, 3 medium-risk, 1 high-risk (total 10)
-        flight_numbers.extend(get_unique_flights(low_risk_flights, 6))
-        flight_numbers.extend(get_unique_flights(medium_risk_flights, 3))
-        flight_numbers.extend(get_unique_flights(high_risk_flights, 1))
-
-        # Shuffle to mix them up in the dropdown
-        import random
-        random.Random(42).shuffle(flight_numbers)  # Use seed for consistency
-        
-        selected_flight_num = st.selectbox(
-            "📊 Select a flight number:",
-            options=flight_numbers,
-            key="flight_select"
-        )
-        
-        # Step 2: Get all routes for this flight number
-        matching_rows = []
-        for index, row in TEST_DATA_DF.iterrows():
-            # 1. Identify Flight Number
-            row_flight_num = row.get('Flight_Number_Reporting_Airline', 'N/A')
-            if row_flight_num != 'N/A':
-                try:
-                    # Normalize flight number to match selection (e.g. 2606.0 -> WN2606)
-                    f_str = f"WN{int(float(row_flight_num))}"
-                except:
-                    f_str = f"WN{row_flight_num}"
-            
-            # 2. If this row matches the selected flight...
-            if f_str == selected_flight_num:
-                raw_origin = row.get('Origin', 'N/A')
-                raw_dest = row.get('Dest', 'N/A')
-                
-                # 3. FIX: Try to decode names with full airport details
-                try:
-                    # Get IATA codes using the label encoder
-                    origin_idx = int(float(raw_origin))
-                    dest_idx = int(float(raw_dest))
-                    
-                    origin_iata = data['Origin'].classes_[origin_idx]
-                    dest_iata = data['Origin'].classes_[dest_idx]
-                    
-                    # Get full airport info
-                    originInfo = airports.get(origin_iata)
-                    destInfo = airports.get(dest_iata)
-                    
-                    # Build the user-friendly label
-                    origin_display = f"{originInfo.get('name', origin_iata)} ({origin_iata})" if originInfo else origin_iata
-                    dest_display = f"{destInfo.get('name', dest_iata)} ({dest_iata})" if destInfo else dest_iata
-                    
-                    route_label = f"{origin_display} → {dest_display}"
-                    
-                except Exception:
-                    # Fallback if label encoding or IATA lookup fails
-                    # --- The FIX: Don't skip! Use raw values if lookup fails ---
-                    route_label = f"{raw_origin} → {raw_dest}"
-
-                matching_rows.append({
-                    'label': route_label,
-                    'index': index
-                })
-        
-        # Remove duplicates but keep index
-        unique_routes = []
-        seen = set()
-        for item in matching_rows:
-            if item['label'] not in seen:
-                unique_routes.append(item)
-                seen.add(item['label'])
-        
-        route_options = [r['label'] for r in unique_routes]
-        
-        selected_route = st.selectbox(
-            "📍 Select a route:",
-            options=route_options,
-            key="route_select"
-        )
-        
-        if st.button("Analyze", key="analyze_btn", use_container_width=True):
-            # Find the index for this route
+
+def airport_code(value, origin_classes):
+    """IATA code for an encoded Origin/Dest id, or the raw value if it cannot be decoded."""
+    try:
+        return str(origin_classes[int(float(value))])
+    except Exception:
+        return str(value)
+
+
+def flight_details(selected_row, origin_classes):
+    """Everything the result subpage shows for one dataset row, so it never reads the dataset."""
+    selected_index = selected_row.name
+
+    # Format the data
+    flight_num = str(selected_row.get('Flight_Number_Reporting_Airline', 'N/A'))
+    if flight_num != 'N/A':
+        try:
+            flight_num = f"WN{int(float(flight_num))}"
+        except:
+            flight_num = f"WN{flight_num}"
+
+    # --- NEW DATE FORMATTING LOGIC ---
+    try:
+        # 1. Try to grab Month, Day, and Year
+        # Use .get() to be safe. Default Year to 2024 if missing.
+        mm = int(float(selected_row.get('Month', 0)))
+        dd = int(float(selected_row.get('DayofMonth', 0)))
+        yy = int(float(selected_row.get('Year', 2024)))
+
+        # 2. Convert to "September 10, 2024" format
+        date_str = datetime.date(yy, mm, dd).strftime("%B %d, %Y")
+    except Exception:
+        # Fallback: If 'Month' is missing, stick to the old Quarter format
+        date_str = f"Q{selected_row.get('Quarter', 'N/A')} Day {selected_row.get('DayofMonth', 'N/A')}"
+    # -----------------------------------
+
+    flight_data = {
+        "id": selected_index,
+        "source": "CSV",
+        "flight_num": flight_num,
+        "date": date_str,  # <--- Uses the new formatted string
+        "origin": airport_code(selected_row.get('Origin', 'N/A'), origin_classes),
+        "dest": airport_code(selected_row.get('Dest', 'N/A'), origin_classes),
+        "distance": safe_float(selected_row.get('Distance', 0)),
+        "dep_time": int(selected_row.get('CRSDepTime', 0)),
+        "weather_raw": {
+            'tavg': safe_float(selected_row.get('tavg', 0)),
+            'prcp': safe_float(selected_row.get('prcp', 0)),
+            'snow': safe_float(selected_row.get('snow', 0)),
+            'wspd': safe_float(selected_row.get('wspd', 0)),
+            'pres': safe_float(selected_row.get('pres', 0)),
+        },
+        "true_weather_score": float(selected_row.get('weatherScore', 0))
+    }
+    with metrics.timer('predict'):
+        value, kind = cached_predict_row(get_score_cache(), get_delay_model(), selected_row.to_dict(), origin_classes)
+    flight_data["prediction"] = {'value': value, 'kind': kind}
+    return flight_data
+
+
+@st.fragment
+def viewer_landing():
+    """Flight and route pickers; changing the flight reruns only this fragment."""
+    run = RerunTimer('viewer')
+    st.title("Flight Delay Predictor ✈️")
+    st.markdown("""
+        <div style='
+            text-align: left; 
+            color: #000000; 
+            font-size: 20px; 
+            font-family: "Helvetica Neue", Helvetica, Arial, sans-serif;
+            font-weight: 800; 
+            margin-bottom: 50px; 
+        '>
+            Enter your flight number to get started!
+        </div>
+    """, unsafe_allow_html=True)
+
+    # Filtered sample, shuffled flight numbers and every flight's routes are
+    # built once per process, so reruns are cache and dictionary hits
+    with run.section('viewer index'):
+        viewer_df, flight_numbers, routes = load_viewer_index(CSV_FILE_PATH)
+
+    selected_flight_num = st.selectbox(
+        "📊 Select a flight number:",
+        options=flight_numbers,
+        key="flight_select"
+    )
+
+    # Step 2: Get all routes for this flight number
+    with run.section('route list'), metrics.timer('route_list'):
+        unique_routes = routes.get(selected_flight_num, [])
+        route_labels = [r['label'] for r in unique_routes]
+
+    selected_route = st.selectbox(
+        "📍 Select a route:",
+        options=route_labels,
+        key="route_select"
+    )
+
+    if st.button("Analyze", key="analyze_btn", use_container_width=True):
+        with run.section('analyze'):
+            # Find the row for this route
             selected_route_obj = next(r for r in unique_routes if r['label'] == selected_route)
-            selected_index = selected_route_obj['index']
-            selected_row = TEST_DATA_DF.loc[selected_index]
-            
-            # Format the data
-            flight_num = str(selected_row.get('Flight_Number_Reporting_Airline', 'N/A'))
-            if flight_num != 'N/A':
-                try:
-                    flight_num = f"WN{int(float(flight_num))}"
-                except:
-                    flight_num = f"WN{flight_num}"
-
-            # --- NEW DATE FORMATTING LOGIC ---
-            try:
-                # 1. Try to grab Month, Day, and Year
-                # Use .get() to be safe. Default Year to 2024 if missing.
-                mm = int(float(selected_row.get('Month', 0)))
-                dd = int(float(selected_row.get('DayofMonth', 0)))
-                yy = int(float(selected_row.get('Year', 2024)))
-                
-                # 2. Convert to "September 10, 2024" format
-                date_str = datetime.date(yy, mm, dd).strftime("%B %d, %Y")
-            except Exception:
-                # Fallback: If 'Month' is missing, stick to the old Quarter format
-                date_str = f"Q{selected_row.get('Quarter', 'N/A')} Day {selected_row.get('DayofMonth', 'N/A')}"    
-            # -----------------------------------
-
-            def safe_float(value):
-                try:
-                    v = float(value)
-                    return 0 if pd.isna(v) else v
-                except:
-                    return 0
-
-            flight_data = {
-                "id": selected_index,
-                "source": "CSV",
-                "flight_num": flight_num,
-                "date": date_str,  # <--- Uses the new formatted string
-                "origin": str(selected_row.get('Origin', 'N/A')),
-                "dest": str(selected_row.get('Dest', 'N/A')),
-                "distance": safe_float(selected_row.get('Distance', 0)),
-                "dep_time": int(selected_row.get('CRSDepTime', 0)),
-                "weather_raw": {
-                    'tavg': safe_float(selected_row.get('tavg', 0)),
-                    'prcp': safe_float(selected_row.get('prcp', 0)),
-                    'snow': safe_float(selected_row.get('snow', 0)),
-                    'wspd': safe_float(selected_row.get('wspd', 0)),
-                    'pres': safe_float(selected_row.get('pres', 0)),
-                },
-                "true_weather_score": float(selected_row.get('weatherScore', 0))
-            }
-            st.session_state.selected_flight = flight_data
+            selected_row = viewer_df.iloc[selected_route_obj['position']]
+            st.session_state.selected_flight = flight_details(selected_row, get_origin_classes())
             st.session_state.viewer_page = 'result'
-            st.rerun()
+        publish_timing(run)
+        # Switching to the result subpage needs a full run
+        st.rerun()
 
-    # Subpage: result
-    elif st.session_state.viewer_page == 'result':
-        flight = st.session_state.selected_flight
-        
-        # If user somehow reached result without a selection, go back
-        if flight is None:
-            st.session_state.viewer_page = 'landing'
-            st.rerun()
+    show_fragment_timing(run)
 
-        c1, c2 = st.columns([1, 4])
-        if c1.button("← Back"):
-            st.session_state.viewer_page = 'landing'
-            st.session_state.selected_flight = None
-            st.rerun()
 
-        
-        weather = flight['weather_raw']
-        # Use the actual CSV weather score instead of calculating
-        risk_score = flight.get('true_weather_score', 0)
-        
-        # Display score card
-        st.markdown(f"""
-        <div class="score-container">
-            <div class="score-label">Weather Delay Risk (0=Best, 100=Worst)</div>
-            <div class="big-score">{risk_score:.1f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Status and gauge
-        col_gauge, col_status = st.columns([1, 1])
-        
-        if risk_score <= 20:
-            status_color = "#4CAF50"  # Green
-            status_title = "✅ Very Low Risk"
-            status_msg = "Excellent conditions. Expect on-time departure."
-        elif risk_score <= 40:
-            status_color = "#8BC34A"  # Light Green
-            status_title = "🟢 Low Risk"
-            status_msg = "Good conditions, though minor weather factors are present."
-        elif risk_score <= 60:
-            status_color = "#FFB612"  # Yellow/Orange
-            status_title = "⚠️ Moderate Risk"
-            status_msg = "Weather/time of day factors present. Potential for minor delays."
-        elif risk_score <= 80:
-            status_color = "#FF5722"  # Orange/Red
-            status_title = "🚨 High Risk"
-            status_msg = "Delays are likely."
-        else:
-            status_color = "#C60C30"  # Deep Red
-            status_title = "⛔ Very High Risk"
-            status_msg = "Severe weather. Significant delays or cancellations expected."
-        
-        with col_gauge:
-            if HAS_PLOTTING:
+def viewer_result():
+    """The result subpage, drawn from st.session_state.selected_flight alone."""
+    flight = st.session_state.selected_flight
+
+    # If user somehow reached result without a selection, go back
+    if flight is None:
+        st.session_state.viewer_page = 'landing'
+        st.rerun()
+
+    c1, c2 = st.columns([1, 4])
+    if c1.button("← Back"):
+        st.session_state.viewer_page = 'landing'
+        st.session_state.selected_flight = None
+        st.rerun()
+
+    
+    weather = flight['weather_raw']
+    # Use the actual CSV weather score instead of calculating
+    risk_score = flight.get('true_weather_score', 0)
+    
+    # Display score card
+    st.markdown(f"""
+    <div class="score-container">
+        <div class="score-label">Weather Delay Risk (0=Best, 100=Worst)</div>
+        <div class="big-score">{risk_score:.1f}</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Status and gauge
+    col_gauge, col_status = st.columns([1, 1])
+    
+    # ≤20 / 40 / 60 / 80 status tiers
+    tier = risk_tier(risk_score)
+    status_color, status_title, status_msg = tier['color'], tier['title'], tier['message']
+    
+    with col_gauge:
+        if HAS_PLOTTING:
+            with metrics.timer('gauge'):
                 fig = go.Figure(go.Indicator(
                     mode="gauge",
                     value=risk_score,
@@ -571,163 +534,131 @@ if page_selection == "✈️ Flight Risk Viewer":
                         ]
                     }
                 ))
-                
+            
                 # Margins kept wide so numbers don't get cut off
                 fig.update_layout(
                     height=250, 
                     margin=dict(l=40, r=40, t=20, b=20), 
                     paper_bgcolor="rgba(0,0,0,0)"
                 )
-                
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col_status:
-            st.markdown(f"### {status_title}")
-            st.write(status_msg)
-        
-        st.markdown("---")
-        st.markdown("### Contributing Factors")
-        
-        col_inc, col_dec = st.columns(2)
-        
-        with col_inc:
-            # Note: Content inside expanders remains dark text on white background
-            with st.expander("📈 Factors INCREASING Risk", expanded=True):
-                risks = []
-                
-                # LOGIC remains in Metric, DISPLAY converts to Imperial
-                if weather['wspd'] > 25:
-                    wspd_mph = weather['wspd'] * 0.621371
-                    risks.append(f"• High Winds ({wspd_mph:.1f} mph)")
-                
-                if weather['pres'] < 1005:
-                    pres_in = weather['pres'] * 0.02953
-                    risks.append(f"• Low Pressure ({pres_in:.1f} inHg)")
-                
-                if weather['prcp'] > 3:
-                    prcp_in = weather['prcp'] * 0.03937
-                    risks.append(f"• Precipitation ({prcp_in:.1f} in)")
-                
-                if weather['snow'] > 0:
-                    snow_in = weather['snow'] * 0.03937
-                    risks.append(f"• Snowfall ({snow_in:.1f} in)")
-                
-                if flight['distance'] > 2000:
-                    risks.append("• Long Haul Flight")
-                if flight['dep_time'] > 1800:
-                    risks.append("• Late Evening Departure")
-                
-                if risks:
-                    # Use double newlines to force separate lines
-                    st.markdown("\n\n".join(risks))
-                else:
-                    st.write("No major risk factors.")
-        
-        with col_dec:
-            with st.expander("📉 Factors DECREASING Risk", expanded=True):
-                goods = []
-                # Logic check remains in Celsius
-                if 15 < weather['tavg'] < 30:
-                    # Convert to Fahrenheit
-                    temp_f = (weather['tavg'] * 9/5) + 32
-                    # Display as whole number
-                    goods.append(f"• Mild Temps ({temp_f:.0f}°F)")
-                
-                if weather['wspd'] < 15:
-                    goods.append("• Calm Winds")
-                if weather['pres'] >= 1015:
-                    goods.append("• Good Pressure")
-                if weather['prcp'] == 0:
-                    goods.append("• No Precipitation")
-                
-                if goods:
-                    # Use double newlines to force separate lines
-                    st.markdown("\n\n".join(goods))
-                else:
-                    st.write("Standard conditions.")
-        
-        # --- FINAL SECTION: CARDS UI (original flight details & weather) ---
-        st.markdown("<br>", unsafe_allow_html=True) # Spacer
-        
-        # 1. PREPARE DATA (Do this before columns so both cards can use it)
-        if HAS_PANDAS:
-            # Decode Airport Names
-            origin_iata = flight['origin']
-            dest_iata = flight['dest']
             
-            # load airport data
-            airports = airportsdata.load('IATA') 
-            
-            # --- FIX: Use .get() and provide safe fallback ---
-            originInfo = airports.get(origin_iata)
-            destInfo = airports.get(dest_iata)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with col_status:
+        st.markdown(f"### {status_title}")
+        st.write(status_msg)
 
-            # format origin and destination
-            if originInfo is None:
-                originDisplay = f"{origin_iata} (Info Missing)"
+    prediction = flight.get('prediction')
+    if prediction is not None:
+        if prediction['kind'] == 'minutes':
+            st.markdown(f"**🕒 Predicted departure delay:** {prediction['value']:.0f} min (LightGBM model)")
+        else:
+            st.markdown(f"**🧮 Heuristic risk score:** {prediction['value']:.1f} (no trained model loaded)")
+    
+    st.markdown("---")
+    st.markdown("### Contributing Factors")
+    
+    col_inc, col_dec = st.columns(2)
+    
+    with col_inc:
+        # Note: Content inside expanders remains dark text on white background
+        with st.expander("📈 Factors INCREASING Risk", expanded=True):
+            # LOGIC remains in Metric, DISPLAY converts to Imperial
+            increasing, decreasing = contributing_factors(weather, flight)
+            risks = [f"• {factor}" for factor in increasing]
+            
+            if risks:
+                # Use double newlines to force separate lines
+                st.markdown("\n\n".join(risks))
             else:
-                originDisplay = originInfo['name'] + " (" + origin_iata + ")"
-                
-            if destInfo is None:
-                destDisplay = f"{dest_iata} (Info Missing)"
+                st.write("No major risk factors.")
+    
+    with col_dec:
+        with st.expander("📉 Factors DECREASING Risk", expanded=True):
+            goods = [f"• {factor}" for factor in decreasing]
+            
+            if goods:
+                # Use double newlines to force separate lines
+                st.markdown("\n\n".join(goods))
             else:
-                destDisplay = destInfo['name'] + " (" + dest_iata + ")"
+                st.write("Standard conditions.")
+    
+    # --- FINAL SECTION: CARDS UI (original flight details & weather) ---
+    st.markdown("<br>", unsafe_allow_html=True) # Spacer
+    
+    # 1. PREPARE DATA (Do this before columns so both cards can use it)
+    if HAS_PANDAS:
+        # Decode Airport Names
+        origin_iata = flight['origin']
+        dest_iata = flight['dest']
+        
+        with metrics.timer('airport_lookup'):
+            # shared IATA -> "Name (IATA)" map; the snapshot's covers every encoded airport
+            snapshot = load_snapshot_for(CSV_FILE_PATH)
+            airport_names = snapshot.airport_names if snapshot is not None else get_airport_names()
+
+            # --- FIX: Use .get() and provide safe fallback ---
+            originDisplay = airport_names.get(origin_iata, f"{origin_iata} (Info Missing)")
+            destDisplay = airport_names.get(dest_iata, f"{dest_iata} (Info Missing)")
             # ------------------------------------------------
 
-            # Format Times & Distances
-            dep_time_str = f"{int(flight['dep_time']):04d}"
-            formatted_dep_time = f"{dep_time_str[:2]}:{dep_time_str[2:]}"
-            distance_val = f"{int(float(flight['distance']))}"
-            
-            # Format Weather Values
-            temp_f = (weather['tavg'] * 9/5) + 32
-            prcp_in = weather['prcp'] * 0.03937
-            snow_in = weather['snow'] * 0.03937
-            wspd_mph = weather['wspd'] * 0.621371
-            pres_in = weather['pres'] * 0.02953
-
-        # 2. CREATE COLUMNS
-        c_details, c_weather = st.columns(2)
+        # Format Times & Distances
+        dep_time_str = f"{int(flight['dep_time']):04d}"
+        formatted_dep_time = f"{dep_time_str[:2]}:{dep_time_str[2:]}"
+        distance_val = f"{int(float(flight['distance']))}"
         
-        # --- LEFT CARD: FLIGHT DETAILS ---
-        with c_details:
-            # BUILD THE FLIGHT CARD HTML
-            flight_card_html = f"""
-            <div class="stCard">
-                <h3>✈️ Flight Details</h3>
-                <table class="details-table" style="width:100%">
-                    <tr><td class="details-label">Flight No.</td><td class="details-value">{flight['flight_num']}</td></tr>
-                    <tr><td class="details-label">Route</td><td class="details-value">{originDisplay} ➝ {destDisplay}</td></tr>
-                    <tr><td class="details-label">Distance</td><td class="details-value">{distance_val} mi</td></tr>
-                    <tr><td class="details-label">Scheduled Departure</td><td class="details-value">{formatted_dep_time}</td></tr>
-                    <tr><td class="details-label">Date</td><td class="details-value">{flight['date']}</td></tr>
-                </table>
-            </div>
-            """
-            st.markdown(flight_card_html, unsafe_allow_html=True)
-
-        # --- RIGHT CARD: WEATHER REPORT ---
-        with c_weather:
-            # BUILD THE WEATHER CARD HTML (Now uses {origin_name} dynamically)
-            weather_card_html = f"""
-            <div class="stCard" style="border-top: 5px solid #FFB612;">
-                <h3>☁️ Weather at {originDisplay}</h3>
-                <table class="details-table" style="width:100%">
-                    <tr><td class="details-label">Temp</td><td class="details-value">{temp_f:.0f} °F</td></tr>
-                    <tr><td class="details-label">Wind</td><td class="details-value">{f'0 mph' if wspd_mph == 0 else f'{wspd_mph:.1f} mph'}</td></tr>
-                    <tr><td class="details-label">Precip</td><td class="details-value">{f'0 in' if prcp_in <= 0.1 else f'{prcp_in:.1f} in'}</td></tr>
-                    <tr><td class="details-label">Pressure</td><td class="details-value">{f'0 inHg' if pres_in == 0 else f'{pres_in:.1f} inHg'}</td></tr>
-                    <tr><td class="details-label">Snow</td><td class="details-value">{f'0 in' if snow_in == 0 else f'{snow_in:.1f} in'}</td></tr>
-                </table>
-            </div>
-            """
-            st.markdown(weather_card_html, unsafe_allow_html=True)
+        # Format Weather Values
+        temp_f = (weather['tavg'] * 9/5) + 32
+        prcp_in = weather['prcp'] * 0.03937
+        snow_in = weather['snow'] * 0.03937
+        wspd_mph = weather['wspd'] * 0.621371
+        pres_in = weather['pres'] * 0.02953
+
+    # 2. CREATE COLUMNS
+    c_details, c_weather = st.columns(2)
+    
+    # --- LEFT CARD: FLIGHT DETAILS ---
+    with c_details:
+        # BUILD THE FLIGHT CARD HTML
+        flight_card_html = f"""
+        <div class="stCard">
+            <h3>✈️ Flight Details</h3>
+            <table class="details-table" style="width:100%">
+                <tr><td class="details-label">Flight No.</td><td class="details-value">{flight['flight_num']}</td></tr>
+                <tr><td class="details-label">Route</td><td class="details-value">{originDisplay} ➝ {destDisplay}</td></tr>
+                <tr><td class="details-label">Distance</td><td class="details-value">{distance_val} mi</td></tr>
+                <tr><td class="details-label">Scheduled Departure</td><td class="details-value">{formatted_dep_time}</td></tr>
+                <tr><td class="details-label">Date</td><td class="details-value">{flight['date']}</td></tr>
+            </table>
+        </div>
+        """
+        st.markdown(flight_card_html, unsafe_allow_html=True)
+
+    # --- RIGHT CARD: WEATHER REPORT ---
+    with c_weather:
+        # BUILD THE WEATHER CARD HTML (Now uses {origin_name} dynamically)
+        weather_card_html = f"""
+        <div class="stCard" style="border-top: 5px solid #FFB612;">
+            <h3>☁️ Weather at {originDisplay}</h3>
+            <table class="details-table" style="width:100%">
+                <tr><td class="details-label">Temp</td><td class="details-value">{temp_f:.0f} °F</td></tr>
+                <tr><td class="details-label">Wind</td><td class="details-value">{f'0 mph' if wspd_mph == 0 else f'{wspd_mph:.1f} mph'}</td></tr>
+                <tr><td class="details-label">Precip</td><td class="details-value">{f'0 in' if prcp_in <= 0.1 else f'{prcp_in:.1f} in'}</td></tr>
+                <tr><td class="details-label">Pressure</td><td class="details-value">{f'0 inHg' if pres_in == 0 else f'{pres_in:.1f} inHg'}</td></tr>
+                <tr><td class="details-label">Snow</td><td class="details-value">{f'0 in' if snow_in == 0 else f'{snow_in:.1f} in'}</td></tr>
+            </table>
+        </div>
+        """
+        st.markdown(weather_card_html, unsafe_allow_html=True)
 
 
 # ---------------------------
 # PAGE: Custom Weather Calculator
 # ---------------------------
-elif page_selection == "📊 Custom Score Calculator":
+@st.fragment
+def custom_calculator():
+    """The calculator form and its result; submitting reruns only this fragment."""
+    run = RerunTimer('calculator')
     st.title("Custom Risk Calculator ⛅")
     st.markdown("""
         <div style='
@@ -742,6 +673,12 @@ elif page_selection == "📊 Custom Score Calculator":
         </div>
     """, unsafe_allow_html=True)
 
+    mode = st.radio("Mode", ["Single score", "What-if sweep"], horizontal=True, key="calculator_mode",
+                    label_visibility="collapsed")
+    if mode == "What-if sweep":
+        what_if_sweep(run)
+        show_fragment_timing(run)
+        return
 
     with st.form(key="custom_form"):
         col1, col2 = st.columns(2)
@@ -796,45 +733,310 @@ elif page_selection == "📊 Custom Score Calculator":
             }
 
             # Calculate risk score
-            custom_score = calculate_risk_score(custom_weather, custom_flight)
+            with run.section('score'), metrics.timer('risk_score'):
+                custom_score = cached_risk_score(get_score_cache(), custom_weather, custom_flight)
 
             # Determine status
-            if custom_score <= 20:
-                status_color = "#4CAF50"; status_title = "✅ Very Low Risk"; status_msg = "Excellent conditions. Expect on-time departure."
-            elif custom_score <= 40:
-                status_color = "#8BC34A"; status_title = "🟢 Low Risk"; status_msg = "Good conditions, though minor weather factors are present."
-            elif custom_score <= 60:
-                status_color = "#FFB612"; status_title = "⚠️ Moderate Risk"; status_msg = "Weather factors present. Potential for minor delays."
-            elif custom_score <= 80:
-                status_color = "#FF5722"; status_title = "🚨 High Risk"; status_msg = "Delays are likely."
+            tier = risk_tier(custom_score)
+            status_color, status_title, status_msg = tier['color'], tier['title'], tier['message']
+
+            with run.section('render'):
+                # Display score card
+                st.markdown(f"""
+                    <div class="score-container">
+                        <div class="score-label">Custom Weather Delay Risk (0=Best, 100=Worst)</div>
+                        <div class="big-score">{custom_score:.1f}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+
+                # Display gauge + status
+                col_gauge, col_status = st.columns([1, 1])
+                with col_gauge:
+                    if HAS_PLOTTING:
+                        with metrics.timer('gauge'):
+                            fig = go.Figure(go.Indicator(
+                                mode="gauge",
+                                value=custom_score,
+                                domain={'x': [0, 1], 'y': [0, 1]},
+                                gauge={
+                                    'axis': {'range': [0, 100]},
+                                    'bar': {'color': status_color},
+                                    'bgcolor': "white"
+                                }
+                            ))
+                            fig.update_layout(height=250, margin=dict(l=40, r=40, t=20, b=20), paper_bgcolor="rgba(0,0,0,0)")
+                        st.plotly_chart(fig, use_container_width=True)
+
+                with col_status:
+                    st.markdown(f"### {status_title}")
+                    st.write(status_msg)
+
+    show_fragment_timing(run)
+
+
+def what_if_sweep(run):
+    """Scores a grid of two inputs with the rest held fixed, as a heatmap or contour and a CSV."""
+    names = list(SWEEP_INPUTS)
+    col_x, col_y = st.columns(2)
+    with col_x:
+        x = st.selectbox("X axis", names, index=names.index('wspd'), format_func=axis_label, key="sweep_x")
+    with col_y:
+        y_names = [name for name in names if name != x]
+        y = st.selectbox("Y axis", y_names, index=y_names.index('prcp') if 'prcp' in y_names else 0,
+                         format_func=axis_label, key="sweep_y")
+
+    with st.form(key="sweep_form"):
+        ranges = {}
+        for name in (x, y):
+            low, high = SWEEP_INPUTS[name][3]
+            col_start, col_stop = st.columns(2)
+            start = col_start.number_input(f"{axis_label(name)} from", value=low, key=f"sweep_{name}_start")
+            stop = col_stop.number_input(f"{axis_label(name)} to", value=high, key=f"sweep_{name}_stop")
+            ranges[name] = (start, stop)
+        steps = st.slider("Steps per axis", min_value=10, max_value=MAX_STEPS, value=200, step=10,
+                          key="sweep_steps", help=f"{MAX_STEPS} × {MAX_STEPS} is a million points")
+
+        st.markdown("**Held fixed**")
+        fixed = {}
+        fixed_columns = st.columns(2)
+        # Same defaults as the calculator's placeholders
+        defaults = {'wspd': 15.0, 'prcp': 0.2, 'snow': 0.0, 'pres': 30.0, 'dep_time': 1530.0, 'distance': 250.0}
+        for i, name in enumerate(name for name in names if name not in (x, y)):
+            fixed[name] = fixed_columns[i % 2].number_input(axis_label(name), value=defaults[name],
+                                                            key=f"sweep_fixed_{name}")
+        submit = st.form_submit_button("Run Sweep")
+
+    if submit:
+        with run.section('sweep'), metrics.timer('sweep'):
+            x_values = axis_values(x, *ranges[x], steps)
+            y_values = axis_values(y, *ranges[y], steps)
+            scores = sweep_scores(x, x_values, y, y_values, fixed)
+        # Kept for reruns that only change the plot style or export the grid
+        st.session_state.sweep = {'x': x, 'y': y, 'x_values': x_values, 'y_values': y_values,
+                                  'scores': scores, 'fixed': fixed, 'csv': None}
+
+    result = st.session_state.get('sweep')
+    if result is None or (result['x'], result['y']) != (x, y):
+        return
+
+    with run.section('render'):
+        x_shown, y_shown, z_shown = display_grid(result['x_values'], result['y_values'], result['scores'])
+        style = st.radio("Plot", ["Heatmap", "Contour"], horizontal=True, key="sweep_style")
+        if HAS_PLOTTING:
+            trace = go.Heatmap if style == "Heatmap" else go.Contour
+            fig = go.Figure(trace(
+                z=z_shown, x=x_shown, y=y_shown,
+                zmin=0, zmax=100, colorscale=[[0, "#4CAF50"], [0.4, "#FFB612"], [0.8, "#C60C30"], [1, "#C60C30"]],
+                colorbar={'title': 'Risk'},
+                hovertemplate=f"{axis_label(x)}: %{{x}}<br>{axis_label(y)}: %{{y}}<br>Risk: %{{z:.1f}}<extra></extra>"
+            ))
+            fig.update_layout(height=450, margin=dict(l=10, r=10, t=20, b=20), paper_bgcolor="rgba(0,0,0,0)",
+                              xaxis_title=axis_label(x), yaxis_title=axis_label(y))
+            st.plotly_chart(fig, use_container_width=True)
+
+        n_points = result['scores'].size
+        fixed_text = ', '.join(f"{axis_label(name)} {value:g}" for name, value in result['fixed'].items())
+        st.caption(f"{n_points:,} points (plot shows {z_shown.size:,}); fixed: {fixed_text}. "
+                   f"Score range {result['scores'].min():.1f}–{result['scores'].max():.1f}.")
+
+    # Writing a million-row CSV takes seconds, so only on request
+    if result['csv'] is None:
+        if st.button("Prepare CSV download", key="sweep_prepare_csv"):
+            with metrics.timer('sweep_csv'):
+                result['csv'] = sweep_csv(result['x'], result['x_values'], result['y'], result['y_values'],
+                                          result['scores'])
+    if result['csv'] is not None:
+        st.download_button("Download grid (CSV)", data=result['csv'], file_name=f"risk_sweep_{x}_{y}.csv",
+                           mime="text/csv", key="sweep_download")
+
+
+# ---------------------------
+# PAGE: Network Risk Heatmap
+# ---------------------------
+@st.fragment
+def risk_heatmap():
+    """Heatmap of one day of the risk cube; changing the date reruns only this fragment."""
+    run = RerunTimer('heatmap')
+    st.title("Network Risk Heatmap 🗺️")
+    # Precomputed airport x date x hour cube (risk_cube.py); slices only, no rescoring
+    cube = get_risk_cube()
+    if cube is None:
+        st.info("The risk cube has not been built yet. Run "
+                "`python Dashboard/risk_cube.py --weather <daily weather> --schedule <flights>` first.")
+        return
+
+    first_date, last_date = cube.dates[0].item(), cube.dates[-1].item()
+    selected_date = st.date_input("Date", value=last_date, min_value=first_date, max_value=last_date)
+    with run.section('cube slice'), metrics.timer('cube_slice'):
+        day_risk = cube.day(selected_date)
+    with metrics.timer('airport_lookup'):
+        airport_names = get_airport_names()
+        airport_labels = [airport_names.get(code, code) for code in cube.airports.tolist()]
+    hour_labels = [f"{hour:02d}:00" for hour in range(day_risk.shape[1])]
+
+    with run.section('render'):
+        if HAS_PLOTTING:
+            fig = go.Figure(go.Heatmap(
+                z=day_risk, x=hour_labels, y=airport_labels,
+                zmin=0, zmax=100, colorscale=[[0, "#4CAF50"], [0.4, "#FFB612"], [0.8, "#C60C30"], [1, "#C60C30"]],
+                colorbar={'title': 'Risk'},
+                hovertemplate="%{y}<br>%{x}: %{z:.1f}<extra></extra>"
+            ))
+            fig.update_layout(height=40 + 28 * len(airport_labels), margin=dict(l=10, r=10, t=20, b=20),
+                              paper_bgcolor="rgba(0,0,0,0)", yaxis={'autorange': 'reversed'})
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Scheduled departure hours of the day, ranked by risk
+        ranked = pd.DataFrame({
+            'Airport': [label for label in airport_labels for _ in hour_labels],
+            'Hour': hour_labels * len(airport_labels),
+            'Risk': day_risk.ravel().round(1),
+            'Scheduled departures': cube.departures.ravel(),
+        })
+        ranked = ranked[ranked['Scheduled departures'] > 0].sort_values('Risk', ascending=False)
+        st.markdown("### Highest-risk departure hours")
+        st.dataframe(ranked.head(10), hide_index=True, use_container_width=True)
+
+    show_fragment_timing(run)
+
+
+# ---------------------------
+# PAGE: Bulk Schedule Scoring
+# ---------------------------
+@st.fragment
+def bulk_schedule_scoring():
+    """Scores an uploaded schedule a chunk at a time and offers the scored file for download."""
+    run = RerunTimer('bulk')
+    st.title("Bulk Schedule Scoring 📤")
+    st.markdown("Upload a schedule as `.csv` or `.csv.gz`, one flight per row, with the columns "
+                + ", ".join(f"`{column}`" for column in SCHEDULE_COLUMNS)
+                + ". Weather is metric (km/h, mm, hPa) like the processed dataset, and every other column "
+                "(flight number, origin, dest, ...) is kept. Each row gets a risk score, tier and top factors.")
+    st.info(f"Uploads up to {MAX_UPLOAD_MB} MB, downloads up to {MAX_DOWNLOAD_MB} MB. The page holds the upload "
+            "and the scored file in memory; score larger schedules with the headless service's "
+            "`POST /score/csv` (see `service.py`), which streams the scored file.")
+    uploaded = st.file_uploader("Schedule", type=['csv', 'gz'], key="bulk_upload")
+    if uploaded is None:
+        show_fragment_timing(run)
+        return
+    if uploaded.size > MAX_UPLOAD_MB * 1024 * 1024:
+        st.error(f"{uploaded.name} is {uploaded.size / 1024 / 1024:.0f} MB, over the {MAX_UPLOAD_MB} MB limit. "
+                 "Post it to `POST /score/csv` instead.")
+        show_fragment_timing(run)
+        return
+
+    if st.button("Score Schedule", key="bulk_score", use_container_width=True):
+        compressed = uploaded.name.endswith('.gz')
+        previous = st.session_state.pop('bulk_result', None)
+        if previous is not None and os.path.exists(previous['path']):
+            os.remove(previous['path'])
+        # Files left by sessions that were closed without scoring again
+        remove_expired()
+        # The scored file goes to disk chunk by chunk; only the current chunk is in memory
+        path = new_result_path('.csv.gz' if compressed else '.csv')
+        bar = st.progress(0.0, text="Scoring...")
+
+        def progress(rows):
+            bar.progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0), text=f"Scored {rows:,} flights")
+
+        try:
+            with run.section('score'), metrics.timer('bulk_score'):
+                uploaded.seek(0)
+                opener = gzip.open if compressed else open
+                with opener(path, 'wt', newline='', encoding='utf-8') as out:
+                    tiers = score_schedule(uploaded, out, compression='gzip' if compressed else None,
+                                           progress=progress)
+        except (ValueError, OSError, EOFError) as e:
+            os.remove(path)
+            bar.empty()
+            st.error(f"Could not score {uploaded.name}: {e}")
+            show_fragment_timing(run)
+            return
+        bar.progress(1.0, text=f"Scored {sum(tiers.values()):,} flights")
+        st.session_state.bulk_result = {'name': uploaded.name, 'path': path, 'tiers': tiers}
+
+    result = st.session_state.get('bulk_result')
+    if result is not None and result['name'] == uploaded.name and os.path.exists(result['path']):
+        with run.section('render'):
+            st.markdown("### Flights per risk tier")
+            st.dataframe(pd.DataFrame({'Risk tier': list(result['tiers']), 'Flights': list(result['tiers'].values())}),
+                         hide_index=True, use_container_width=True)
+            st.markdown("### Preview")
+            st.dataframe(pd.read_csv(result['path'], nrows=20), hide_index=True, use_container_width=True)
+            size_mb = os.path.getsize(result['path']) / 1024 / 1024
+            if size_mb > MAX_DOWNLOAD_MB:
+                st.warning(f"The scored file is {size_mb:.0f} MB, over the {MAX_DOWNLOAD_MB} MB in-app download "
+                           "limit. Post the schedule to `POST /score/csv` to download it.")
             else:
-                status_color = "#C60C30"; status_title = "⛔ Very High Risk"; status_msg = "Severe weather. Significant delays or cancellations expected."
-
-            # Display score card
-            st.markdown(f"""
-                <div class="score-container">
-                    <div class="score-label">Custom Weather Delay Risk (0=Best, 100=Worst)</div>
-                    <div class="big-score">{custom_score:.1f}</div>
-                </div>
-            """, unsafe_allow_html=True)
-
-            # Display gauge + status
-            col_gauge, col_status = st.columns([1, 1])
-            with col_gauge:
-                if HAS_PLOTTING:
-                    fig = go.Figure(go.Indicator(
-                        mode="gauge",
-                        value=custom_score,
-                        domain={'x': [0, 1], 'y': [0, 1]},
-                        gauge={
-                            'axis': {'range': [0, 100]},
-                            'bar': {'color': status_color},
-                            'bgcolor': "white"
-                        }
-                    ))
-                    fig.update_layout(height=250, margin=dict(l=40, r=40, t=20, b=20), paper_bgcolor="rgba(0,0,0,0)")
-                    st.plotly_chart(fig, use_container_width=True)
-
-            with col_status:
-                st.markdown(f"### {status_title}")
-                st.write(status_msg)
+                # A callable is read only when the button is clicked, not on every rerun
+                st.download_button("Download scored schedule", data=lambda: read_result(result['path']),
+                                   file_name=f"scored_{result['name']}",
+                                   mime="application/gzip" if result['path'].endswith('.gz') else "text/csv",
+                                   key="bulk_download")
+
+    show_fragment_timing(run)
+
+
+# ---------------------------
+# PAGE: Admin Metrics (?admin=1)
+# ---------------------------
+def admin_metrics():
+    """Process-wide latency histograms of the hot paths, and their Prometheus dump."""
+    st.title("Admin Metrics 🛠️")
+    if not metrics.is_enabled():
+        st.info("Metrics are off. Start the app with `DASHBOARD_METRICS=1` to record them.")
+    st.markdown("Latency of every instrumented call since this server process started, across all sessions.")
+    st.dataframe(metrics.summary_frame(), hide_index=True, use_container_width=True)
+
+    if st.button("Write metrics file", key="write_metrics"):
+        st.success(f"Wrote {metrics.write_prometheus()}")
+    st.caption(f"Also written every {metrics.WRITE_INTERVAL_SECONDS:.0f}s while enabled, "
+               f"to {metrics.DEFAULT_METRICS_FILE} (DASHBOARD_METRICS_FILE).")
+    with st.expander("Prometheus text", expanded=False):
+        st.code(metrics.render_prometheus(), language='text')
+
+
+# ==========================================
+# 6. PAGE DISPATCH
+# ==========================================
+if page_selection == "✈️ Flight Risk Viewer":
+    # Keep original behavior: if no CSV or encoders, app previously stops; replicate that
+    if TEST_DATA_DF is None:
+        st.error("❌ CSV file not found!")
+        st.info(f"Looking for: {CSV_FILE_PATH}")
+        st.stop()
+    if data is None:
+        st.stop() # already handled error above
+
+    # Subpage: landing (picker) or result
+    if st.session_state.viewer_page == 'landing':
+        with timer.section('viewer landing'):
+            viewer_landing()
+    elif st.session_state.viewer_page == 'result':
+        with timer.section('viewer result'):
+            viewer_result()
+
+elif page_selection == "📊 Custom Score Calculator":
+    with timer.section('calculator'):
+        custom_calculator()
+
+elif page_selection == "🗺️ Network Risk Heatmap":
+    with timer.section('heatmap'):
+        risk_heatmap()
+
+elif page_selection == "📤 Bulk Schedule Scoring":
+    with timer.section('bulk scoring'):
+        bulk_schedule_scoring()
+
+elif page_selection == "🛠️ Admin Metrics":
+    admin_metrics()
+
+# Refresh the Prometheus text file (throttled; a no-op while metrics are off)
+metrics.write_prometheus_if_due()
+
+# Per-rerun timing panel (add ?timing=1 to the URL): the last full run plus
+# the last run of each fragment, which may have rerun on its own since
+if SHOW_TIMING:
+    publish_timing(timer)
+    with st.sidebar.expander("⏱️ Rerun Timing", expanded=True):
+        st.dataframe(timings_frame(st.session_state.rerun_timings), hide_index=True, use_container_width=True)
@@ -0,0 +1,125 @@
+"""Chunked scoring of uploaded flight schedules (no Streamlit).
+
+A schedule is a CSV (optionally gzip) with one flight per row and the
+processed dataset's column names; weather is metric (km/h, mm, hPa):
+
+    Flight_Number_Reporting_Airline,Origin,Dest,CRSDepTime,Distance,wspd,prcp,snow,pres
+    2606,PHX,LAX,1930,370,42.0,3.1,0,1001.5
+
+Only SCHEDULE_COLUMNS are required; every other column is passed through
+unchanged. The file is read `chunksize` rows at a time and each chunk is
+scored in one vectorized call, so memory depends on the chunk size and not
+on the length of the file. Each row gains:
+
+    risk_score    the 0-100 heuristic score
+    risk_tier     its status tier, e.g. 'Moderate Risk'
+    top_factors   the factors adding the most points, e.g. 'Snow (+40); Wind (+30)'
+
+The dashboard writes scored files to RESULT_DIR; sessions that are closed
+without scoring again leave them behind, so remove_expired() deletes any
+older than RESULT_TTL_SECONDS.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import FRAME_COLUMNS, RISK_TIERS, risk_terms, risk_tier_indices, score_terms, top_factors
+
+
+SCHEDULE_COLUMNS = list(FRAME_COLUMNS.values())
+OUTPUT_COLUMNS = ['risk_score', 'risk_tier', 'top_factors']
+DEFAULT_CHUNKSIZE = 50_000
+
+# The dashboard holds the upload and the download in memory (Streamlit reads a
+# download_button's data into bytes, even from a file handle), so it takes
+# uploads up to MAX_UPLOAD_MB and offers scored files up to MAX_DOWNLOAD_MB;
+# larger schedules go to the service's POST /score/csv, which streams
+MAX_UPLOAD_MB = 50
+MAX_DOWNLOAD_MB = 100   # a .csv.gz upload can expand past MAX_UPLOAD_MB
+RESULT_DIR = os.path.join(tempfile.gettempdir(), 'southwest_bulk_scoring')
+RESULT_TTL_SECONDS = 3600
+
+# Tier titles without their emoji, for plain-text output
+TIER_NAMES = np.array([title.split(' ', 1)[1] for _, _, title, _ in RISK_TIERS], dtype=object)
+
+
+def iter_schedule(source, chunksize=DEFAULT_CHUNKSIZE, compression='infer'):
+    """Yields the schedule as DataFrame chunks with stripped column names; ValueError if columns are missing."""
+    for chunk in pd.read_csv(source, chunksize=chunksize, compression=compression, low_memory=False):
+        chunk.columns = chunk.columns.str.strip()
+        missing = [name for name in SCHEDULE_COLUMNS if name not in chunk.columns]
+        if missing:
+            raise ValueError(f"schedule is missing column(s): {', '.join(missing)}")
+        yield chunk
+
+
+def score_chunk(chunk):
+    """`chunk` with OUTPUT_COLUMNS appended; non-numeric inputs count as missing and add no risk."""
+    inputs = {field: pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+              for field, column in FRAME_COLUMNS.items()}
+    terms = risk_terms(**inputs)
+    scores = score_terms(terms)
+
+    scored = chunk.copy()
+    scored['risk_score'] = scores
+    scored['risk_tier'] = TIER_NAMES[risk_tier_indices(scores)]
+    scored['top_factors'] = top_factors(terms)
+    return scored
+
+
+def score_schedule(source, out, chunksize=DEFAULT_CHUNKSIZE, compression='infer', progress=None):
+    """Writes the scored schedule to the text file `out`; returns rows per tier name.
+
+    `progress(rows)` is called after each chunk with the rows scored so far.
+    """
+    tier_counts = dict.fromkeys(TIER_NAMES.tolist(), 0)
+    rows = 0
+    for i, chunk in enumerate(iter_schedule(source, chunksize, compression)):
+        scored = score_chunk(chunk)
+        scored.to_csv(out, index=False, header=i == 0)
+        for name, count in scored['risk_tier'].value_counts().items():
+            tier_counts[name] += int(count)
+        rows += len(scored)
+        if progress is not None:
+            progress(rows)
+    return tier_counts
+
+
+def new_result_path(suffix, result_dir=RESULT_DIR):
+    """A fresh, empty file in `result_dir` for one scored schedule."""
+    os.makedirs(result_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix='scored_', suffix=suffix, dir=result_dir)
+    os.close(fd)
+    return path
+
+
+def read_result(path, max_mb=MAX_DOWNLOAD_MB):
+    """The scored file's bytes for download; empty if it has expired or is over `max_mb`."""
+    try:
+        if os.path.getsize(path) > max_mb * 1024 * 1024:
+            return b''
+        with open(path, 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        return b''
+
+
+def remove_expired(result_dir=RESULT_DIR, ttl=RESULT_TTL_SECONDS, now=None):
+    """Deletes scored files last modified more than `ttl` seconds ago; returns how many."""
+    now = time.time() if now is None else now
+    removed = 0
+    try:
+        entries = list(os.scandir(result_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and now - entry.stat().st_mtime > ttl:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:  # removed by another session meanwhile
+            pass
+    return removed
@@ -0,0 +1,114 @@
+"""Flight-number and route lookups for the Flight Risk Viewer landing page.
+
+The index is built once per loaded sample so the landing page can fill its
+dropdowns with dictionary hits instead of scanning the DataFrame row by row.
+"""
+import random
+
+import numpy as np
+import pandas as pd
+
+
+FLIGHT_COLUMN = 'Flight_Number_Reporting_Airline'
+
+# (lower, upper, count): flights offered in the dropdown per weatherScore band
+# 6 low-risk, 3 medium-risk, 1 high-risk (total 10)
+DROPDOWN_BANDS = (
+    (-np.inf, 35, 6),
+    (35, 65, 3),
+    (65, np.inf, 1),
+)
+
+
+def normalize_flight_numbers(values):
+    """Normalizes raw flight numbers to 'WN####' labels (e.g. 2606.0 -> WN2606)."""
+    raw = pd.Series(values).reset_index(drop=True)
+    numeric = pd.to_numeric(raw, errors='coerce')
+    valid = numeric.notna() & np.isfinite(numeric)
+
+    # Anything that is not a finite number keeps its raw text, like f"WN{flight_num}"
+    labels = 'WN' + raw.astype(str)
+    labels[valid] = 'WN' + numeric[valid].astype('int64').astype(str)
+    return labels.to_numpy(dtype=object)
+
+
+def build_flight_index(df):
+    """Maps flight label -> {(origin, dest): row positions}, in first-seen row order."""
+    keys = pd.DataFrame({
+        'flight': normalize_flight_numbers(df[FLIGHT_COLUMN]),
+        'origin': df['Origin'].to_numpy(),
+        'dest': df['Dest'].to_numpy(),
+    })
+    groups = keys.groupby(['flight', 'origin', 'dest'], sort=False, dropna=False).indices
+
+    index = {}
+    for (flight, origin, dest), positions in sorted(groups.items(), key=lambda item: item[1][0]):
+        index.setdefault(flight, {})[(origin, dest)] = positions
+    return index
+
+
+def pick_dropdown_flights(df, bands=DROPDOWN_BANDS):
+    """Picks unique flight labels per weatherScore band, in row order, without repeats."""
+    flights = normalize_flight_numbers(df[FLIGHT_COLUMN])
+    scores = df['weatherScore'].to_numpy()
+
+    chosen = []
+    seen = set()
+    for lower, upper, count in bands:
+        picked = 0
+        in_band = (scores >= lower) & (scores < upper)
+        for flight in pd.unique(flights[in_band]):
+            if picked >= count:
+                break
+            if flight not in seen:
+                chosen.append(flight)
+                seen.add(flight)
+                picked += 1
+    return chosen
+
+
+def viewer_flights(df, excluded_years, seed=42):
+    """Drops `excluded_years` rows and picks the dropdown flights, shuffled with `seed` to mix the bands."""
+    df = df[~df['Year'].isin(excluded_years)]
+    flights = list(pick_dropdown_flights(df))
+    random.Random(seed).shuffle(flights)
+    return df, flights
+
+
+def airport_display_names():
+    """IATA code -> 'Airport Name (IATA)' for every airport airportsdata knows."""
+    import airportsdata
+
+    # Only the display strings are kept; the full airportsdata records are dropped
+    airports = airportsdata.load('IATA')
+    return {iata: f"{info.get('name', iata)} ({iata})" for iata, info in airports.items()}
+
+
+def route_label(raw_origin, raw_dest, origin_classes, airport_names):
+    """Builds 'Airport Name (IATA) → Airport Name (IATA)' for encoded Origin/Dest ids."""
+    try:
+        # Get IATA codes using the label encoder classes
+        origin_iata = origin_classes[int(float(raw_origin))]
+        dest_iata = origin_classes[int(float(raw_dest))]
+
+        origin_display = airport_names.get(origin_iata, origin_iata)
+        dest_display = airport_names.get(dest_iata, dest_iata)
+        return f"{origin_display} → {dest_display}"
+    except Exception:
+        # Fallback if label encoding or IATA lookup fails - don't skip, use raw values
+        return f"{raw_origin} → {raw_dest}"
+
+
+def route_options(flight_index, flights, origin_classes, airport_names):
+    """Maps each of `flights` -> [{'label', 'position'}], one entry per distinct route label."""
+    options = {}
+    for flight in flights:
+        routes, seen = [], set()
+        # Keep the first row of each route
+        for (raw_origin, raw_dest), positions in flight_index.get(flight, {}).items():
+            label = route_label(raw_origin, raw_dest, origin_classes, airport_names)
+            if label not in seen:
+                routes.append({'label': label, 'position': int(positions[0])})
+                seen.add(label)
+        options[flight] = routes
+    return options
@@ -0,0 +1,81 @@
+"""Compact in-memory schema for the dashboard's flight table.
+
+The processed CSV is read with pandas defaults (float64 everywhere, object
+for text), but the viewer only ever reads the columns below. compact_frame()
+drops everything else and stores each column in the smallest dtype that
+holds it.
+"""
+import numpy as np
+import pandas as pd
+
+
+# column -> compact dtype. Integer columns that contain NaN or values out of
+# range fall back to float32 instead of failing.
+DASHBOARD_SCHEMA = {
+    'Year': 'uint16',
+    'Quarter': 'uint8',
+    'Month': 'uint8',
+    'DayofMonth': 'uint8',
+    'DayOfWeek': 'uint8',
+    'Flight_Number_Reporting_Airline': 'uint16',
+    'Origin': 'category',   # label-encoded airport ids
+    'Dest': 'category',
+    'CRSDepTime': 'uint16',
+    'CRSArrTime': 'uint16',
+    'Distance': 'float32',
+    'tavg': 'float32',
+    'tmin': 'float32',
+    'tmax': 'float32',
+    'prcp': 'float32',
+    'snow': 'float32',
+    'wspd': 'float32',
+    'pres': 'float32',
+    'weatherScore': 'float32',
+}
+
+# Every column the dashboard reads from a flight row
+DASHBOARD_COLUMNS = list(DASHBOARD_SCHEMA)
+
+
+def _smallest_int(values):
+    """Smallest signed/unsigned integer dtype that holds every value."""
+    if len(values) == 0:
+        return np.dtype('uint8')
+    low, high = values.min(), values.max()
+    for dtype in ('uint8', 'uint16', 'uint32', 'int8', 'int16', 'int32'):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype('int64')
+
+
+def _cast(series, dtype):
+    if dtype == 'category':
+        numeric = pd.to_numeric(series, errors='coerce')
+        # Encoded ids arrive as floats (12.0); store the categories as small ints
+        if numeric.notna().all() and (numeric % 1 == 0).all():
+            series = numeric.astype(_smallest_int(numeric))
+        return series.astype('category')
+
+    numeric = pd.to_numeric(series, errors='coerce')
+    target = np.dtype(dtype)
+    if target.kind in 'iu':
+        info = np.iinfo(target)
+        fits = numeric.notna().all() and (numeric % 1 == 0).all() \
+            and (len(numeric) == 0 or (info.min <= numeric.min() and numeric.max() <= info.max))
+        if not fits:
+            return numeric.astype(np.float32)
+    return numeric.astype(target)
+
+
+def compact_frame(df, schema=DASHBOARD_SCHEMA):
+    """Keeps only the `schema` columns of `df`, each cast to its compact dtype."""
+    return pd.DataFrame(
+        {column: _cast(df[column], dtype) for column, dtype in schema.items() if column in df.columns},
+        index=df.index,
+    )
+
+
+def bytes_per_row(df):
+    """Deep memory usage of `df` divided by its row count."""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
@@ -0,0 +1,194 @@
+"""Partitioned Parquet store for the processed flight data.
+
+The gzip CSV has to be parsed end to end on every cold start. The store keeps
+the same rows as Parquet files partitioned by Year/Month, so the dashboard
+reads only the columns it needs and skips whole partitions (and row groups)
+that fail the weatherScore / Year filters. Adding Origin to the partitioning
+splits the data into thousands of files of a few hundred rows each, and
+opening them costs more than parsing the CSV.
+
+Build it once from the CSV:
+    python Dashboard/flight_store.py --csv Dashboard/procesed_flight_data.csv.gz --out Dashboard/flight_store
+"""
+import argparse
+import os
+import shutil
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from flight_schema import DASHBOARD_COLUMNS, compact_frame
+from sampling import DEFAULT_STRATA, stratified_reservoir_sample
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV_PATH = os.path.join(script_dir, 'procesed_flight_data.csv.gz')
+DEFAULT_STORE_DIR = os.path.join(script_dir, 'flight_store')
+
+PARTITION_COLUMNS = ['Year', 'Month']
+# 11 years x 12 months is 132; leave headroom for new years or finer --partition-by
+MAX_PARTITIONS = 4096
+# Well under the common `ulimit -n` of 1024; beyond it the writer closes and reopens files
+MAX_OPEN_FILES = 512
+# Row groups big enough that per-group overhead doesn't dominate the scan
+MIN_ROWS_PER_GROUP = 50_000
+MAX_ROWS_PER_GROUP = 250_000
+
+# Years the viewer never shows
+EXCLUDED_YEARS = (2020, 2021, 2022)
+
+
+# ==========================================
+# CSV SOURCE
+# ==========================================
+def iter_csv(csv_path, columns=DASHBOARD_COLUMNS, exclude_years=EXCLUDED_YEARS, chunksize=10000):
+    """Yields `columns` of the gzip CSV as DataFrame chunks with stripped column names.
+
+    Rows from `exclude_years` are dropped, as iter_store() does, so both
+    sources feed the sampler the same rows.
+    """
+    # Header names may carry stray whitespace, so match them stripped
+    wanted = set(columns) if columns is not None else None
+    usecols = (lambda name: name.strip() in wanted) if wanted is not None else None
+    for chunk in pd.read_csv(csv_path, compression='gzip', chunksize=chunksize, usecols=usecols):
+        chunk.columns = chunk.columns.str.strip()
+        if exclude_years and 'Year' in chunk.columns:
+            chunk = chunk[~chunk['Year'].isin(list(exclude_years))]
+        yield chunk
+
+
+def _arrow_schema(first_chunk):
+    """Arrow schema for the store: numbers as float64 so later chunks may hold NaN."""
+    fields = []
+    for name, dtype in first_chunk.dtypes.items():
+        if name in ('Year', 'Month'):
+            fields.append(pa.field(name, pa.int16()))
+        elif pd.api.types.is_bool_dtype(dtype):
+            fields.append(pa.field(name, pa.bool_()))
+        elif pd.api.types.is_numeric_dtype(dtype):
+            fields.append(pa.field(name, pa.float64()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def build_store(csv_path, store_dir, chunksize=250_000, partition_columns=PARTITION_COLUMNS):
+    """Converts the gzip CSV into a hive-partitioned (default Year/Month) Parquet dataset."""
+    chunks = pd.read_csv(csv_path, compression='gzip', chunksize=chunksize, low_memory=False)
+    first = next(chunks)
+    first.columns = first.columns.str.strip()
+    schema = _arrow_schema(first)
+
+    def batches():
+        for chunk in _chain(first, chunks):
+            chunk.columns = chunk.columns.str.strip()
+            chunk = chunk.dropna(subset=list(partition_columns))
+            yield from pa.Table.from_pandas(chunk, schema=schema, preserve_index=False).to_batches()
+
+    if os.path.isdir(store_dir):
+        shutil.rmtree(store_dir)
+
+    ds.write_dataset(
+        batches(),
+        store_dir,
+        schema=schema,
+        format='parquet',
+        partitioning=ds.partitioning(
+            pa.schema([schema.field(name) for name in partition_columns]),
+            flavor='hive',
+        ),
+        max_partitions=MAX_PARTITIONS,
+        max_open_files=MAX_OPEN_FILES,
+        min_rows_per_group=MIN_ROWS_PER_GROUP,
+        max_rows_per_group=MAX_ROWS_PER_GROUP,
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+# ==========================================
+# STORE SOURCE
+# ==========================================
+def open_store(store_dir):
+    """Opens the partitioned store as a pyarrow dataset."""
+    return ds.dataset(store_dir, format='parquet', partitioning='hive')
+
+
+def store_filter(min_score=0, exclude_years=EXCLUDED_YEARS):
+    """Pushdown filter: weatherScore above `min_score` and Year outside `exclude_years`."""
+    condition = ds.field('weatherScore') > min_score
+    if exclude_years:
+        condition = condition & ~ds.field('Year').isin(list(exclude_years))
+    return condition
+
+
+def iter_store(store_dir, columns=DASHBOARD_COLUMNS, min_score=0, exclude_years=EXCLUDED_YEARS, chunksize=100_000):
+    """Yields the rows passing the pushdown filter as DataFrames of `columns`.
+
+    Record batches can be small, so they are coalesced into chunks of about
+    `chunksize` rows before converting to pandas.
+    """
+    dataset = open_store(store_dir)
+    columns = [name for name in columns if name in dataset.schema.names]
+    pending, pending_rows = [], 0
+    for batch in dataset.to_batches(columns=columns, filter=store_filter(min_score, exclude_years)):
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunksize:
+            yield pa.Table.from_batches(pending).to_pandas()
+            pending, pending_rows = [], 0
+    if pending_rows:
+        yield pa.Table.from_batches(pending).to_pandas()
+
+
+def read_store(store_dir, columns=DASHBOARD_COLUMNS, min_score=0, exclude_years=EXCLUDED_YEARS):
+    """Reads only `columns` of the rows passing the pushdown filter."""
+    dataset = open_store(store_dir)
+    columns = [name for name in columns if name in dataset.schema.names]
+    table = dataset.to_table(columns=columns, filter=store_filter(min_score, exclude_years))
+    return table.to_pandas()
+
+
+# ==========================================
+# DASHBOARD SAMPLE
+# ==========================================
+def sample_flights(csv_path, store_dir=DEFAULT_STORE_DIR, total=5000, strata=DEFAULT_STRATA, seed=42):
+    """The dashboard's compacted stratified sample, from the store when it exists, else the CSV; None if empty."""
+    if os.path.isdir(store_dir):
+        # Only the dashboard's columns, with weatherScore/Year filters pushed down
+        chunks = iter_store(store_dir)
+    else:
+        chunks = iter_csv(csv_path)
+
+    # One streaming pass; only the sampled rows are ever held in memory
+    result = stratified_reservoir_sample(chunks, 'weatherScore', strata=strata, total=total, seed=seed)
+    # Drop unused columns and downcast to the compact schema (flight_schema.py)
+    return compact_frame(result) if len(result) > 0 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the partitioned Parquet flight store from the processed CSV.')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='processed flight data (.csv.gz)')
+    parser.add_argument('--out', default=DEFAULT_STORE_DIR, help='store directory (replaced if present)')
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    parser.add_argument('--partition-by', nargs='+', default=PARTITION_COLUMNS,
+                        help='partition columns; fewer levels means fewer, larger files')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_store(args.csv, args.out, chunksize=args.chunksize, partition_columns=args.partition_by)
+    elapsed = time.perf_counter() - start
+
+    n_files = sum(len(files) for _, _, files in os.walk(args.out))
+    n_rows = open_store(args.out).count_rows()
+    print(f"Wrote {n_rows:,} rows in {n_files:,} files to {args.out} ({elapsed:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
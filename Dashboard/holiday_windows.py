@@ -0,0 +1,26 @@
+"""Holiday calendar shared by the feature pipeline and the dashboard's predictor.
+
+Modeling/features.py builds IsHoliday and IsHolidayWindow from these when the
+model is trained, and predictor.py from the same definitions when it is
+served, so the two cannot drift apart. Kept in Dashboard/ because the
+dashboard is deployed on its own; Modeling/ puts this directory on sys.path.
+"""
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+
+# (month, day) pairs around the holidays that drive travel peaks
+HOLIDAY_WINDOWS = (
+    [(5, d) for d in range(25, 32)]      # Memorial Day
+    + [(7, d) for d in range(2, 7)]      # Independence Day
+    + [(9, d) for d in range(1, 8)]      # Labor Day
+    + [(11, d) for d in range(22, 29)]   # Thanksgiving
+    + [(12, d) for d in range(19, 32)]   # Christmas
+    + [(1, 1)]                           # New Year
+    + [(3, d) for d in range(28, 32)]    # Easter
+    + [(4, d) for d in range(1, 3)]      # Easter
+)
+
+
+def federal_holidays(start='1987-01-01', end='2035-12-31'):
+    """US federal holidays as a DatetimeIndex (the whole BTS era by default)."""
+    return USFederalHolidayCalendar().holidays(start=start, end=end)
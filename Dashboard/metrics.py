@@ -0,0 +1,199 @@
+"""In-process latency histograms for the dashboard's hot paths.
+
+Off unless DASHBOARD_METRICS=1 is set (or set_enabled(True) is called).
+Time a call or a block under a name:
+
+    @timed('load_data')
+    def load_data(...): ...
+
+    with timer('gauge'):
+        fig = go.Figure(...)
+
+Each name gets a process-wide Histogram with fixed, Prometheus-style
+buckets. The admin page (app.py, ?admin=1) shows summary_frame(), and
+write_prometheus() dumps every histogram in the Prometheus text format to a
+local file for a node_exporter textfile collector or a sidecar to pick up.
+While disabled, timed() costs one flag check per call and timer() returns a
+shared no-op context manager; neither reads the clock
+(tests/test_metrics.py checks this, benchmarks/bench_metrics.py times it).
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+
+
+# Upper bounds in seconds; the last bucket (+Inf) is implicit
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = 'dashboard_'
+DEFAULT_METRICS_FILE = os.environ.get(
+    'DASHBOARD_METRICS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard_metrics.prom'))
+WRITE_INTERVAL_SECONDS = 15.0
+
+_enabled = os.environ.get('DASHBOARD_METRICS') == '1'
+_NOOP = nullcontext()
+HISTOGRAMS = {}
+_registry_lock = threading.Lock()
+_last_write = [0.0]
+
+
+# ==========================================
+# HISTOGRAMS
+# ==========================================
+class Histogram:
+    """Counts of observed durations per bucket, plus their sum and maximum."""
+
+    def __init__(self, name, buckets=BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        """(bucket counts, count, sum, max), read consistently."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+    def quantile(self, q):
+        """Estimated q-quantile, interpolating inside the bucket like Prometheus' histogram_quantile."""
+        counts, count, _, maximum = self.snapshot()
+        if count == 0:
+            return float('nan')
+        rank, seen = q * count, 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else maximum
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, maximum)
+            seen += bucket_count
+        return maximum
+
+
+def histogram(name):
+    """The process-wide Histogram for `name`, created on first use."""
+    found = HISTOGRAMS.get(name)
+    if found is None:
+        with _registry_lock:
+            found = HISTOGRAMS.setdefault(name, Histogram(name))
+    return found
+
+
+def reset():
+    with _registry_lock:
+        HISTOGRAMS.clear()
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+# ==========================================
+# TIMING
+# ==========================================
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, name):
+        self.histogram = histogram(name)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+def timer(name):
+    """Context manager timing its block into histogram `name`; a shared no-op while disabled."""
+    return _Timer(name) if _enabled else _NOOP
+
+
+def timed(name):
+    """Decorator timing every call into histogram `name`, exceptions included."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram(name).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# ==========================================
+# EXPORT
+# ==========================================
+def summary_frame():
+    """One row per histogram for the admin page: calls, mean, p50/p95/p99 and max in ms."""
+    rows = []
+    for name, hist in sorted(HISTOGRAMS.items()):
+        _, count, total, maximum = hist.snapshot()
+        rows.append({'metric': name, 'calls': count,
+                     'mean ms': round(total / count * 1000, 3) if count else float('nan'),
+                     'p50 ms': round(hist.quantile(0.50) * 1000, 3), 'p95 ms': round(hist.quantile(0.95) * 1000, 3),
+                     'p99 ms': round(hist.quantile(0.99) * 1000, 3), 'max ms': round(maximum * 1000, 3),
+                     'total s': round(total, 3)})
+    return pd.DataFrame(rows, columns=['metric', 'calls', 'mean ms', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms',
+                                       'total s'])
+
+
+def render_prometheus(prefix=METRIC_PREFIX):
+    """Every histogram in the Prometheus text exposition format (cumulative buckets)."""
+    lines = []
+    for name, hist in sorted(HISTOGRAMS.items()):
+        counts, count, total, _ = hist.snapshot()
+        metric = f"{prefix}{name}_seconds"
+        lines.append(f"# HELP {metric} Wall-clock time of {name} in the dashboard.")
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(hist.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{metric}_sum {total:.9g}")
+        lines.append(f"{metric}_count {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=DEFAULT_METRICS_FILE):
+    """Atomically replaces `path` with render_prometheus(); returns the path."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as file:
+        file.write(render_prometheus())
+    os.replace(tmp, path)
+    _last_write[0] = time.monotonic()
+    return path
+
+
+def write_prometheus_if_due(path=DEFAULT_METRICS_FILE, interval=WRITE_INTERVAL_SECONDS):
+    """write_prometheus() at most once per `interval` seconds, and only while enabled."""
+    if _enabled and time.monotonic() - _last_write[0] >= interval:
+        return write_prometheus(path)
+    return None
@@ -0,0 +1,237 @@
+"""Trained LightGBM delay model for the dashboard, with the heuristic as fallback.
+
+The regressor predicts log1p(DepDelayMinutes). Fit it on the features this
+module can build (Modeling/features.DASHBOARD_FEATURES) and save it next to
+this file with
+
+    python Modeling/train.py
+
+load_delay_model() reads the booster once and resolves where each of its
+features comes from, so a prediction only fills a float matrix and calls the
+booster. Inputs use the dashboard's columns and metric units; they are
+converted to the notebook's Imperial units here. A booster trained on
+features the dashboard does not have (airport ids, departure counts, rolling
+delay means) still loads, with a warning: those features are passed as NaN,
+and LightGBM reads NaN as 0 for any feature that had no missing values in
+training, so its predictions assume zero departures and zero delays.
+
+Without the model file or the lightgbm package, predict_frame() falls back to
+the heuristic risk score from scoring.py.
+"""
+import os
+import warnings
+
+import numpy as np
+
+from holiday_windows import HOLIDAY_WINDOWS, federal_holidays
+from scoring import FRAME_COLUMNS, calculate_risk_scores, score_frame
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(script_dir, 'delay_model.txt')
+
+# The calendar Modeling/features.py trains on, as sorted lookup arrays
+_HOLIDAY_WINDOW_KEYS = np.array(sorted(m * 100 + d for m, d in HOLIDAY_WINDOWS))
+_FEDERAL_HOLIDAYS = federal_holidays().values.astype('datetime64[D]')
+
+# Prefixes of the notebook's one-hot columns, e.g. Origin_PHX or Month_3
+ONE_HOT_PREFIXES = ('Origin', 'Dest', 'Month', 'DayOfWeek')
+
+
+# ==========================================
+# MODEL FEATURES
+# ==========================================
+def _column(columns, name, n):
+    values = columns.get(name)
+    if values is None:
+        return np.full(n, np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def model_inputs(columns, n):
+    """Notebook feature name -> float64 array, from dashboard columns (metric units).
+
+    `columns` maps dashboard column names to arrays (or scalars) of length `n`.
+    Features that cannot be derived from what is present are left out.
+    """
+    month = _column(columns, 'Month', n)
+    day = _column(columns, 'DayofMonth', n)
+    year = _column(columns, 'Year', n)
+    tavg, tmin, tmax = (_column(columns, c, n) for c in ('tavg', 'tmin', 'tmax'))
+    wspd = _column(columns, 'wspd', n) / 1.60934
+    distance = _column(columns, 'Distance', n)
+
+    # Calendar date from Year/Month/DayofMonth; NaT where any part is missing
+    dated = ~(np.isnan(year) | np.isnan(month) | np.isnan(day))
+    date = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+    date[dated] = (
+        (year[dated] - 1970).astype(np.int64).astype('datetime64[Y]')
+        + (month[dated] - 1).astype(np.int64).astype('timedelta64[M]')
+    ).astype('datetime64[D]') + (day[dated] - 1).astype(np.int64).astype('timedelta64[D]')
+
+    day_of_week = _column(columns, 'DayOfWeek', n)
+    # 1970-01-01 was a Thursday (BTS DayOfWeek 4)
+    derived_dow = np.where(dated, (date.astype(np.int64) + 3) % 7 + 1, np.nan)
+    day_of_week = np.where(np.isnan(day_of_week), derived_dow, day_of_week)
+
+    features = {
+        'Year': year,
+        'Month': month,
+        'DayofMonth': day,
+        'DayOfWeek': day_of_week,
+        'Flight_Number_Reporting_Airline': _column(columns, 'Flight_Number_Reporting_Airline', n),
+        'CRSDepTime': _column(columns, 'CRSDepTime', n),
+        'CRSArrTime': _column(columns, 'CRSArrTime', n),
+        'Distance': distance,
+        # Notebook units: rounded °F, inches, mph, inHg
+        'tavg': np.round(tavg * 9 / 5 + 32),
+        'tmin': np.round(tmin * 9 / 5 + 32),
+        'tmax': np.round(tmax * 9 / 5 + 32),
+        'prcp': _column(columns, 'prcp', n) / 25.4,
+        'snow': _column(columns, 'snow', n) / 25.4,
+        'wspd': wspd,
+        'pres': _column(columns, 'pres', n) * 0.02953,
+        'IsWeekend': np.where(np.isnan(day_of_week), np.nan, (day_of_week >= 6).astype(np.float64)),
+        'IsHoliday': np.where(dated, np.isin(date, _FEDERAL_HOLIDAYS), np.nan),
+        'IsHolidayWindow': np.where(
+            np.isnan(month) | np.isnan(day), np.nan, np.isin(month * 100 + day, _HOLIDAY_WINDOW_KEYS)),
+        'Dist_x_Wspd': distance * wspd,
+        'TempRange': np.round(tmax * 9 / 5 + 32) - np.round(tmin * 9 / 5 + 32),
+        'MonthxWeekday': month * day_of_week,
+    }
+    for prefix, clock in (('Dep', 'CRSDepTime'), ('Arr', 'CRSArrTime')):
+        hhmm = features[clock]
+        minutes = (hhmm // 100) * 60 + hhmm % 100
+        features[f'{prefix}Hour'] = hhmm // 100
+        features[f'{prefix}Minute'] = hhmm % 100
+        features[f'{prefix}TotalMinutes'] = minutes
+        features[f'{prefix}Time_sin'] = np.sin(2 * np.pi * minutes / 1440)
+        features[f'{prefix}Time_cos'] = np.cos(2 * np.pi * minutes / 1440)
+    return features
+
+
+# Every feature model_inputs() can build
+MODEL_INPUT_NAMES = frozenset(model_inputs({}, 0))
+
+
+def _one_hot_source(name):
+    # 'Origin_PHX' -> ('Origin', 'PHX'); None for anything else
+    prefix, _, value = name.partition('_')
+    if prefix in ONE_HOT_PREFIXES and value:
+        return prefix, value
+    return None
+
+
+def _as_number(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+# ==========================================
+# LOADED MODEL
+# ==========================================
+class DelayModel:
+    """A LightGBM booster plus the column layout of its feature matrix."""
+
+    def __init__(self, booster):
+        self.booster = booster
+        self.feature_names = booster.feature_name()
+        # Resolved once: plain features by position, one-hot features by (prefix, value)
+        self._plain = []
+        self._one_hot = []
+        for position, name in enumerate(self.feature_names):
+            source = _one_hot_source(name)
+            if source is None:
+                self._plain.append((position, name))
+            else:
+                prefix, value = source
+                self._one_hot.append((position, prefix, value, _as_number(value)))
+        self.unbuildable = [name for _, name in self._plain if name not in MODEL_INPUT_NAMES]
+
+    def feature_matrix(self, columns, n):
+        """(n, n_features) float64 matrix in the booster's column order; NaN where a feature can't be built."""
+        inputs = model_inputs(columns, n)
+        matrix = np.full((n, len(self.feature_names)), np.nan)
+        for position, name in self._plain:
+            values = inputs.get(name)
+            if values is not None:
+                matrix[:, position] = values
+        for position, prefix, value, number in self._one_hot:
+            raw = columns.get(prefix)
+            if raw is None:
+                continue
+            raw = np.asarray(raw)
+            if raw.dtype.kind in 'iuf':
+                matrix[:, position] = raw == number if number is not None else 0.0
+            else:
+                matrix[:, position] = raw.astype(str) == value
+        return matrix
+
+    def predict_minutes(self, columns, n):
+        """Predicted departure delay in minutes for `n` rows of dashboard columns."""
+        matrix = self.feature_matrix(columns, n)
+        # One thread: a single row is latency-bound, and the dashboard's batches are small
+        log_minutes = self.booster.predict(matrix, num_threads=1)
+        return np.clip(np.expm1(log_minutes), 0.0, None)
+
+    def predict_one(self, row):
+        """Predicted delay in minutes for one flight given as a {column: value} mapping."""
+        return float(self.predict_minutes({name: np.array([value]) for name, value in row.items()}, 1)[0])
+
+
+def load_delay_model(path=MODEL_PATH):
+    """The exported booster as a DelayModel, or None if the file or lightgbm is missing."""
+    if not os.path.exists(path):
+        return None
+    try:
+        import lightgbm
+    except ImportError:
+        return None
+    model = DelayModel(lightgbm.Booster(model_file=path))
+    if model.unbuildable:
+        warnings.warn(f"{os.path.basename(path)} uses features the dashboard cannot build, passed as NaN "
+                      f"(read as 0 unless missing in training): {', '.join(model.unbuildable)}. "
+                      f"Retrain it with Modeling/train.py.", stacklevel=2)
+    return model
+
+
+def _decode_airports(columns, origin_classes):
+    # Encoded ids -> IATA codes; ids outside the encoder match no one-hot column
+    classes = np.asarray(origin_classes)
+    for name in ('Origin', 'Dest'):
+        if name in columns:
+            ids = np.nan_to_num(np.asarray(columns[name], dtype=np.float64), nan=-1).astype(np.int64)
+            known = (ids >= 0) & (ids < len(classes))
+            columns[name] = np.where(known, classes[np.where(known, ids, 0)], '')
+    return columns
+
+
+def predict_frame(model, df, origin_classes=None):
+    """Predicted delay minutes for every row of a dashboard DataFrame.
+
+    `origin_classes` decodes label-encoded Origin/Dest ids to IATA codes for
+    the model's one-hot airport features. Returns (values, kind): kind is
+    'minutes' from the model, or 'risk score' (0-100 heuristic) when `model`
+    is None.
+    """
+    if model is None:
+        return score_frame(df, FRAME_COLUMNS), 'risk score'
+    columns = {name: np.asarray(df[name].to_numpy()) for name in df.columns}
+    if origin_classes is not None:
+        columns = _decode_airports(columns, origin_classes)
+    return model.predict_minutes(columns, len(df)), 'minutes'
+
+
+def predict_row(model, row, origin_classes=None):
+    """predict_frame() for one flight given as a {column: value} mapping; returns (value, kind)."""
+    if model is None:
+        score = calculate_risk_scores(
+            *(row.get(FRAME_COLUMNS[field], np.nan) for field in ('wspd', 'prcp', 'snow', 'pres', 'dep_time', 'distance'))
+        )
+        return float(score), 'risk score'
+    columns = {name: np.array([value]) for name, value in row.items()}
+    if origin_classes is not None:
+        columns = _decode_airports(columns, origin_classes)
+    return float(model.predict_minutes(columns, 1)[0]), 'minutes'
@@ -0,0 +1,45 @@
+"""Per-rerun section timings for the dashboard (add ?timing=1 to the URL).
+
+Streamlit reruns either the whole script or, for an interaction inside an
+st.fragment, just that fragment. Every run gets its own RerunTimer named
+after its scope ('app', 'viewer', 'calculator', ...), and each section of
+the run is wrapped in `with timer.section(name):`. The app keeps the latest
+rows per scope in session state, so the panel shows what the last full run
+and the last run of every fragment spent where.
+"""
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+class RerunTimer:
+    """Wall-clock seconds of the named sections of one script or fragment run."""
+
+    def __init__(self, scope, clock=time.perf_counter):
+        self.scope = scope
+        self._clock = clock
+        self._started = clock()
+        self.sections = []
+
+    @contextmanager
+    def section(self, name):
+        start = self._clock()
+        try:
+            yield
+        finally:
+            # Also recorded when the section ends in st.rerun() or st.stop()
+            self.sections.append((name, self._clock() - start))
+
+    def rows(self):
+        """One row per section plus a 'total' row for the whole run so far."""
+        rows = [{'scope': self.scope, 'section': name, 'ms': round(seconds * 1000, 2)}
+                for name, seconds in self.sections]
+        rows.append({'scope': self.scope, 'section': 'total', 'ms': round((self._clock() - self._started) * 1000, 2)})
+        return rows
+
+
+def timings_frame(timings):
+    """{scope: rows} from RerunTimer.rows() as one table, scopes in first-run order."""
+    rows = [row for scope_rows in timings.values() for row in scope_rows]
+    return pd.DataFrame(rows, columns=['scope', 'section', 'ms'])
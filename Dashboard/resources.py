@@ -0,0 +1,136 @@
+"""Process-wide, read-only resources shared by every Streamlit session.
+
+Each loader runs once per server process through st.cache_resource instead
+of once per session or rerun. Callers must treat what they get back as
+read-only. RESOURCE_STATS records how many times each loader actually ran,
+how long it took and the approximate size of what it returned.
+"""
+import functools
+import os
+import pickle
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from flight_index import airport_display_names
+from predictor import MODEL_PATH, load_delay_model
+from risk_cube import DEFAULT_CUBE_DIR, load_cube
+from score_cache import DEFAULT_MAX_SIZE, DEFAULT_TTL_SECONDS, ScoreCache
+from snapshot import DEFAULT_SNAPSHOT_DIR, load_snapshot
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+ENCODERS_PATH = os.path.join(script_dir, 'label_encoders.pkl')
+
+# name -> {'loads': int, 'seconds': float, 'bytes': int}
+RESOURCE_STATS = {}
+_stats_lock = threading.Lock()
+
+
+# ==========================================
+# INSTRUMENTATION
+# ==========================================
+def footprint(obj):
+    """Approximate in-memory size of a loaded resource, in bytes."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(footprint(k) + footprint(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(footprint(item) for item in obj)
+    if isinstance(obj, (str, bytes, int, float)) or obj is None:
+        return sys.getsizeof(obj)
+    try:
+        return len(pickle.dumps(obj))
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+def tracked(name):
+    """Records load count, time and footprint of the wrapped loader under `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            size = footprint(result)
+            with _stats_lock:
+                stats = RESOURCE_STATS.setdefault(name, {'loads': 0, 'seconds': 0.0, 'bytes': 0})
+                stats['loads'] += 1
+                stats['seconds'] += elapsed
+                stats['bytes'] = size
+            return result
+        return wrapper
+    return decorator
+
+
+def resource_stats_frame():
+    """RESOURCE_STATS as a small table for the debug panel."""
+    with _stats_lock:
+        rows = [
+            {'resource': name, 'loads': s['loads'], 'load seconds': round(s['seconds'], 3),
+             'size (KB)': round(s['bytes'] / 1024, 1)}
+            for name, s in sorted(RESOURCE_STATS.items())
+        ]
+    return pd.DataFrame(rows, columns=['resource', 'loads', 'load seconds', 'size (KB)'])
+
+
+# ==========================================
+# SHARED RESOURCES
+# ==========================================
+@st.cache_resource(show_spinner=False)
+@tracked('label_encoders')
+def get_label_encoders(path=ENCODERS_PATH):
+    """Unpickled label encoders ({'Origin': LabelEncoder, 'Dest': ..., ...})."""
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+@st.cache_resource(show_spinner=False)
+@tracked('origin_classes')
+def get_origin_classes(path=ENCODERS_PATH):
+    """Encoded Origin index -> IATA code, as a compact fixed-width string array."""
+    return np.asarray(get_label_encoders(path)['Origin'].classes_, dtype='U3')
+
+
+@st.cache_resource(show_spinner=False)
+@tracked('airport_names')
+def get_airport_names():
+    """IATA code -> 'Airport Name (IATA)' for every airport airportsdata knows."""
+    return airport_display_names()
+
+
+@st.cache_resource(show_spinner=False)
+@tracked('delay_model')
+def get_delay_model(path=MODEL_PATH):
+    """The exported LightGBM delay model (predictor.DelayModel), or None to use the heuristic."""
+    return load_delay_model(path)
+
+
+@st.cache_resource(show_spinner=False)
+@tracked('risk_cube')
+def get_risk_cube(cube_dir=DEFAULT_CUBE_DIR):
+    """The memory-mapped airport x date x hour risk cube (risk_cube.RiskCube), or None if not built."""
+    return load_cube(cube_dir)
+
+
+@st.cache_resource(show_spinner=False)
+@tracked('snapshot')
+def get_snapshot(source_path, params, store_dir=None, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """The memory-mapped working-set snapshot (snapshot.Snapshot), or None if missing or stale.
+
+    Stale means `source_path` or the flight store in `store_dir` changed since it was built.
+    """
+    return load_snapshot(snapshot_dir, source_path, params, store_dir)
+
+
+@st.cache_resource(show_spinner=False)
+def get_score_cache(max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL_SECONDS):
+    """The process-wide score_cache.ScoreCache shared by the calculator and the viewer."""
+    return ScoreCache(max_size=max_size, ttl=ttl)
@@ -0,0 +1,181 @@
+"""Precomputed network-wide risk cube: airport x date x departure hour.
+
+The heuristic only depends on a flight through its daily weather, whether it
+leaves after 18:00 and whether it flies more than 2000 miles. So every flight
+of an (airport, date, hour) scores one of three values, weather risk + 0, +5
+or +10, and the hour's mean risk is those three clipped scores weighted by
+the share of the airport's scheduled departures in that hour that carry each
+offset. The shares come from the schedule (e.g. the combined BTS CSV from
+Data/bts_download.py); hours without scheduled departures are scored as a
+short-haul flight leaving at half past the hour.
+
+The cube is saved as plain .npy files so the dashboard can memory-map it and
+slice it without rescoring:
+
+    risk_cube/airports.npy     (A,)        IATA codes, sorted
+    risk_cube/dates.npy        (D,)        datetime64[D], every day in range
+    risk_cube/risk.npy         (A, D, 24)  float32 mean risk, NaN without weather
+    risk_cube/departures.npy   (A, 24)     scheduled departures in the schedule
+
+Build it from the daily Meteostat table and the schedule:
+    python Dashboard/risk_cube.py --weather Meteostat_daily_2000-2025.csv --schedule combined_data.csv
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import calculate_risk_scores
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CUBE_DIR = os.path.join(script_dir, 'risk_cube')
+
+HOURS = 24
+WEATHER_COLUMNS = ['airport', 'date', 'wspd', 'prcp', 'snow', 'pres']
+SCHEDULE_COLUMNS = ['Origin', 'CRSDepTime', 'Distance']
+# Per-flight score offsets on top of the weather risk: none, one of
+# (late departure, long haul), both. Scored through calculate_risk_scores
+# with a (dep_time, distance) pair that triggers exactly those terms.
+OFFSET_INPUTS = ((0, 0.0), (1900, 0.0), (1900, 2001.0))
+ARRAY_NAMES = ('airports', 'dates', 'risk', 'departures')
+
+
+# ==========================================
+# BUILD
+# ==========================================
+def weather_grid(weather, airports, dates):
+    """(A, D) arrays of wspd, prcp, snow, pres; NaN where the table has no row."""
+    a = np.searchsorted(airports, weather['airport'].to_numpy(dtype=str))
+    d = (weather['date'].to_numpy(dtype='datetime64[D]') - dates[0]).astype(np.int64)
+    grids = []
+    for name in WEATHER_COLUMNS[2:]:
+        grid = np.full((len(airports), len(dates)), np.nan)
+        grid[a, d] = weather[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        grids.append(grid)
+    return grids
+
+
+def offset_shares(schedule, airports):
+    """(A, 24, 3) share of each airport-hour's departures per offset, and (A, 24) counts."""
+    schedule = schedule[schedule['Origin'].isin(airports)]
+    a = np.searchsorted(airports, schedule['Origin'].to_numpy(dtype=str))
+    dep_time = schedule['CRSDepTime'].to_numpy(dtype=np.float64)
+    hour = (dep_time // 100).astype(np.int64) % HOURS
+    offset = (dep_time > 1800).astype(np.int64) + (schedule['Distance'].to_numpy(dtype=np.float64) > 2000)
+
+    counts = np.zeros((len(airports), HOURS, len(OFFSET_INPUTS)), dtype=np.int64)
+    np.add.at(counts, (a, hour, offset), 1)
+    departures = counts.sum(axis=2)
+
+    # Hours nobody departs in: a short-haul flight at HH30
+    empty_offset = np.where(np.arange(HOURS) * 100 + 30 > 1800, 1, 0)
+    shares = counts / np.maximum(departures, 1)[:, :, None]
+    empty = departures == 0
+    shares[empty] = np.eye(len(OFFSET_INPUTS))[np.broadcast_to(empty_offset, empty.shape)[empty]]
+    return shares, departures
+
+
+def build_cube(weather, schedule, airports=None):
+    """Dense risk cube from the daily weather table and the schedule; returns a dict of arrays."""
+    weather = weather[WEATHER_COLUMNS].dropna(subset=['airport', 'date'])
+    if airports is None:
+        airports = weather['airport'].unique()
+    airports = np.sort(np.asarray(airports, dtype='U3'))
+    weather = weather[weather['airport'].isin(airports)]
+    day = pd.to_datetime(weather['date']).to_numpy(dtype='datetime64[D]')
+    weather = weather.assign(date=day)
+    dates = np.arange(day.min(), day.max() + np.timedelta64(1, 'D'))
+
+    wspd, prcp, snow, pres = weather_grid(weather, airports, dates)
+    # (A, D, 3): the clipped score for each offset
+    dep_time, distance = (np.array(values, dtype=np.float64) for values in zip(*OFFSET_INPUTS))
+    by_offset = calculate_risk_scores(wspd[..., None], prcp[..., None], snow[..., None], pres[..., None],
+                                      dep_time, distance)
+    missing = np.isnan(wspd) & np.isnan(prcp) & np.isnan(snow) & np.isnan(pres)
+    by_offset[missing] = np.nan
+
+    shares, departures = offset_shares(schedule, airports)
+    risk = np.einsum('ado,aho->adh', by_offset, shares).astype(np.float32)
+    return {'airports': airports, 'dates': dates, 'risk': risk, 'departures': departures.astype(np.int32)}
+
+
+def save_cube(cube, cube_dir=DEFAULT_CUBE_DIR):
+    os.makedirs(cube_dir, exist_ok=True)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(cube_dir, f'{name}.npy'), cube[name])
+
+
+# ==========================================
+# QUERY
+# ==========================================
+class RiskCube:
+    """Memory-mapped view of a saved cube; every query is a slice, nothing is rescored."""
+
+    def __init__(self, cube_dir=DEFAULT_CUBE_DIR, mmap_mode='r'):
+        self.airports = np.load(os.path.join(cube_dir, 'airports.npy'))
+        self.dates = np.load(os.path.join(cube_dir, 'dates.npy'))
+        self.risk = np.load(os.path.join(cube_dir, 'risk.npy'), mmap_mode=mmap_mode)
+        self.departures = np.load(os.path.join(cube_dir, 'departures.npy'))
+        self._airport_index = {code: i for i, code in enumerate(self.airports.tolist())}
+
+    def date_index(self, date):
+        index = int((np.datetime64(date, 'D') - self.dates[0]).astype(np.int64))
+        if not 0 <= index < len(self.dates):
+            raise KeyError(f"{date} is outside {self.dates[0]}..{self.dates[-1]}")
+        return index
+
+    def day(self, date):
+        """(A, 24) risk of every airport and hour on `date`."""
+        return np.asarray(self.risk[:, self.date_index(date), :])
+
+    def airport(self, code, start=None, end=None):
+        """(days, 24) risk of one airport between `start` and `end` (inclusive)."""
+        first = self.date_index(start) if start is not None else 0
+        last = self.date_index(end) if end is not None else len(self.dates) - 1
+        return np.asarray(self.risk[self._airport_index[code], first:last + 1, :])
+
+    def value(self, code, date, hour):
+        return float(self.risk[self._airport_index[code], self.date_index(date), hour])
+
+
+def load_cube(cube_dir=DEFAULT_CUBE_DIR):
+    """The saved cube as a RiskCube, or None when it has not been built."""
+    if not os.path.exists(os.path.join(cube_dir, 'risk.npy')):
+        return None
+    return RiskCube(cube_dir)
+
+
+# ==========================================
+# CLI
+# ==========================================
+def read_table(path, columns):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, low_memory=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the airport x date x hour risk cube.')
+    parser.add_argument('--weather', required=True, help='daily Meteostat table (.csv or .parquet)')
+    parser.add_argument('--schedule', required=True, help='flights with Origin, CRSDepTime, Distance')
+    parser.add_argument('--out', default=DEFAULT_CUBE_DIR)
+    parser.add_argument('--airports', nargs='+', help='default: every airport in the weather table')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    weather = read_table(args.weather, WEATHER_COLUMNS)
+    schedule = read_table(args.schedule, SCHEDULE_COLUMNS)
+    cube = build_cube(weather, schedule, args.airports)
+    save_cube(cube, args.out)
+    elapsed = time.perf_counter() - start
+
+    risk = cube['risk']
+    print(f"Wrote {len(cube['airports'])} airports x {len(cube['dates']):,} days x {HOURS} hours "
+          f"({risk.nbytes / 1e6:.1f} MB) to {args.out} ({elapsed:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Single-pass, seeded, stratified reservoir sampling over DataFrame chunks.
+
+Every row gets a uniform random key and each stratum keeps the rows with the
+smallest keys seen so far (bottom-k sampling). That is a uniform sample
+without replacement per stratum, needs one pass over the input, and never
+holds more than the stratum quotas plus the current chunk in memory.
+"""
+import numpy as np
+import pandas as pd
+
+
+# (lower, upper, share): a row is in the stratum when lower < score <= upper.
+# 70% very low (0-25], 20% medium (25-60), 10% high [60+)
+_BELOW_60 = np.nextafter(60.0, -np.inf)  # so a score of exactly 60 lands in 'high'
+DEFAULT_STRATA = (
+    (0.0, 25.0, 0.70),
+    (25.0, _BELOW_60, 0.20),
+    (_BELOW_60, np.inf, 0.10),
+)
+
+
+def stratum_quotas(strata, total):
+    """Rows to keep per stratum: int(total * share), e.g. 3500/1000/500 of 5000."""
+    return [int(total * share) for _, _, share in strata]
+
+
+def _keep_smallest(reservoir, frame, keys, k):
+    """Merges `frame` into a (frame, keys) reservoir, keeping the `k` smallest keys."""
+    if reservoir is not None:
+        frame = pd.concat([reservoir[0], frame])
+        keys = np.concatenate([reservoir[1], keys])
+    if len(keys) > k:
+        keep = np.argpartition(keys, k)[:k] if k > 0 else np.array([], dtype=np.intp)
+        frame = frame.iloc[keep]
+        keys = keys[keep]
+    return frame, keys
+
+
+def stratified_reservoir_sample(chunks, column='weatherScore', strata=DEFAULT_STRATA, total=5000, seed=42):
+    """Samples `total` rows split across `strata` from an iterable of DataFrames in one pass."""
+    rng = np.random.default_rng(seed)
+    quotas = stratum_quotas(strata, total)
+    reservoirs = [None] * len(strata)
+
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        scores = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        keys = rng.random(len(chunk))
+        for i, (lower, upper, _) in enumerate(strata):
+            in_stratum = (scores > lower) & (scores <= upper)
+            if in_stratum.any():
+                reservoirs[i] = _keep_smallest(reservoirs[i], chunk[in_stratum], keys[in_stratum], quotas[i])
+
+    kept = [r for r in reservoirs if r is not None and len(r[1]) > 0]
+    if not kept:
+        return pd.DataFrame()
+
+    # The keys are uniform random, so ordering by them also shuffles the strata together
+    sample = pd.concat([frame for frame, _ in kept])
+    order = np.argsort(np.concatenate([keys for _, keys in kept]), kind='stable')
+    return sample.iloc[order].reset_index(drop=True)
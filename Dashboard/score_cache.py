@@ -0,0 +1,174 @@
+"""Bounded LRU/TTL cache in front of the heuristic and the delay model.
+
+Calculator inputs and viewer rows cluster heavily, so scores are memoized on
+a canonical key: (wspd, prcp, snow, pres, dep_time, distance) in metric
+units, each stored as an integer count of its QUANTA step. The steps are
+about the resolution the inputs come in (0.25 km/h is 0.16 mph), so inputs
+within a step share an entry. A miss scores the key's own values, not the
+raw inputs, so a hit always returns what a fresh call on the same key would.
+
+Every heuristic threshold is a multiple of its step, and values round
+towards the side of the threshold they are on: up for the `>` thresholds,
+down below ROUND_DOWN_BELOW for the one `<` threshold (pres < 1005). A
+quantized input therefore gets the same heuristic score as the raw one.
+Model predictions see inputs moved by less than one step.
+
+Model predictions read more than those six fields; the rest of the row is
+appended to the key.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from predictor import predict_row
+from scoring import calculate_risk_scores
+
+
+# field -> quantization step, in the processed dataset's metric units. Each
+# divides the field's scoring thresholds; binary fractions keep it exact.
+QUANTA = (
+    ('wspd', 0.25),      # km/h, about the calculator's 0.1 mph
+    ('prcp', 0.25),      # mm, about 0.01 in
+    ('snow', 0.25),      # mm
+    ('pres', 1.0),       # hPa; 0.1 inHg (3.4 hPa) would not divide 1005 and 1020
+    ('dep_time', 1),     # HHMM
+    ('distance', 1.0),   # miles
+)
+# Values round up to the next step, which keeps them on their side of a `>`
+# threshold. Below these values (between a `<` and a `>` threshold) they
+# round down instead, for the `<` threshold.
+ROUND_DOWN_BELOW = {'pres': 1012.5}   # pres < 1005 and pres > 1020
+DEFAULT_MAX_SIZE = 4096
+DEFAULT_TTL_SECONDS = 3600
+
+# Dashboard row columns for the QUANTA fields
+ROW_COLUMNS = {'wspd': 'wspd', 'prcp': 'prcp', 'snow': 'snow', 'pres': 'pres',
+               'dep_time': 'CRSDepTime', 'distance': 'Distance'}
+
+
+# ==========================================
+# CACHE
+# ==========================================
+class ScoreCache:
+    """Thread-safe LRU cache whose entries also expire `ttl` seconds after insertion."""
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_compute(self, key, compute):
+        """Cached value for `key`, calling compute() and storing its result on a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Computed outside the lock; two sessions missing on the same key both compute
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters and occupancy as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max size': self.max_size,
+                'ttl (s)': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# ==========================================
+# KEYS
+# ==========================================
+def _steps(value, field, step):
+    # Integer number of `step`s, rounded towards the value's side of each
+    # threshold; None for missing values so NaN keys still match
+    value = float(value)
+    if math.isnan(value):
+        return None
+    if value < ROUND_DOWN_BELOW.get(field, -math.inf):
+        return math.floor(value / step)
+    return math.ceil(value / step)
+
+
+def quantize(wspd, prcp, snow, pres, dep_time, distance):
+    """Canonical key tuple for the six scoring inputs (metric units)."""
+    values = (wspd, prcp, snow, pres, dep_time, distance)
+    return tuple(_steps(value, field, step) for value, (field, step) in zip(values, QUANTA))
+
+
+def dequantize(key):
+    """The metric input values a quantized key stands for (NaN for missing)."""
+    return tuple(np.nan if steps is None else steps * step for steps, (_, step) in zip(key, QUANTA))
+
+
+def _row_key(row):
+    return quantize(*(row.get(ROW_COLUMNS[field], np.nan) for field, _ in QUANTA))
+
+
+def _canonical(value):
+    if isinstance(value, (float, np.floating)) and math.isnan(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# ==========================================
+# CACHED SCORING
+# ==========================================
+def cached_risk_score(cache, weather, flight_data):
+    """calculate_risk_score() of the quantized inputs, through `cache`."""
+    key = quantize(weather['wspd'], weather['prcp'], weather['snow'], weather['pres'],
+                   flight_data['dep_time'], flight_data['distance'])
+    return cache.get_or_compute(('heuristic',) + key, lambda: float(calculate_risk_scores(*dequantize(key))))
+
+
+def cached_predict_row(cache, model, row, origin_classes=None):
+    """predictor.predict_row() of the row with quantized inputs, through `cache`; returns (value, kind)."""
+    key = _row_key(row)
+    if model is None:
+        return cache.get_or_compute(
+            ('heuristic row',) + key, lambda: (float(calculate_risk_scores(*dequantize(key))), 'risk score'))
+
+    quantized = dict(row)
+    for (field, _), value in zip(QUANTA, dequantize(key)):
+        quantized[ROW_COLUMNS[field]] = value
+    rest = tuple(sorted((name, _canonical(value)) for name, value in row.items()
+                        if name not in ROW_COLUMNS.values()))
+    return cache.get_or_compute(('model', id(model)) + key + rest,
+                                lambda: predict_row(model, quantized, origin_classes))
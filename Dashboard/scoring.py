@@ -0,0 +1,153 @@
+"""Weather Delay Risk heuristic, vectorized over NumPy arrays.
+
+All weather inputs are metric (km/h, mm, hPa), matching the processed
+dataset. Every function here broadcasts, so scalars, column arrays and
+parameter grids can be mixed freely.
+"""
+import numpy as np
+
+
+# Column names used when scoring a DataFrame of processed flight rows
+FRAME_COLUMNS = {
+    'wspd': 'wspd',
+    'prcp': 'prcp',
+    'snow': 'snow',
+    'pres': 'pres',
+    'dep_time': 'CRSDepTime',
+    'distance': 'Distance',
+}
+
+
+def risk_terms(wspd, prcp, snow, pres, dep_time, distance):
+    """Points each factor adds to the score before clipping, as {factor: array}."""
+    wspd = np.asarray(wspd, dtype=np.float64)
+    prcp = np.asarray(prcp, dtype=np.float64)
+    snow = np.asarray(snow, dtype=np.float64)
+    pres = np.asarray(pres, dtype=np.float64)
+    dep_time = np.asarray(dep_time, dtype=np.float64)
+    distance = np.asarray(distance, dtype=np.float64)
+
+    # Same thresholds and order as the original if/elif chain.
+    # NaN compares False everywhere, so missing values add no risk.
+    return {
+        'Wind': np.where(wspd > 40, 30.0, np.where(wspd > 25, 15.0, 0.0)),
+        'Precipitation': np.where(prcp > 15, 35.0, np.where(prcp > 0, 10.0, 0.0)),
+        'Snow': np.where(snow > 0, 40.0, 0.0),
+        'Pressure': np.where(pres < 1005, 25.0, np.where(pres > 1020, 10.0, 0.0)),
+        'Late Departure': np.where(dep_time > 1800, 5.0, 0.0),
+        'Long Haul': np.where(distance > 2000, 5.0, 0.0),
+    }
+
+
+def calculate_risk_scores(wspd, prcp, snow, pres, dep_time, distance):
+    """Calculates the 'Weather Delay Risk' Score (0-100) for many flights at once."""
+    return score_terms(risk_terms(wspd, prcp, snow, pres, dep_time, distance))
+
+
+def score_terms(terms):
+    """The 0-100 score from risk_terms() output."""
+    return np.clip(sum(terms.values()), 0.0, 100.0)
+
+
+def score_frame(df, columns=FRAME_COLUMNS):
+    """Scores every row of a DataFrame that uses the processed CSV column names."""
+    return calculate_risk_scores(
+        df[columns['wspd']].to_numpy(dtype=np.float64, na_value=np.nan),
+        df[columns['prcp']].to_numpy(dtype=np.float64, na_value=np.nan),
+        df[columns['snow']].to_numpy(dtype=np.float64, na_value=np.nan),
+        df[columns['pres']].to_numpy(dtype=np.float64, na_value=np.nan),
+        df[columns['dep_time']].to_numpy(dtype=np.float64, na_value=np.nan),
+        df[columns['distance']].to_numpy(dtype=np.float64, na_value=np.nan),
+    )
+
+
+def calculate_risk_score(weather, flight_data):
+    """Calculates the 'Weather Delay Risk' Score (0-100)."""
+    return float(calculate_risk_scores(
+        weather['wspd'],
+        weather['prcp'],
+        weather['snow'],
+        weather['pres'],
+        flight_data['dep_time'],
+        flight_data['distance'],
+    ))
+
+
+# ==========================================
+# RISK TIERS
+# ==========================================
+# (upper bound, color, title, message); a score falls in the first tier whose
+# upper bound it does not exceed
+RISK_TIERS = (
+    (20, "#4CAF50", "✅ Very Low Risk", "Excellent conditions. Expect on-time departure."),
+    (40, "#8BC34A", "🟢 Low Risk", "Good conditions, though minor weather factors are present."),
+    (60, "#FFB612", "⚠️ Moderate Risk", "Weather/time of day factors present. Potential for minor delays."),
+    (80, "#FF5722", "🚨 High Risk", "Delays are likely."),
+    (100, "#C60C30", "⛔ Very High Risk", "Severe weather. Significant delays or cancellations expected."),
+)
+_TIER_EDGES = np.array([tier[0] for tier in RISK_TIERS[:-1]], dtype=np.float64)
+
+
+def risk_tier_indices(scores):
+    """Index into RISK_TIERS for each score (<=20 -> 0, <=40 -> 1, ... >80 -> 4)."""
+    return np.searchsorted(_TIER_EDGES, np.asarray(scores, dtype=np.float64), side='left')
+
+
+def risk_tier(score):
+    """Color, title and message for a single score."""
+    _, color, title, message = RISK_TIERS[int(risk_tier_indices(score))]
+    return {'color': color, 'title': title, 'message': message}
+
+
+# ==========================================
+# CONTRIBUTING FACTORS
+# ==========================================
+def contributing_factors(weather, flight_data):
+    """Human-readable factors (increasing, decreasing) for one flight.
+
+    Thresholds are checked in metric units; the labels show Imperial values.
+    """
+    increasing = []
+    if weather['wspd'] > 25:
+        increasing.append(f"High Winds ({weather['wspd'] * 0.621371:.1f} mph)")
+    if weather['pres'] < 1005:
+        increasing.append(f"Low Pressure ({weather['pres'] * 0.02953:.1f} inHg)")
+    if weather['prcp'] > 3:
+        increasing.append(f"Precipitation ({weather['prcp'] * 0.03937:.1f} in)")
+    if weather['snow'] > 0:
+        increasing.append(f"Snowfall ({weather['snow'] * 0.03937:.1f} in)")
+    if flight_data['distance'] > 2000:
+        increasing.append("Long Haul Flight")
+    if flight_data['dep_time'] > 1800:
+        increasing.append("Late Evening Departure")
+
+    decreasing = []
+    tavg = weather.get('tavg')
+    if tavg is not None and 15 < tavg < 30:
+        decreasing.append(f"Mild Temps ({tavg * 9 / 5 + 32:.0f}°F)")
+    if weather['wspd'] < 15:
+        decreasing.append("Calm Winds")
+    if weather['pres'] >= 1015:
+        decreasing.append("Good Pressure")
+    if weather['prcp'] == 0:
+        decreasing.append("No Precipitation")
+
+    return increasing, decreasing
+
+
+def top_factors(terms, count=3, separator='; '):
+    """Per flight, the `count` factors of risk_terms() adding the most points, e.g. 'Snow (+40); Wind (+30)'."""
+    labels = np.array(list(terms))
+    points = np.stack(np.broadcast_arrays(*terms.values()), axis=-1).reshape(-1, len(labels))
+    # Stable, so ties keep risk_terms() order
+    order = np.argsort(-points, axis=1, kind='stable')[:, :count]
+
+    result = np.full(len(points), '', dtype=object)
+    for rank in range(order.shape[1]):
+        added = np.take_along_axis(points, order[:, rank:rank + 1], axis=1)[:, 0]
+        text = np.char.add(np.char.add(labels[order[:, rank]], ' (+'),
+                           np.char.add(added.astype(np.int64).astype(str), ')')).astype(object)
+        # Sorted descending, so a factor only follows ranks that added points too
+        joined = np.where(rank == 0, text, result + separator + text)
+        result = np.where(added > 0, joined, result)
+    return result
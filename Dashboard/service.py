@@ -0,0 +1,232 @@
+"""Headless HTTP scoring service (WSGI, no Streamlit).
+
+Endpoints:
+    GET  /health          -> {"status": "ok"}
+    POST /score           -> one flight object in, one result out
+    POST /score/batch     -> {"flights": [...], "explain": true} in, {"results": [...]} out
+    POST /score/csv       -> a schedule CSV in, the scored CSV back (bulk_scoring.py)
+
+A flight is a JSON object in metric units, like the processed dataset:
+    {"wspd": 42.0, "prcp": 3.1, "snow": 0, "pres": 1001.5,
+     "dep_time": 1930, "distance": 850, "tavg": 18.0}
+`tavg` is optional and only used for the "Mild Temps" explanation.
+
+Each result holds the 0-100 score, its status tier and, unless "explain" is
+false, the factors increasing and decreasing the risk. A batch is scored in
+one vectorized call. A CSV schedule is read and scored a chunk at a time and
+may be any size; send it gzip-compressed with Content-Encoding: gzip. The
+scored CSV is spooled to a temporary file and sent only once every chunk has
+been scored, so an error anywhere in the schedule is a 400 rather than a
+truncated 200.
+
+Local development server:
+    python Dashboard/service.py --port 8000
+Multi-worker (any WSGI server, e.g. gunicorn):
+    gunicorn --workers 4 --bind 127.0.0.1:8000 --chdir Dashboard service:app
+"""
+import argparse
+import io
+import json
+import math
+import tempfile
+
+import numpy as np
+
+from bulk_scoring import score_schedule
+from scoring import RISK_TIERS, calculate_risk_scores, contributing_factors, risk_tier_indices
+
+
+REQUIRED_FIELDS = ('wspd', 'prcp', 'snow', 'pres', 'dep_time', 'distance')
+MAX_BATCH_SIZE = 10_000
+MAX_BODY_BYTES = 10 * 1024 * 1024
+SEND_BLOCK_BYTES = 1024 * 1024
+
+
+class BadRequest(Exception):
+    """Raised for malformed requests; becomes a 400 response."""
+
+
+# ==========================================
+# SCORING
+# ==========================================
+def _flight_columns(flights):
+    """Validates a list of flight objects and splits it into float64 columns."""
+    if not isinstance(flights, list) or not flights:
+        raise BadRequest("'flights' must be a non-empty list")
+    if len(flights) > MAX_BATCH_SIZE:
+        raise BadRequest(f"at most {MAX_BATCH_SIZE} flights per batch")
+
+    columns = {}
+    for field in REQUIRED_FIELDS:
+        try:
+            columns[field] = np.array([flight[field] for flight in flights], dtype=np.float64)
+        except (KeyError, TypeError):
+            raise BadRequest(f"every flight needs a numeric '{field}'")
+        except ValueError:
+            raise BadRequest(f"'{field}' must be numeric")
+    return columns
+
+
+def score_flights(flights, explain=True):
+    """Scores a list of flight dicts; returns one result dict per flight."""
+    columns = _flight_columns(flights)
+    scores = calculate_risk_scores(**columns)
+    tiers = risk_tier_indices(scores)
+
+    results = []
+    for i, flight in enumerate(flights):
+        _, color, title, message = RISK_TIERS[tiers[i]]
+        result = {
+            'score': float(scores[i]),
+            'tier': int(tiers[i]),
+            'status': title,
+            'message': message,
+            'color': color,
+        }
+        if explain:
+            weather = {field: float(columns[field][i]) for field in ('wspd', 'prcp', 'snow', 'pres')}
+            tavg = flight.get('tavg')
+            if isinstance(tavg, (int, float)) and not math.isnan(tavg):
+                weather['tavg'] = float(tavg)
+            increasing, decreasing = contributing_factors(
+                weather, {'dep_time': columns['dep_time'][i], 'distance': columns['distance'][i]}
+            )
+            result['factors'] = {'increasing': increasing, 'decreasing': decreasing}
+        results.append(result)
+    return results
+
+
+# ==========================================
+# WSGI APP
+# ==========================================
+def _read_json(environ):
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        raise BadRequest("invalid Content-Length")
+    if length <= 0:
+        raise BadRequest("request body is empty")
+    if length > MAX_BODY_BYTES:
+        raise BadRequest("request body too large")
+    try:
+        return json.loads(environ['wsgi.input'].read(length))
+    except (ValueError, UnicodeDecodeError):
+        raise BadRequest("request body is not valid JSON")
+
+
+class _Body(io.RawIOBase):
+    """wsgi.input limited to Content-Length, since reading past it may block."""
+
+    def __init__(self, stream, length):
+        self.stream = stream
+        self.remaining = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        data = self.stream.read(size) if size else b''
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def _stream_scored_csv(environ, start_response):
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        raise BadRequest("invalid Content-Length")
+    if length <= 0:
+        raise BadRequest("request body is empty")
+    compression = 'gzip' if environ.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip' else None
+
+    # Score everything before answering, so bad input in any chunk is still a 400
+    out = tempfile.TemporaryFile()
+    try:
+        text = io.TextIOWrapper(out, encoding='utf-8', newline='')
+        score_schedule(io.BufferedReader(_Body(environ['wsgi.input'], length)), text, compression=compression)
+        text.flush()
+        text.detach()
+    except (ValueError, UnicodeDecodeError, OSError, EOFError) as e:
+        out.close()
+        raise BadRequest(f"invalid schedule: {e}")
+    size = out.tell()
+    out.seek(0)
+    start_response('200 OK', [('Content-Type', 'text/csv; charset=utf-8'), ('Content-Length', str(size))])
+
+    file_wrapper = environ.get('wsgi.file_wrapper')
+    if file_wrapper is not None:
+        return file_wrapper(out, SEND_BLOCK_BYTES)
+
+    def body():
+        with out:
+            yield from iter(lambda: out.read(SEND_BLOCK_BYTES), b'')
+    return body()
+
+
+def _respond(start_response, status, payload):
+    body = json.dumps(payload).encode('utf-8')
+    start_response(status, [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(body))),
+    ])
+    return [body]
+
+
+def app(environ, start_response):
+    """WSGI entry point."""
+    method = environ.get('REQUEST_METHOD', 'GET')
+    path = environ.get('PATH_INFO', '/').rstrip('/') or '/'
+
+    try:
+        if path == '/health' and method == 'GET':
+            return _respond(start_response, '200 OK', {'status': 'ok'})
+
+        if path == '/score' and method == 'POST':
+            flight = _read_json(environ)
+            if not isinstance(flight, dict):
+                raise BadRequest("body must be a flight object")
+            return _respond(start_response, '200 OK', score_flights([flight])[0])
+
+        if path == '/score/batch' and method == 'POST':
+            body = _read_json(environ)
+            if not isinstance(body, dict):
+                raise BadRequest("body must be an object with a 'flights' list")
+            results = score_flights(body.get('flights'), explain=bool(body.get('explain', True)))
+            return _respond(start_response, '200 OK', {'results': results})
+
+        if path == '/score/csv' and method == 'POST':
+            return _stream_scored_csv(environ, start_response)
+
+        if path in ('/health', '/score', '/score/batch', '/score/csv'):
+            return _respond(start_response, '405 Method Not Allowed', {'error': f"{method} not allowed"})
+        return _respond(start_response, '404 Not Found', {'error': f"no route for {path}"})
+
+    except BadRequest as e:
+        return _respond(start_response, '400 Bad Request', {'error': str(e)})
+
+
+def main():
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    parser = argparse.ArgumentParser(description='Run the scoring service on the stdlib development server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    with make_server(args.host, args.port, app, server_class=ThreadingWSGIServer, handler_class=QuietHandler) as server:
+        print(f"Scoring service on http://{args.host}:{args.port}")
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
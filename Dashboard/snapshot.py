@@ -0,0 +1,290 @@
+"""Memory-mapped snapshot of the dashboard's working set.
+
+Even with the Parquet store, every new server process samples, compacts and
+indexes the flights before the first page renders. The snapshot saves the
+result once as plain .npy files, and the app memory-maps them instead. Each
+worker process then reads the same page-cached bytes:
+
+    snapshot/manifest.json             source file and store, sample parameters, columns
+    snapshot/col_<name>.npy            one array per flight-sample column
+    snapshot/col_<name>.codes.npy      category columns: codes ...
+    snapshot/col_<name>.categories.npy ... and categories
+    snapshot/viewer_rows.npy           rows of the sample shown by the viewer
+    snapshot/flights.npy               the viewer's dropdown flights, in order
+    snapshot/route_flight.npy          per route: index into flights.npy
+    snapshot/route_label.npy           per route: 'Name (IATA) → Name (IATA)'
+    snapshot/route_position.npy        per route: row in the viewer frame
+    snapshot/origin_classes.npy        encoded airport id -> IATA code
+    snapshot/airport_names.npy         display name per origin_classes entry
+
+The manifest records the size, mtime and SHA-256 of the processed CSV the
+snapshot was built from, and of the flight store when there was one, since
+sample_flights() reads the store instead of the CSV when it exists. For a
+store these cover every file, and the hash includes the file names. A
+snapshot is stale and the app falls back to sampling when the CSV or the
+store has changed, when a store has been built since, or when it was built
+with other sample parameters. Size and mtime matching skips the hash.
+
+Build it after the CSV (and flight store, if any) changes:
+    python Dashboard/snapshot.py --csv Dashboard/procesed_flight_data.csv.gz --out Dashboard/snapshot
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from flight_index import airport_display_names, build_flight_index, route_options, viewer_flights
+from flight_store import DEFAULT_CSV_PATH, DEFAULT_STORE_DIR, EXCLUDED_YEARS, sample_flights
+from sampling import DEFAULT_STRATA
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT_DIR = os.path.join(script_dir, 'snapshot')
+ENCODERS_PATH = os.path.join(script_dir, 'label_encoders.pkl')
+
+FORMAT_VERSION = 2
+SAMPLE_SIZE = 5000   # app.SAMPLE_SIZE
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def snapshot_params(total=SAMPLE_SIZE, strata=DEFAULT_STRATA, seed=42, excluded_years=EXCLUDED_YEARS):
+    """The load_data / viewer parameters a snapshot is only valid for, as JSON-friendly values."""
+    return {
+        'total': int(total),
+        'strata': [[float(lower), float(upper), float(share)] for lower, upper, share in strata],
+        'seed': int(seed),
+        'excluded_years': sorted(int(year) for year in excluded_years),
+    }
+
+
+# ==========================================
+# SOURCE FINGERPRINT
+# ==========================================
+def _files(path):
+    # The file itself, or every file under a directory in a stable order
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+
+
+def file_sha256(path):
+    """SHA-256 of a file, or of a directory's file names and contents."""
+    digest = hashlib.sha256()
+    for file_path in _files(path):
+        if file_path != path:
+            digest.update(os.path.relpath(file_path, path).encode() + b'\0')
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(HASH_CHUNK_BYTES), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _size_mtime(path):
+    # Total size and newest mtime of a file or of every file under a directory
+    stats = [os.stat(file_path) for file_path in _files(path)]
+    return sum(stat.st_size for stat in stats), max((stat.st_mtime for stat in stats), default=0.0)
+
+
+def source_fingerprint(path):
+    size, mtime = _size_mtime(path)
+    return {'path': os.path.basename(path), 'size': size, 'mtime': mtime, 'sha256': file_sha256(path)}
+
+
+def _changed(fingerprint, path):
+    size, mtime = _size_mtime(path)
+    if size != fingerprint['size']:
+        return f"{os.path.basename(path)} changed size"
+    # A copy or checkout changes the mtime but not the bytes
+    if mtime != fingerprint['mtime'] and file_sha256(path) != fingerprint['sha256']:
+        return f"{os.path.basename(path)} changed"
+    return None
+
+
+def stale_reason(manifest, source_path=None, params=None, store_dir=None):
+    """Why the snapshot described by `manifest` can't be used, or None when it is fresh.
+
+    A missing source or store is not an error: a deployment may ship the snapshot alone.
+    """
+    if manifest.get('version') != FORMAT_VERSION:
+        return f"format version {manifest.get('version')}, expected {FORMAT_VERSION}"
+    if params is not None and manifest['params'] != params:
+        return 'built with other sample parameters'
+    if source_path is not None and os.path.exists(source_path):
+        reason = _changed(manifest['source'], source_path)
+        if reason is not None:
+            return reason
+    if store_dir is not None and os.path.isdir(store_dir):
+        if manifest['store'] is None:
+            return f"{os.path.basename(store_dir)} was built after the snapshot"
+        return _changed(manifest['store'], store_dir)
+    return None
+
+
+# ==========================================
+# BUILD
+# ==========================================
+def build_snapshot(frame, viewer_rows, flights, routes, origin_classes, airport_names):
+    """Dict of arrays for save_snapshot(); `routes` as returned by flight_index.route_options()."""
+    arrays = {'viewer_rows': np.asarray(viewer_rows, dtype=np.int64)}
+    for name, column in frame.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            arrays[f'col_{name}.codes'] = column.cat.codes.to_numpy()
+            arrays[f'col_{name}.categories'] = column.cat.categories.to_numpy()
+        else:
+            arrays[f'col_{name}'] = column.to_numpy()
+
+    flight_of, labels, positions = [], [], []
+    for i, flight in enumerate(flights):
+        for route in routes.get(flight, []):
+            flight_of.append(i)
+            labels.append(route['label'])
+            positions.append(route['position'])
+    arrays['flights'] = np.asarray(flights, dtype=str)
+    arrays['route_flight'] = np.asarray(flight_of, dtype=np.int32)
+    arrays['route_label'] = np.asarray(labels, dtype=str)
+    arrays['route_position'] = np.asarray(positions, dtype=np.int64)
+
+    origin_classes = np.asarray(origin_classes, dtype=str)
+    arrays['origin_classes'] = origin_classes
+    arrays['airport_names'] = np.asarray([airport_names.get(code, code) for code in origin_classes.tolist()],
+                                         dtype=str)
+    return arrays
+
+
+def save_snapshot(arrays, manifest, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Writes the arrays and the manifest, replacing any previous snapshot."""
+    tmp = f'{snapshot_dir}.partial'
+    if os.path.isdir(tmp):
+        shutil.rmtree(tmp)
+    os.makedirs(tmp)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp, f'{name}.npy'), array, allow_pickle=False)
+    with open(os.path.join(tmp, 'manifest.json'), 'w') as file:
+        json.dump(dict(manifest, version=FORMAT_VERSION), file, indent=2)
+    # Swap in the finished directory so a reader never sees half a snapshot
+    if os.path.isdir(snapshot_dir):
+        shutil.rmtree(snapshot_dir)
+    os.replace(tmp, snapshot_dir)
+
+
+def write_snapshot(csv_path=DEFAULT_CSV_PATH, store_dir=DEFAULT_STORE_DIR, snapshot_dir=DEFAULT_SNAPSHOT_DIR,
+                   encoders_path=ENCODERS_PATH, params=None, airport_names=None):
+    """Samples and indexes the flights the way the app does and saves the snapshot; returns the manifest."""
+    params = params or snapshot_params()
+    # Fingerprint first: a CSV or store rewritten while sampling then reads as stale
+    source = source_fingerprint(csv_path)
+    store = source_fingerprint(store_dir) if os.path.isdir(store_dir) else None
+    strata = [tuple(stratum) for stratum in params['strata']]
+    df = sample_flights(csv_path, store_dir, total=params['total'], strata=strata, seed=params['seed'])
+    if df is None:
+        raise ValueError(f"no flights sampled from {csv_path}")
+    # load_flight_sample(): only flights with Risk > 0
+    frame = df[df['weatherScore'] > 0].reset_index(drop=True)
+
+    viewer_df, flights = viewer_flights(frame, params['excluded_years'], seed=params['seed'])
+    with open(encoders_path, 'rb') as file:
+        origin_classes = np.asarray(pickle.load(file)['Origin'].classes_, dtype='U3')
+    if airport_names is None:
+        airport_names = airport_display_names()
+    routes = route_options(build_flight_index(viewer_df), flights, origin_classes, airport_names)
+
+    arrays = build_snapshot(frame, frame.index.get_indexer(viewer_df.index), flights, routes,
+                            origin_classes, airport_names)
+    manifest = {
+        'built': datetime.datetime.now().isoformat(timespec='seconds'),
+        'rows': len(frame),
+        'columns': {name: str(dtype) for name, dtype in frame.dtypes.items()},
+        'source': source,
+        'store': store,
+        'params': params,
+    }
+    save_snapshot(arrays, manifest, snapshot_dir)
+    return manifest
+
+
+# ==========================================
+# LOAD
+# ==========================================
+class Snapshot:
+    """Read-only view of a saved snapshot; the column arrays stay memory-mapped."""
+
+    def __init__(self, snapshot_dir=DEFAULT_SNAPSHOT_DIR, manifest=None, mmap_mode='r'):
+        self.snapshot_dir = snapshot_dir
+        self.manifest = manifest if manifest is not None else read_manifest(snapshot_dir)
+
+        def load(name, mmap=mmap_mode):
+            return np.load(os.path.join(snapshot_dir, f'{name}.npy'), mmap_mode=mmap, allow_pickle=False)
+
+        columns = {}
+        for name, dtype in self.manifest['columns'].items():
+            if dtype == 'category':
+                columns[name] = pd.Categorical.from_codes(load(f'col_{name}.codes'),
+                                                          load(f'col_{name}.categories', None))
+            else:
+                columns[name] = load(f'col_{name}')
+        # copy=False keeps each column a view of its mapped file
+        self.frame = pd.DataFrame(columns, copy=False)
+        self.viewer_rows = load('viewer_rows')
+
+        self.flights = load('flights', None).tolist()
+        self.routes = {flight: [] for flight in self.flights}
+        for i, label, position in zip(load('route_flight', None).tolist(), load('route_label', None).tolist(),
+                                      load('route_position', None).tolist()):
+            self.routes[self.flights[i]].append({'label': label, 'position': position})
+
+        self.origin_classes = load('origin_classes', None)
+        self.airport_names = dict(zip(self.origin_classes.tolist(), load('airport_names', None).tolist()))
+
+    def viewer_frame(self):
+        """The rows the viewer picks from; route positions index into this frame."""
+        return self.frame.take(self.viewer_rows)
+
+
+def read_manifest(snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    with open(os.path.join(snapshot_dir, 'manifest.json')) as file:
+        return json.load(file)
+
+
+def load_snapshot(snapshot_dir=DEFAULT_SNAPSHOT_DIR, source_path=None, params=None, store_dir=None):
+    """The saved snapshot as a Snapshot, or None when it is missing or stale."""
+    if not os.path.exists(os.path.join(snapshot_dir, 'manifest.json')):
+        return None
+    manifest = read_manifest(snapshot_dir)
+    if stale_reason(manifest, source_path, params, store_dir) is not None:
+        return None
+    return Snapshot(snapshot_dir, manifest)
+
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    parser = argparse.ArgumentParser(description='Build the memory-mapped dashboard snapshot.')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='processed flight data (.csv.gz)')
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help='flight store, used instead of the CSV if present')
+    parser.add_argument('--out', default=DEFAULT_SNAPSHOT_DIR, help='snapshot directory (replaced if present)')
+    parser.add_argument('--check', action='store_true', help='only report whether the snapshot in --out is fresh')
+    args = parser.parse_args()
+
+    if args.check:
+        if not os.path.exists(os.path.join(args.out, 'manifest.json')):
+            raise SystemExit(f"No snapshot in {args.out}")
+        reason = stale_reason(read_manifest(args.out), args.csv, snapshot_params(), args.store)
+        raise SystemExit(f"Stale: {reason}" if reason else f"{args.out} is fresh")
+
+    start = time.perf_counter()
+    manifest = write_snapshot(args.csv, args.store, args.out)
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(args.out, name)) for name in os.listdir(args.out))
+    print(f"Wrote {manifest['rows']:,} rows ({size / 1024:.0f} KB) to {args.out} ({elapsed:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""What-if sweeps: the risk heuristic over a grid of two inputs.
+
+The calculator scores one combination per submit. A sweep varies two of its
+six inputs over evenly spaced values, holds the other four fixed and scores
+the whole grid in one broadcast calculate_risk_scores() call: the x values
+as a row, the y values as a column. A 1000 x 1000 grid is one array
+expression rather than a million calculate_risk_score() calls.
+
+Inputs are given in the calculator's Imperial units and converted to the
+metric units the heuristic uses.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from scoring import calculate_risk_scores
+
+
+# name -> (label, unit, factor, default range); metric = imperial / factor
+SWEEP_INPUTS = {
+    'wspd': ('Wind speed', 'mph', 0.621371, (0.0, 60.0)),
+    'prcp': ('Precipitation', 'in', 0.03937, (0.0, 3.0)),
+    'snow': ('Snow', 'in', 0.03937, (0.0, 6.0)),
+    'pres': ('Pressure', 'inHg', 0.02953, (29.5, 32.5)),
+    'dep_time': ('Scheduled departure', 'HHMM', 1.0, (0.0, 2359.0)),
+    'distance': ('Distance', 'miles', 1.0, (0.0, 3000.0)),
+}
+MAX_STEPS = 1000   # per axis, so at most 10^6 points
+# The heatmap is drawn from at most this many cells per axis
+MAX_DISPLAY_STEPS = 300
+
+
+def axis_label(name):
+    label, unit, _, _ = SWEEP_INPUTS[name]
+    return f"{label} ({unit})"
+
+
+def axis_values(name, start, stop, steps):
+    """`steps` evenly spaced Imperial values from `start` to `stop`; departure times stay whole HHMM."""
+    values = np.linspace(float(start), float(stop), int(steps))
+    return np.round(values) if name == 'dep_time' else values
+
+
+def to_metric(name, values):
+    return np.asarray(values, dtype=np.float64) / SWEEP_INPUTS[name][2]
+
+
+def sweep_scores(x, x_values, y, y_values, fixed):
+    """(len(y_values), len(x_values)) scores, with the other inputs from `fixed` (Imperial)."""
+    if x == y:
+        raise ValueError(f"sweep axes must differ, got {x} twice")
+    inputs = {name: to_metric(name, fixed[name]) for name in SWEEP_INPUTS if name not in (x, y)}
+    inputs[x] = to_metric(x, x_values)[np.newaxis, :]
+    inputs[y] = to_metric(y, y_values)[:, np.newaxis]
+    return calculate_risk_scores(**inputs)
+
+
+def display_grid(x_values, y_values, scores, max_steps=MAX_DISPLAY_STEPS):
+    """Every n-th row and column so neither axis exceeds `max_steps`; a plot can't show more."""
+    x_step = max(1, math.ceil(len(x_values) / max_steps))
+    y_step = max(1, math.ceil(len(y_values) / max_steps))
+    return x_values[::x_step], y_values[::y_step], scores[::y_step, ::x_step]
+
+
+def sweep_frame(x, x_values, y, y_values, scores):
+    """The grid in long form: one row per point, x varying fastest."""
+    return pd.DataFrame({
+        axis_label(x): np.tile(x_values, len(y_values)),
+        axis_label(y): np.repeat(y_values, len(x_values)),
+        'Risk score': scores.ravel(),
+    })
+
+
+def sweep_csv(x, x_values, y, y_values, scores):
+    """sweep_frame() as CSV bytes for download."""
+    return sweep_frame(x, x_values, y, y_values, scores).to_csv(index=False, float_format='%.6g').encode()
@@ -0,0 +1,280 @@
+"""Download BTS on-time performance data for Southwest flights out of the SW region.
+
+Streamable replacement for `download_bts_data` in Data_Collection.ipynb. Each
+monthly zip is streamed to disk (never held in memory), the CSV inside is
+parsed in chunks with only BTS_COLUMNS, and rows are filtered to
+Reporting_Airline == "WN" and SOUTHWEST_STATE_AIRPORTS while reading. Months
+that already have an output file are skipped, so an interrupted run can be
+restarted. Each month runs in its own worker process and reports its peak
+memory.
+
+Usage:
+    python Data/bts_download.py --start-year 2015 --end-year 2025
+    python Data/bts_download.py --start-year 2024 --end-year 2024 --workers 2 --combined bts_wn.csv
+    python Data/bts_download.py --base-url http://127.0.0.1:8765 ...   # local stand-in
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+
+BTS_BASE_URL = 'https://www.transtats.bts.gov/PREZIP'
+ZIP_NAME = 'On_Time_Reporting_Carrier_On_Time_Performance_1987_present_{year}_{month}.zip'
+OUTPUT_FOLDER = 'new_bts_data'
+
+SOUTHWEST_STATE_AIRPORTS = {
+    # Arizona
+    "PHX", "TUS",
+    # New Mexico
+    "ABQ",
+    # Texas
+    "DAL", "HOU", "AUS", "SAT", "ELP", "LBB", "MAF", "HRL",
+    # Oklahoma
+    "OKC", "TUL",
+    # California
+    "LAX", "SAN", "OAK", "SJC", "BUR", "SNA", "ONT", "SMF"
+}
+
+# Columns kept from the ~110 in the BTS file: every BTS column the weather
+# join, the processed dataset and Modeling.ipynb read (the notebook drops the
+# airline codes and DivAirportLandings, so they must exist), plus the delay
+# and timing fields that come with a flight record
+BTS_COLUMNS = [
+    'Year', 'Quarter', 'Month', 'DayofMonth', 'DayOfWeek', 'FlightDate',
+    'Reporting_Airline', 'DOT_ID_Reporting_Airline', 'IATA_CODE_Reporting_Airline', 'Tail_Number', 'Flight_Number_Reporting_Airline',
+    'OriginAirportID', 'OriginAirportSeqID', 'OriginCityMarketID', 'Origin', 'OriginCityName',
+    'OriginState', 'OriginStateFips', 'OriginStateName', 'OriginWac',
+    'DestAirportID', 'DestAirportSeqID', 'DestCityMarketID', 'Dest', 'DestCityName',
+    'DestState', 'DestStateFips', 'DestStateName', 'DestWac',
+    'CRSDepTime', 'DepTime', 'DepDelay', 'DepDelayMinutes', 'DepDel15', 'DepTimeBlk',
+    'TaxiOut', 'WheelsOff', 'WheelsOn', 'TaxiIn',
+    'CRSArrTime', 'ArrTime', 'ArrDelay', 'ArrDelayMinutes', 'ArrDel15', 'ArrTimeBlk',
+    'Cancelled', 'CancellationCode', 'Diverted',
+    'CRSElapsedTime', 'ActualElapsedTime', 'AirTime', 'Flights', 'Distance', 'DistanceGroup',
+    'CarrierDelay', 'WeatherDelay', 'NASDelay', 'SecurityDelay', 'LateAircraftDelay',
+    'DivAirportLandings',
+]
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def month_path(out_dir, year, month):
+    return os.path.join(out_dir, f"bts_wn_{year}_{month:02d}.csv")
+
+
+def months_between(start_year, end_year, now=None):
+    """(year, month) pairs from January start_year up to the current month."""
+    now = now or datetime.now()
+    return [
+        (year, month)
+        for year in range(start_year, end_year + 1)
+        for month in range(1, 13)
+        if not (year > now.year or (year == now.year and month > now.month))
+    ]
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process (VmHWM; ru_maxrss where /proc is missing)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ==========================================
+# DOWNLOAD
+# ==========================================
+def fetch_to_file(url, dest, retries=4, backoff=2.0, timeout=300, chunk_bytes=1 << 20):
+    """Streams `url` to `dest`, retrying connection errors and 429/5xx with exponential backoff.
+
+    The body is written to `dest + '.part'` and renamed once complete, so a
+    partial download is never mistaken for a finished one.
+    """
+    tmp = dest + '.part'
+    for attempt in range(retries + 1):
+        try:
+            with requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout, stream=True) as response:
+                if response.status_code in RETRY_STATUS and attempt < retries:
+                    raise requests.exceptions.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+                with open(tmp, 'wb') as f:
+                    for block in response.iter_content(chunk_size=chunk_bytes):
+                        f.write(block)
+            os.replace(tmp, dest)
+            return
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError, requests.exceptions.HTTPError) as e:
+            status = getattr(e.response, 'status_code', None) if isinstance(e, requests.exceptions.HTTPError) else None
+            if attempt == retries or (status is not None and status not in RETRY_STATUS):
+                raise
+            time.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+# ==========================================
+# FILTER
+# ==========================================
+def filter_zip(zip_path, out_path, columns=BTS_COLUMNS, airline='WN',
+               airports=SOUTHWEST_STATE_AIRPORTS, chunksize=50_000):
+    """Writes the rows of the CSV inside `zip_path` for `airline` out of `airports`.
+
+    Values are kept as text so the output matches the source file exactly.
+    Returns the number of rows written (a header-only file is written for 0).
+    """
+    wanted = set(columns) if columns is not None else None
+    airports = set(airports)
+    tmp = out_path + '.part'
+    n_rows = 0
+    try:
+        with zipfile.ZipFile(zip_path) as z:
+            csv_name = next((name for name in z.namelist() if name.endswith('.csv')), None)
+            if csv_name is None:
+                raise ValueError("No CSV in zip")
+            with z.open(csv_name) as f, open(tmp, 'w', newline='', encoding='utf-8') as out:
+                reader = pd.read_csv(
+                    f, dtype=str, keep_default_na=False, chunksize=chunksize,
+                    usecols=(lambda c: c in wanted) if wanted is not None else (lambda c: not c.startswith('Unnamed')),
+                )
+                header = True
+                for chunk in reader:
+                    if columns is not None:
+                        chunk = chunk[[c for c in columns if c in chunk.columns]]
+                    chunk = chunk[(chunk['Reporting_Airline'] == airline) & chunk['Origin'].isin(airports)]
+                    if header or len(chunk):
+                        chunk.to_csv(out, index=False, header=header)
+                        header = False
+                    n_rows += len(chunk)
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return n_rows
+
+
+def download_month(year, month, out_dir=OUTPUT_FOLDER, base_url=BTS_BASE_URL, columns=BTS_COLUMNS,
+                   retries=4, backoff=2.0, keep_zip=False):
+    """Downloads and filters one month; returns a result dict (never raises)."""
+    start = time.perf_counter()
+    result = {'year': year, 'month': month, 'rows': 0, 'error': None}
+    out_path = month_path(out_dir, year, month)
+    zip_dir = os.path.join(out_dir, '.downloads')
+    os.makedirs(zip_dir, exist_ok=True)
+    zip_path = os.path.join(zip_dir, ZIP_NAME.format(year=year, month=month))
+
+    try:
+        # A complete zip left behind by an interrupted run is reused
+        if not os.path.exists(zip_path):
+            fetch_to_file(f"{base_url.rstrip('/')}/{ZIP_NAME.format(year=year, month=month)}",
+                          zip_path, retries=retries, backoff=backoff)
+        result['rows'] = filter_zip(zip_path, out_path, columns=columns)
+        if not keep_zip:
+            os.remove(zip_path)
+    except requests.exceptions.HTTPError as e:
+        status = getattr(e.response, 'status_code', None)
+        result['error'] = f"HTTP {status}" if status else str(e)[:80]
+    except Exception as e:
+        result['error'] = str(e)[:80]
+
+    result['seconds'] = time.perf_counter() - start
+    result['peak_rss_mb'] = _peak_rss_mb()
+    return result
+
+
+def download_months(months, out_dir=OUTPUT_FOLDER, max_workers=6, **kwargs):
+    """Downloads the months without an output file yet, each in a fresh worker process.
+
+    Returns (results, skipped): a result dict per attempted month and the
+    months that were already present.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    present = {(y, m) for y, m in months if os.path.exists(month_path(out_dir, y, m))}
+    pending = [ym for ym in months if ym not in present]
+    skipped = [ym for ym in months if ym in present]
+
+    results = []
+    if not pending:
+        return results, skipped
+    # One process per month so each month's peak memory is measured on its own;
+    # spawn (not fork) so the high-water mark does not start at the parent's
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, max_tasks_per_child=1) as executor:
+        futures = [executor.submit(download_month, y, m, out_dir, **kwargs) for y, m in pending]
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            if r['error']:
+                print(f"✗ {r['year']}-{r['month']:02d}: {r['error']}")
+            else:
+                print(f"Saved {r['year']}-{r['month']:02d}: {r['rows']:,} rows "
+                      f"({r['seconds']:.1f}s, peak {r['peak_rss_mb']:.0f} MB)")
+    results.sort(key=lambda r: (r['year'], r['month']))
+    return results, skipped
+
+
+def combine_months(months, out_dir, combined_path):
+    """Concatenates the monthly files into one CSV without loading them."""
+    paths = [month_path(out_dir, y, m) for y, m in months if os.path.exists(month_path(out_dir, y, m))]
+    with open(combined_path, 'w', encoding='utf-8', newline='') as out:
+        for i, path in enumerate(paths):
+            with open(path, encoding='utf-8', newline='') as f:
+                header = f.readline()
+                if i == 0:
+                    out.write(header)
+                shutil.copyfileobj(f, out)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--start-year', type=int, required=True)
+    parser.add_argument('--end-year', type=int, required=True)
+    parser.add_argument('--out', default=OUTPUT_FOLDER, help='folder for bts_wn_YYYY_MM.csv files')
+    parser.add_argument('--workers', type=int, default=6)
+    parser.add_argument('--base-url', default=BTS_BASE_URL, help='serve the monthly zips from here instead')
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--backoff', type=float, default=2.0, help='first retry delay in seconds (doubles)')
+    parser.add_argument('--all-columns', action='store_true', help='keep every BTS column')
+    parser.add_argument('--keep-zips', action='store_true')
+    parser.add_argument('--combined', help='also write all months to this CSV')
+    args = parser.parse_args()
+
+    months = months_between(args.start_year, args.end_year)
+    start = time.perf_counter()
+    results, skipped = download_months(
+        months, args.out, max_workers=args.workers, base_url=args.base_url,
+        columns=None if args.all_columns else BTS_COLUMNS,
+        retries=args.retries, backoff=args.backoff, keep_zip=args.keep_zips,
+    )
+
+    failed = [r for r in results if r['error']]
+    print(f"\n{len(months)} months: {len(skipped)} already present, "
+          f"{len(results) - len(failed)} downloaded, {len(failed)} failed "
+          f"in {(time.perf_counter() - start) / 60:.1f} minutes")
+    if results:
+        print(f"Peak memory per month: max {max(r['peak_rss_mb'] for r in results):.0f} MB")
+    if args.combined:
+        paths = combine_months(months, args.out, args.combined)
+        print(f"Combined {len(paths)} months into {args.combined}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
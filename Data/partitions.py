@@ -0,0 +1,110 @@
+"""Sources and bounded-memory writer for hive-partitioned Parquet datasets.
+
+Shared by Data/weather_join.py and Modeling/features.py, which both scan a
+.zip/.csv/.parquet source lazily and stream the result through a staging
+file into one Parquet file per partition:
+
+    <out_dir>/Year=2019/Month=3/part-0.parquet
+"""
+import os
+import shutil
+import zipfile
+from contextlib import contextmanager
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+
+# ==========================================
+# SOURCES
+# ==========================================
+def extract_csv(archive, work_dir, chunk_bytes=1 << 20):
+    """Copies the first .csv inside `archive` to `work_dir` without reading it into memory."""
+    with zipfile.ZipFile(archive) as z:
+        csv_name = next(name for name in z.namelist() if name.endswith('.csv'))
+        path = os.path.join(work_dir, os.path.basename(csv_name))
+        with z.open(csv_name) as source, open(path, 'wb') as dest:
+            shutil.copyfileobj(source, dest, chunk_bytes)
+    return path
+
+
+def scan_table(path):
+    """Lazily scans a CSV, a Parquet file or a directory of Parquet files."""
+    if os.path.isdir(path):
+        return pl.scan_parquet(os.path.join(path, '**', '*.parquet'), hive_partitioning=True)
+    if path.endswith('.parquet'):
+        return pl.scan_parquet(path)
+    return pl.scan_csv(path, infer_schema_length=10_000, low_memory=True)
+
+
+@contextmanager
+def scan_source(path, work_dir):
+    """scan_table() of `path`; a .zip is first extracted to `work_dir`, and removed on exit."""
+    extracted = extract_csv(path, work_dir) if path.endswith('.zip') else None
+    try:
+        yield scan_table(extracted or path)
+    finally:
+        if extracted:
+            os.remove(extracted)
+
+
+# ==========================================
+# WRITER
+# ==========================================
+def partition_dir(out_dir, partition_by, key):
+    return os.path.join(out_dir, *[f"{name}={value}" for name, value in zip(partition_by, key)])
+
+
+def write_partitions(batches, out_dir, partition_by, schema):
+    """Writes Arrow `batches` of `schema` to one Parquet file per `partition_by` key under `out_dir`."""
+    # Slices of each batch are appended to one Arrow IPC stream per partition;
+    # unlike Parquet writers these keep no per-batch footer metadata in memory.
+    # Each spill file is then rewritten as a single Parquet file, so memory is
+    # bounded by the batch size and the largest partition, not the dataset.
+    spill_dir = os.path.join(out_dir, '_spill')
+    os.makedirs(spill_dir)
+    options = ipc.IpcWriteOptions(compression='lz4')
+    spills = {}
+    try:
+        for batch in batches:
+            for key, part in pl.from_arrow(batch).partition_by(partition_by, as_dict=True).items():
+                if key not in spills:
+                    path = os.path.join(spill_dir, f"{len(spills)}.arrows")
+                    spills[key] = (path, ipc.new_stream(path, schema, options=options))
+                spills[key][1].write_table(part.to_arrow().cast(schema))
+    finally:
+        for _, writer in spills.values():
+            writer.close()
+
+    for key, (path, _) in spills.items():
+        out = partition_dir(out_dir, partition_by, key)
+        os.makedirs(out)
+        with pa.memory_map(path) as source:
+            pq.write_table(ipc.open_stream(source).read_all(), os.path.join(out, 'part-0.parquet'))
+    shutil.rmtree(spill_dir)
+
+
+def write_partitioned(lf, out_dir, partition_by, row_group_size, transform=None):
+    """Streams `lf` into a hive-partitioned Parquet dataset at `out_dir` (replaced if present).
+
+    `transform`, if given, maps each Arrow batch to a Table before it is partitioned.
+    """
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+
+    # Polars' partitioned sink and pyarrow's dataset writer both queue rows in
+    # memory when the writer falls behind, so rows are sunk to one staging
+    # file and read back a row group at a time for partitioning
+    staging = os.path.join(out_dir, '_staging.parquet')
+    lf.sink_parquet(staging, row_group_size=row_group_size, engine='streaming')
+    try:
+        reader = pq.ParquetFile(staging, pre_buffer=False)
+        batches, schema = reader.iter_batches(batch_size=row_group_size), reader.schema_arrow
+        if transform is not None:
+            batches, schema = map(transform, batches), transform(schema.empty_table()).schema
+        write_partitions(batches, out_dir, partition_by, schema)
+    finally:
+        os.remove(staging)
@@ -0,0 +1,216 @@
+"""Incremental Meteostat hourly ingestion, cached per (airport, year).
+
+Script version of `fetch_airport_hourly` in Data_Collection.ipynb. Every
+(airport, year) is its own Parquet partition:
+
+    meteostat_hourly/airport=PHX/year=2019/data.parquet
+
+A run only fetches partitions that are missing or stale, and replaces just
+those files; everything else is left untouched. A year counts as settled
+once it was fetched at least SETTLE_DAYS after it ended; until then (the
+current year, or a past year fetched too early) its partition is refetched
+when older than --max-age-hours. Partitions are fetched on a thread pool.
+
+The fetch backend is any callable
+    fetch(airport, lat, lon, start, end) -> DataFrame with a 'date' column
+so a local fake can stand in for Meteostat.
+
+Usage:
+    python Data/weather_ingest.py                            # 2015..this year, 4 workers
+    python Data/weather_ingest.py --workers 8 --max-age-hours 6
+    python Data/weather_ingest.py --export weather_data.csv  # also write one combined file
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+SWA_AIRPORTS = {
+    # Arizona
+    "PHX": (33.4342, -112.0116),
+    "TUS": (32.1161, -110.9410),
+    # New Mexico
+    "ABQ": (35.0494, -106.6172),
+    # Texas
+    "DAL": (32.8471, -96.8517),
+    "HOU": (29.6454, -95.2789),
+    "AUS": (30.1975, -97.6664),
+    "SAT": (29.5337, -98.4698),
+    "ELP": (31.8070, -106.3779),
+    "LBB": (33.6609, -101.8214),
+    "MAF": (31.9369, -102.2016),
+    "HRL": (26.2285, -97.6544),
+    # Oklahoma
+    "OKC": (35.3931, -97.6008),
+    "TUL": (36.1986, -95.8880),
+    # California
+    "LAX": (33.9425, -118.4081),
+    "SAN": (32.7338, -117.1933),
+    "OAK": (37.7126, -122.2197),
+    "SJC": (37.3639, -121.9289),
+    "BUR": (34.2007, -118.3587),
+    "SNA": (33.6757, -117.8682),
+    "ONT": (34.0559, -117.6009),
+    "SMF": (38.6950, -121.5908)
+}
+
+OUTPUT_DIR = 'meteostat_hourly'
+START_YEAR = 2015
+MAX_WORKERS = 4
+# Meteostat keeps revising recent observations for a while after they happen
+SETTLE_DAYS = 14
+MAX_AGE_HOURS = 24
+FETCHED_AT_KEY = b'fetched_at'
+
+
+def meteostat_hourly(airport, lat, lon, start, end):
+    """Default backend: Meteostat hourly observations for one point."""
+    from meteostat import Hourly, Point
+
+    data = Hourly(Point(lat, lon), start, end).fetch()
+    return data.reset_index().rename(columns={"time": "date"})
+
+
+# ==========================================
+# PARTITIONS
+# ==========================================
+def partition_path(store_dir, airport, year):
+    return os.path.join(store_dir, f"airport={airport}", f"year={year}", "data.parquet")
+
+
+def fetched_at(path):
+    """When a partition was fetched (from its Parquet metadata), or None if missing."""
+    if not os.path.exists(path):
+        return None
+    metadata = pq.read_schema(path).metadata or {}
+    value = metadata.get(FETCHED_AT_KEY)
+    return datetime.fromisoformat(value.decode()) if value else datetime.min
+
+
+def needs_fetch(fetched, year, now, max_age=timedelta(hours=MAX_AGE_HOURS), settle_days=SETTLE_DAYS):
+    """True if a partition is missing, or unsettled and at least `max_age` old."""
+    if fetched is None:
+        return True
+    settled_after = datetime(year + 1, 1, 1) + timedelta(days=settle_days)
+    if fetched >= settled_after:
+        return False
+    return now - fetched >= max_age
+
+
+def plan(store_dir, airports, start_year, end_year, now=None, max_age=timedelta(hours=MAX_AGE_HOURS),
+         settle_days=SETTLE_DAYS):
+    """(airport, year) partitions to fetch, skipping years that have not started."""
+    now = now or datetime.now()
+    return [
+        (airport, year)
+        for airport in airports
+        for year in range(start_year, min(end_year, now.year) + 1)
+        if needs_fetch(fetched_at(partition_path(store_dir, airport, year)), year, now, max_age, settle_days)
+    ]
+
+
+def write_partition(store_dir, airport, year, df, now):
+    """Atomically replaces one partition; an empty result is stored too so it is not refetched."""
+    path = partition_path(store_dir, airport, year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # airport/year live in the directory names
+    df = df.drop(columns=[c for c in ('airport', 'year') if c in df.columns])
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), FETCHED_AT_KEY: now.isoformat().encode()})
+    # Dot-prefixed so a concurrent read_weather() skips the half-written file
+    tmp = os.path.join(os.path.dirname(path), '.data.parquet.part')
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return len(df)
+
+
+# ==========================================
+# INGEST
+# ==========================================
+def ingest(store_dir=OUTPUT_DIR, airports=SWA_AIRPORTS, start_year=START_YEAR, end_year=None,
+           fetch=meteostat_hourly, max_workers=MAX_WORKERS, max_age=timedelta(hours=MAX_AGE_HOURS),
+           settle_days=SETTLE_DAYS, pause=0.05, now=None):
+    """Fetches missing/stale (airport, year) partitions; returns one result dict per fetch."""
+    now = now or datetime.now()
+    end_year = end_year or now.year
+    todo = plan(store_dir, airports, start_year, end_year, now, max_age, settle_days)
+
+    def run(airport, year):
+        lat, lon = airports[airport]
+        start = time.perf_counter()
+        try:
+            df = fetch(airport, lat, lon, datetime(year, 1, 1), datetime(year, 12, 31, 23, 59))
+            rows = write_partition(store_dir, airport, year, df, now)
+            error = None
+        except Exception as e:
+            rows, error = 0, str(e)[:80]
+        time.sleep(pause)
+        return {'airport': airport, 'year': year, 'rows': rows, 'error': error,
+                'seconds': time.perf_counter() - start}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run, airport, year) for airport, year in todo]
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            if r['error']:
+                print(f"Error fetching {r['airport']} {r['year']}: {r['error']}")
+            else:
+                print(f"Fetched {r['airport']} {r['year']} ({r['rows']} rows)")
+    return results
+
+
+def read_weather(store_dir=OUTPUT_DIR, airports=None, years=None, columns=None):
+    """All cached observations as one DataFrame, with 'airport' and 'year' columns."""
+    dataset = ds.dataset(store_dir, format='parquet', partitioning='hive')
+    # Empty or all-null partitions carry fewer/looser columns than the rest
+    schema = pa.unify_schemas([f.physical_schema for f in dataset.get_fragments()] + [dataset.schema],
+                              promote_options='default')
+    dataset = ds.dataset(store_dir, format='parquet', partitioning='hive', schema=schema)
+    condition = None
+    if airports is not None:
+        condition = ds.field('airport').isin(list(airports))
+    if years is not None:
+        year_condition = ds.field('year').isin(list(years))
+        condition = year_condition if condition is None else condition & year_condition
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default=OUTPUT_DIR)
+    parser.add_argument('--start-year', type=int, default=START_YEAR)
+    parser.add_argument('--end-year', type=int, help='default: this year')
+    parser.add_argument('--airports', nargs='+', choices=sorted(SWA_AIRPORTS), help='default: all')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--max-age-hours', type=float, default=MAX_AGE_HOURS,
+                        help='refetch unsettled partitions older than this')
+    parser.add_argument('--settle-days', type=int, default=SETTLE_DAYS)
+    parser.add_argument('--export', help='also write every cached row to this .csv or .parquet')
+    args = parser.parse_args()
+
+    airports = {a: SWA_AIRPORTS[a] for a in (args.airports or SWA_AIRPORTS)}
+    start = time.perf_counter()
+    results = ingest(args.out, airports, args.start_year, args.end_year, max_workers=args.workers,
+                     max_age=timedelta(hours=args.max_age_hours), settle_days=args.settle_days)
+    failed = sum(1 for r in results if r['error'])
+    print(f"\n{len(results) - failed} partitions fetched, {failed} failed in {time.perf_counter() - start:.1f}s")
+
+    if args.export:
+        combined = read_weather(args.out)
+        if args.export.endswith('.parquet'):
+            combined.to_parquet(args.export, index=False)
+        else:
+            combined.to_csv(args.export, index=False)
+        print(f"All airports combined: {len(combined)} rows -> {args.export}")
+
+
+if __name__ == '__main__':
+    main()
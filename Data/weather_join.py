@@ -0,0 +1,264 @@
+"""Streaming join of the BTS flights with the daily Meteostat weather.
+
+Script version of the join cell in Data_Collection.ipynb. The notebook read
+the whole archive into memory (`io.BytesIO(z.read(csv_name))`) before
+scanning it and wrote one monolithic joined_data.csv. Here:
+
+    * the CSV inside the archive is extracted to disk in fixed-size chunks
+      (a plain .csv source is scanned where it is);
+    * flights and weather are scanned lazily, FlightDate and date are cast
+      to Date up front, and the inner join on (Origin, FlightDate) =
+      (airport, date) runs on Polars' streaming engine into one staging
+      Parquet file;
+    * the staging file is read back a row group at a time and split into a
+      Year/Month partitioned Parquet dataset, one file per partition:
+
+    joined_parquet/Year=2019/Month=3/part-0.parquet
+
+Memory therefore depends on the row group size and the largest month, not
+on the archive. Consumers read only the partitions they need:
+read_joined(years=..., months=...), or Modeling/features.py --source
+joined_parquet/.
+
+With --hourly, each flight also gets the latest hourly observation at or
+before its scheduled departure at Origin (dep_temp, dep_wspd, ...) and,
+with --arrivals, before its scheduled arrival at Dest (arr_*). The
+observations come from weather_ingest.py's store, whose UTC timestamps are
+shifted to each airport's local time to match CRSDepTime/CRSArrTime.
+HourlyIndex keeps every airport's observations in one sorted key array, so
+a batch of flights is matched with a single np.searchsorted while the
+rows stream through.
+
+Usage:
+    python Data/weather_join.py --flights combined_data.zip --weather Meteostat_daily_2000-2025.csv
+    python Data/weather_join.py --flights bts_wn.csv --weather daily.parquet --out joined_parquet
+    python Data/weather_join.py --hourly meteostat_hourly --arrivals --tolerance-minutes 180
+"""
+import argparse
+import os
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from partitions import scan_source, scan_table, write_partitioned
+from weather_ingest import read_weather
+
+
+DEFAULT_FLIGHTS = 'combined_data.zip'
+DEFAULT_WEATHER = 'Meteostat_daily_2000-2025.csv'
+DEFAULT_OUT = 'joined_parquet'
+PARTITION_COLUMNS = ['Year', 'Month']
+ROW_GROUP_SIZE = 100_000
+
+# Hourly Meteostat columns attached with --hourly, and how stale the latest
+# observation may be before a flight gets NaN instead
+HOURLY_COLUMNS = ['temp', 'dwpt', 'rhum', 'prcp', 'snow', 'wdir', 'wspd', 'wpgt', 'pres', 'coco']
+TOLERANCE_MINUTES = 180
+
+# BTS schedule times are local; Meteostat hourly timestamps are UTC
+AIRPORT_TIMEZONES = {
+    'PHX': 'America/Phoenix', 'TUS': 'America/Phoenix',
+    'ABQ': 'America/Denver', 'ELP': 'America/Denver',
+    'DAL': 'America/Chicago', 'HOU': 'America/Chicago', 'AUS': 'America/Chicago', 'SAT': 'America/Chicago',
+    'LBB': 'America/Chicago', 'MAF': 'America/Chicago', 'HRL': 'America/Chicago',
+    'OKC': 'America/Chicago', 'TUL': 'America/Chicago',
+    'LAX': 'America/Los_Angeles', 'SAN': 'America/Los_Angeles', 'OAK': 'America/Los_Angeles',
+    'SJC': 'America/Los_Angeles', 'BUR': 'America/Los_Angeles', 'SNA': 'America/Los_Angeles',
+    'ONT': 'America/Los_Angeles', 'SMF': 'America/Los_Angeles',
+}
+
+
+# ==========================================
+# SOURCES
+# ==========================================
+def _as_date(lf, column):
+    dtype = lf.collect_schema()[column]
+    if dtype == pl.String:
+        # Meteostat writes '2019-03-01' or '2019-03-01 00:00:00'
+        return pl.col(column).str.slice(0, 10).str.to_date('%Y-%m-%d')
+    if dtype == pl.Datetime:
+        return pl.col(column).dt.date()
+    return pl.col(column).cast(pl.Date)
+
+
+def typed_flights(lf):
+    return lf.with_columns(_as_date(lf, 'FlightDate').alias('FlightDate'), pl.col('Origin').cast(pl.String))
+
+
+def scan_weather(path):
+    lf = scan_table(path)
+    return lf.with_columns(_as_date(lf, 'date').alias('date'), pl.col('airport').cast(pl.String))
+
+
+# ==========================================
+# HOURLY (AS-OF)
+# ==========================================
+def read_hourly(source):
+    """Hourly observations from a weather_ingest.py store directory or a .csv/.parquet export."""
+    if os.path.isdir(source):
+        return read_weather(source)
+    return scan_table(source).collect().to_pandas()
+
+
+def local_observations(hourly, timezones=AIRPORT_TIMEZONES, utc=True):
+    """Hourly rows with their 'date' converted to each airport's local wall-clock time."""
+    hourly = hourly.assign(airport=hourly['airport'].astype(str), date=pd.to_datetime(hourly['date']))
+    unknown = sorted(set(hourly['airport']) - set(timezones))
+    if utc and unknown:
+        raise ValueError(f"No time zone for airports {unknown}; add them to AIRPORT_TIMEZONES")
+    if utc:
+        local = hourly['date'].copy()
+        for airport, rows in hourly.groupby('airport').groups.items():
+            local.loc[rows] = hourly.loc[rows, 'date'].dt.tz_localize('UTC').dt.tz_convert(timezones[airport]) \
+                .dt.tz_localize(None)
+        hourly = hourly.assign(date=local)
+    return hourly
+
+
+def _local_minutes(dates, clock):
+    # days since 1970-01-01 and hhmm -> minutes since 1970-01-01 00:00 local; 2400 rolls to the next day
+    clock = np.asarray(clock, dtype=np.int64)
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64) * 1440 + (clock // 100) * 60 + clock % 100
+
+
+class HourlyIndex:
+    """Every airport's hourly observations in one array sorted by (airport, local time).
+
+    Keys are airport_code << 32 | local minutes since 1970, so one searchsorted
+    finds each flight's latest observation at or before its time; a hit that
+    belongs to the previous airport, or is older than the tolerance, is masked.
+    """
+
+    def __init__(self, observations, columns=HOURLY_COLUMNS):
+        self.columns = [c for c in columns if c in observations.columns]
+        self.airports = pa.array(sorted(observations['airport'].unique()), pa.string())
+        codes = self.codes(observations['airport'])
+        minutes = observations['date'].to_numpy().astype('datetime64[m]').astype(np.int64)
+        keys = (codes << 32) | minutes
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.values = observations[self.columns].to_numpy(dtype=np.float32)[order]
+
+    def codes(self, airports):
+        """Position of each airport in self.airports, -1 if it has no observations."""
+        if not isinstance(airports, (pa.Array, pa.ChunkedArray)):
+            airports = pa.array(np.asarray(airports, dtype=object), pa.string())
+        codes = pc.index_in(pc.cast(airports, pa.string()), value_set=self.airports)
+        return codes.fill_null(-1).to_numpy().astype(np.int64)
+
+    def lookup(self, airports, minutes, tolerance=TOLERANCE_MINUTES):
+        """(n, len(columns)) float32 values of the latest observation per (airport, minute); NaN if none."""
+        codes = self.codes(airports)
+        minutes = np.asarray(minutes, dtype=np.int64)
+        # Searching in key order walks self.keys forward instead of jumping around it
+        needles = (codes << 32) | minutes
+        order = np.argsort(needles)
+        pos = np.empty_like(order)
+        pos[order] = np.searchsorted(self.keys, needles[order], side='right') - 1
+        found = (codes >= 0) & (pos >= 0)
+        pos = np.maximum(pos, 0)
+        hit = self.keys[pos]
+        found &= ((hit >> 32) == codes) & (minutes - (hit & 0xFFFFFFFF) <= tolerance)
+        values = self.values[pos]
+        values[~found] = np.nan
+        return values
+
+
+def attach_hourly(batch, index, arrivals=False, tolerance=TOLERANCE_MINUTES):
+    """Appends dep_<column> (and arr_<column>) hourly weather to an Arrow batch of flights.
+
+    An arrival earlier on the clock than its departure is taken to land the
+    next day.
+    """
+    table = pa.table(batch)
+    days = table.column('FlightDate').to_numpy()
+    dep_clock = table.column('CRSDepTime').to_numpy()
+    lookups = [('dep', table.column('Origin'), _local_minutes(days, dep_clock))]
+    if arrivals:
+        arr_clock = table.column('CRSArrTime').to_numpy()
+        arr_days = days + (arr_clock < dep_clock).astype('timedelta64[D]')
+        lookups.append(('arr', table.column('Dest'), _local_minutes(arr_days, arr_clock)))
+
+    for prefix, airports, minutes in lookups:
+        values = index.lookup(airports, minutes, tolerance)
+        for i, column in enumerate(index.columns):
+            table = table.append_column(f'{prefix}_{column}', pa.array(values[:, i], type=pa.float32()))
+    return table
+
+
+# ==========================================
+# JOIN
+# ==========================================
+def join_lazy(flights, weather):
+    """The notebook's inner join, as a LazyFrame; the weather keys are dropped."""
+    return flights.join(weather, how='inner', left_on=['Origin', 'FlightDate'], right_on=['airport', 'date'])
+
+
+def join(flights, weather, out_dir=DEFAULT_OUT, partition_by=PARTITION_COLUMNS, work_dir=None,
+         row_group_size=ROW_GROUP_SIZE, hourly=None, arrivals=False, tolerance=TOLERANCE_MINUTES):
+    """Joins a flights archive/CSV/Parquet with the weather table into `out_dir`.
+
+    `hourly` (a weather_ingest.py store or a table of its rows) adds the dep_*
+    and, with `arrivals`, arr_* columns of attach_hourly().
+    """
+    transform = None
+    if hourly is not None:
+        index = HourlyIndex(local_observations(read_hourly(hourly)))
+        transform = partial(attach_hourly, index=index, arrivals=arrivals, tolerance=tolerance)
+
+    # A .zip is extracted next to the output unless work_dir says otherwise
+    work_dir = work_dir or os.path.dirname(os.path.abspath(out_dir))
+    with scan_source(flights, work_dir) as lf:
+        write_partitioned(join_lazy(typed_flights(lf), scan_weather(weather)), out_dir, partition_by,
+                          row_group_size, transform)
+
+
+def open_joined(out_dir=DEFAULT_OUT, partition_by=PARTITION_COLUMNS):
+    """The joined dataset, with the hive partition keys typed like the columns in the files."""
+    files = ds.dataset(out_dir, format='parquet')
+    partitioning = ds.partitioning(pa.schema([files.schema.field(name) for name in partition_by]), flavor='hive')
+    return ds.dataset(out_dir, format='parquet', partitioning=partitioning)
+
+
+def read_joined(out_dir=DEFAULT_OUT, years=None, months=None, columns=None):
+    """Joined rows of the selected Year/Month partitions as one DataFrame."""
+    dataset = open_joined(out_dir)
+    condition = None
+    if years is not None:
+        condition = ds.field('Year').isin(list(years))
+    if months is not None:
+        month_condition = ds.field('Month').isin(list(months))
+        condition = month_condition if condition is None else condition & month_condition
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--flights', default=DEFAULT_FLIGHTS, help='BTS .zip, .csv, .parquet or Parquet directory')
+    parser.add_argument('--weather', default=DEFAULT_WEATHER, help='daily weather .csv, .parquet or directory')
+    parser.add_argument('--out', default=DEFAULT_OUT, help='output directory (replaced if present)')
+    parser.add_argument('--partition-by', nargs='+', default=PARTITION_COLUMNS)
+    parser.add_argument('--work-dir', help='where to extract the archive; default: next to --out')
+    parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_SIZE)
+    parser.add_argument('--hourly', help='weather_ingest.py store (or export) to as-of join at departure time')
+    parser.add_argument('--arrivals', action='store_true', help='with --hourly, also match Dest at arrival time')
+    parser.add_argument('--tolerance-minutes', type=int, default=TOLERANCE_MINUTES,
+                        help='oldest hourly observation to use')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    join(args.flights, args.weather, args.out, args.partition_by, args.work_dir, args.row_group_size,
+         args.hourly, args.arrivals, args.tolerance_minutes)
+    dataset = open_joined(args.out, args.partition_by)
+    print(f"Joined {dataset.count_rows():,} rows into {len(dataset.files)} partitions in {args.out} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Out-of-core feature pipeline for the modeling dataset (Polars, lazy).
+
+Builds the row-level features from Modeling.ipynb without loading the
+dataset into memory:
+    * unit conversions (°F, inches, mph, inHg)
+    * cyclical DepTime_sin/cos and ArrTime_sin/cos
+    * TotalDisruptionMinutes, IsSevereDisruption, IsCancelledOrDiverted, IsDelayedOnly
+    * weatherCancellation, DayOfYear, IsWeekend, IsHoliday, IsHolidayWindow
+    * Dist_x_Wspd, TempRange, MonthxWeekday and the DepDelayMinutes_log target
+
+The joined flight+weather data is scanned lazily and streamed to a Parquet
+feature store partitioned by Year and Month:
+
+    features/Year=2019/Month=3/part-0.parquet
+
+Features that need other rows (per-day departure counts, rolling delay means)
+are not built here.
+
+Usage:
+    python Modeling/features.py --source joined_data.csv --out features
+    python Modeling/features.py --source joined_parquet/ --out features
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import polars as pl
+
+# Source scanning and the partitioned writer are shared with
+# Data/weather_join.py, the holiday calendar with the dashboard's predictor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+from holiday_windows import HOLIDAY_WINDOWS, federal_holidays as _federal_holidays  # noqa: E402
+from partitions import scan_source, write_partitioned  # noqa: E402
+
+
+DEFAULT_SOURCE = 'joined_data.csv'
+DEFAULT_STORE = 'features'
+PARTITION_COLUMNS = ['Year', 'Month']
+
+# Modeling.ipynb's LightGBM features; its one-hot blocks are replaced by the
+# categorical features in lgb_dataset.CATEGORICAL_FEATURES
+NOTEBOOK_FEATURES = [
+    'Month', 'DayOfWeek', 'Flight_Number_Reporting_Airline',
+    'OriginAirportID', 'OriginCityMarketID', 'OriginStateFips',
+    'DestAirportID', 'DestCityMarketID', 'DestStateFips',
+    'CRSDepTime', 'CRSArrTime', 'Distance', 'tavg', 'tmin', 'tmax',
+    'prcp', 'wspd', 'pres', 'IsWeekend', 'IsHoliday', 'IsHolidayWindow',
+    'NumDepartures', 'RouteDelayMean_7d', 'OriginDelayMean_7d',
+    'DestArrivals_7d', 'Departures_Today', 'Dist_x_Wspd', 'TempRange',
+    'MonthxWeekday',
+]
+
+# The NOTEBOOK_FEATURES Dashboard/predictor.py can build from a dashboard row.
+# Airport ids, departure counts and rolling means are not in the dashboard's
+# data, and LightGBM reads a missing value as 0 for any feature that had none
+# in training, so the served model (train.py) is fit on this subset only.
+DASHBOARD_FEATURES = [
+    'Month', 'DayOfWeek', 'Flight_Number_Reporting_Airline',
+    'CRSDepTime', 'CRSArrTime', 'Distance', 'tavg', 'tmin', 'tmax',
+    'prcp', 'wspd', 'pres', 'IsWeekend', 'IsHoliday', 'IsHolidayWindow',
+    'Dist_x_Wspd', 'TempRange', 'MonthxWeekday',
+]
+
+# Time-based split shared by tune.py and classify.py: train through
+# TRAIN_END, validate through VALID_END, test on the rest
+TRAIN_END = '2023-12-31'
+VALID_END = '2024-12-31'
+
+
+def federal_holidays(start='1987-01-01', end='2035-12-31'):
+    """US federal holidays as a list of dates (the whole BTS era, computed once)."""
+    return [d.date() for d in _federal_holidays(start, end)]
+
+
+# ==========================================
+# TRANSFORMS
+# ==========================================
+def _clock_minutes(column):
+    # hhmm -> minutes after midnight
+    return (pl.col(column) // 100) * 60 + pl.col(column) % 100
+
+
+def add_features(lf, holidays=None):
+    """Adds the notebook's row-level features to a LazyFrame of joined rows."""
+    holidays = federal_holidays() if holidays is None else holidays
+    names = set(lf.collect_schema().names())
+    cancelled_or_diverted = (pl.col('Cancelled') == 1.0) | (pl.col('Diverted') == 1.0)
+
+    # Unit conversions first; everything below sees Imperial units like the notebook
+    lf = lf.with_columns(
+        [((pl.col(c) * 9 / 5 + 32).round().cast(pl.Int64)).alias(c) for c in ('tavg', 'tmin', 'tmax') if c in names]
+        + [(pl.col(c) / 25.4).alias(c) for c in ('prcp', 'snow') if c in names]
+        + ([(pl.col('wspd') / 1.60934).alias('wspd')] if 'wspd' in names else [])
+        + ([(pl.col('pres') * 0.02953).alias('pres')] if 'pres' in names else [])
+    )
+
+    flight_date = pl.col('FlightDate')
+    if lf.collect_schema()['FlightDate'] == pl.String:
+        flight_date = flight_date.str.to_date()
+
+    lf = lf.with_columns(
+        flight_date.alias('FlightDate'),
+        (pl.col('CRSDepTime') // 100).alias('DepHour'),
+        (pl.col('CRSDepTime') % 100).alias('DepMinute'),
+        _clock_minutes('CRSDepTime').alias('DepTotalMinutes'),
+        (pl.col('CRSArrTime') // 100).alias('ArrHour'),
+        (pl.col('CRSArrTime') % 100).alias('ArrMinute'),
+        _clock_minutes('CRSArrTime').alias('ArrTotalMinutes'),
+        pl.when(cancelled_or_diverted).then(1000.0).otherwise(pl.col('DepDelayMinutes'))
+        .alias('TotalDisruptionMinutes'),
+        pl.when(cancelled_or_diverted | (pl.col('DepDel15') == 1.0)).then(1.0).otherwise(0.0)
+        .alias('IsSevereDisruption'),
+        pl.when(cancelled_or_diverted).then(1.0).otherwise(0.0).alias('IsCancelledOrDiverted'),
+        ((pl.col('Cancelled') == 1) & (pl.col('CancellationCode') == 'B')).fill_null(False)
+        .alias('weatherCancellation'),
+        pl.col('DayOfWeek').is_in([6, 7]).cast(pl.Int64).alias('IsWeekend'),
+        pl.struct(pl.col('Month').cast(pl.Int64), pl.col('DayofMonth').cast(pl.Int64))
+        .is_in([{'Month': m, 'DayofMonth': d} for m, d in HOLIDAY_WINDOWS]).cast(pl.Int64)
+        .alias('IsHolidayWindow'),
+        (pl.col('Distance') * pl.col('wspd')).alias('Dist_x_Wspd'),
+        (pl.col('tmax') - pl.col('tmin')).alias('TempRange'),
+        (pl.col('Month') * pl.col('DayOfWeek')).alias('MonthxWeekday'),
+        pl.col('DepDelayMinutes').log1p().alias('DepDelayMinutes_log'),
+    )
+
+    return lf.with_columns(
+        (2 * math.pi * pl.col('DepTotalMinutes') / 1440).sin().alias('DepTime_sin'),
+        (2 * math.pi * pl.col('DepTotalMinutes') / 1440).cos().alias('DepTime_cos'),
+        (2 * math.pi * pl.col('ArrTotalMinutes') / 1440).sin().alias('ArrTime_sin'),
+        (2 * math.pi * pl.col('ArrTotalMinutes') / 1440).cos().alias('ArrTime_cos'),
+        pl.when((pl.col('DepDel15') == 1.0) & (pl.col('IsCancelledOrDiverted') == 0.0)).then(1.0).otherwise(0.0)
+        .alias('IsDelayedOnly'),
+        pl.col('FlightDate').dt.ordinal_day().alias('DayOfYear'),
+        pl.col('FlightDate').is_in(holidays).alias('IsHoliday'),
+    )
+
+
+# ==========================================
+# FEATURE STORE
+# ==========================================
+def build_feature_store(source=DEFAULT_SOURCE, store_dir=DEFAULT_STORE, partition_by=PARTITION_COLUMNS,
+                        chunk_size=100_000):
+    """Streams `source` through add_features() into a Year/Month partitioned Parquet store."""
+    # A .zip source is extracted next to the store
+    with scan_source(source, os.path.dirname(os.path.abspath(store_dir))) as lf:
+        write_partitioned(add_features(lf), store_dir, partition_by, chunk_size)
+
+
+def scan_features(store_dir=DEFAULT_STORE, years=None, months=None):
+    """Lazily scans the feature store; Year/Month filters prune whole partitions."""
+    lf = pl.scan_parquet(os.path.join(store_dir, '**', '*.parquet'), hive_partitioning=True)
+    if years is not None:
+        lf = lf.filter(pl.col('Year').is_in(list(years)))
+    if months is not None:
+        lf = lf.filter(pl.col('Month').is_in(list(months)))
+    return lf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help='joined .zip, CSV, Parquet file or Parquet directory')
+    parser.add_argument('--out', default=DEFAULT_STORE, help='store directory (replaced if present)')
+    parser.add_argument('--partition-by', nargs='+', default=PARTITION_COLUMNS)
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='rows held in memory per streamed chunk')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_feature_store(args.source, args.out, args.partition_by, args.chunk_size)
+    n_files = sum(len(files) for _, _, files in os.walk(args.out))
+    print(f"Wrote {n_files} files to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""LightGBM binary Dataset cache shared by tuning trials and retrains.
+
+Building an lgb.Dataset bins every feature column, which the notebook redid
+for each trial and for the final fit. Here the train and valid Datasets are
+constructed once, saved in LightGBM's binary format and loaded by every
+later run:
+
+    Modeling/lgb_cache/<key>/train.bin
+    Modeling/lgb_cache/<key>/valid.bin
+    Modeling/lgb_cache/<key>/meta.json
+
+The key hashes the feature list, the categorical features, the binning
+parameters and a description of the data partition (source file, sample
+size and seed, split dates). Change any of them and a new entry is built.
+
+The notebook's one-hot Origin_/Dest_/Month_/DayOfWeek_ blocks are not used.
+OriginAirportID, DestAirportID, Month and DayOfWeek are passed as native
+categorical features, which carry the same information in four columns.
+"""
+import hashlib
+import json
+import os
+
+import lightgbm as lgb
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(script_dir, 'lgb_cache')
+CATEGORICAL_FEATURES = ['OriginAirportID', 'DestAirportID', 'Month', 'DayOfWeek']
+
+# Binning parameters; they are fixed once a Dataset is built. feature_pre_filter
+# is off so trials may vary min_data_in_leaf on the same Dataset.
+DATASET_PARAMS = {'max_bin': 255, 'min_data_in_bin': 3, 'feature_pre_filter': False, 'verbose': -1}
+
+
+def cache_key(feature_names, categorical, partition, params=DATASET_PARAMS):
+    """Hex digest identifying one (features, categorical, partition, binning) combination."""
+    payload = json.dumps({'features': list(feature_names), 'categorical': list(categorical),
+                          'partition': partition, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def build_datasets(split, categorical, params=DATASET_PARAMS):
+    """Constructs (train, valid) Datasets from the split's arrays; valid shares train's bins."""
+    train = lgb.Dataset(split['X_train'], label=split['y_train'], feature_name=split['feature_names'],
+                        categorical_feature=categorical, params=params, free_raw_data=True)
+    valid = lgb.Dataset(split['X_valid'], label=split['y_valid'], reference=train, feature_name=split['feature_names'],
+                        categorical_feature=categorical, params=params, free_raw_data=True)
+    return train.construct(), valid.construct()
+
+
+def _load(entry_dir, params):
+    train = lgb.Dataset(os.path.join(entry_dir, 'train.bin'), params=params).construct()
+    valid = lgb.Dataset(os.path.join(entry_dir, 'valid.bin'), reference=train, params=params).construct()
+    return train, valid
+
+
+def load_or_build(split, partition, cache_dir=DEFAULT_CACHE_DIR, params=DATASET_PARAMS):
+    """Constructed (train, valid) Datasets for `split` and whether they came from the cache."""
+    categorical = [name for name in CATEGORICAL_FEATURES if name in split['feature_names']]
+    entry_dir = os.path.join(cache_dir, cache_key(split['feature_names'], categorical, partition, params))
+    if os.path.exists(os.path.join(entry_dir, 'meta.json')):
+        return (*_load(entry_dir, params), True)
+
+    train, valid = build_datasets(split, categorical, params)
+    os.makedirs(entry_dir, exist_ok=True)
+    # Written under temporary names and renamed, so a concurrent reader never
+    # sees a partial file; meta.json goes last and marks the entry complete
+    for name, dataset in (('train', train), ('valid', valid)):
+        tmp = os.path.join(entry_dir, f'{name}.bin.{os.getpid()}')
+        dataset.save_binary(tmp)
+        os.replace(tmp, os.path.join(entry_dir, f'{name}.bin'))
+    meta = {'features': list(split['feature_names']), 'categorical': categorical, 'partition': partition,
+            'params': params, 'train_rows': train.num_data(), 'valid_rows': valid.num_data()}
+    tmp = os.path.join(entry_dir, f'meta.json.{os.getpid()}')
+    with open(tmp, 'w') as file:
+        json.dump(meta, file, indent=2, default=str)
+    os.replace(tmp, os.path.join(entry_dir, 'meta.json'))
+    return train, valid, False
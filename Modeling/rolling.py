@@ -0,0 +1,148 @@
+"""Incremental rolling-window delay features for the modeling dataset.
+
+Builds the features from Modeling.ipynb that need earlier rows:
+    * RouteDelayMean_7d   mean DepDelayMinutes of the route's previous 7 flights
+    * OriginDelayMean_7d  mean DepDelayMinutes of the origin's previous 7 flights
+    * DestArrivals_7d     flights among the destination's previous 7 rows
+    * NumDepartures, Departures_Today  departures from the origin that day
+
+As in the notebook the windows are the previous 7 rows of each key, not 7
+calendar days. Rows are ordered by ORDER_COLUMNS; the notebook sorted by
+origin and date only, which left DestArrivals_7d out of time order.
+
+The windows only ever look back 7 rows per key, so the state kept between
+runs is the last 7 rows of every route, origin and destination. Appending
+a day concatenates that tail with the new rows and runs the same code as a
+full recompute, so each append costs O(keys + new rows) and returns the
+values a full recompute would.
+
+Usage:
+    python Modeling/rolling.py --append joined_2025_03_01.csv                  # nightly
+    python Modeling/rolling.py --append joined_data.csv --rebuild              # from scratch
+"""
+import argparse
+import os
+import shutil
+import time
+
+import pandas as pd
+
+
+DEFAULT_STATE = 'rolling_state.parquet'
+DEFAULT_OUT = 'rolling_features'
+WINDOW = 7
+ROUTE = ['OriginAirportID', 'DestAirportID']
+ORDER_COLUMNS = ['FlightDate', 'CRSDepTime', 'OriginAirportID', 'DestAirportID', 'Flight_Number_Reporting_Airline']
+STATE_COLUMNS = ORDER_COLUMNS + ['DepDelayMinutes']
+FEATURE_COLUMNS = ['RouteDelayMean_7d', 'OriginDelayMean_7d', 'DestArrivals_7d', 'NumDepartures', 'Departures_Today']
+
+
+def _prepare(df):
+    rows = df[STATE_COLUMNS].copy()
+    rows['FlightDate'] = pd.to_datetime(rows['FlightDate'])
+    return rows
+
+
+def _trailing(rows, key, column, how):
+    # x.shift().rolling(7, min_periods=1) per key, as in the notebook, without
+    # a Python lambda per group
+    previous = rows.groupby(key, sort=False)[column].shift()
+    window = previous.groupby([rows[k] for k in key], sort=False).rolling(WINDOW, min_periods=1)
+    values = window.mean() if how == 'mean' else window.count()
+    return values.reset_index(level=list(range(len(key))), drop=True).reindex(rows.index).fillna(0)
+
+
+def _compute(rows):
+    """Feature frame for `rows`, which must already be in ORDER_COLUMNS order."""
+    out = pd.DataFrame(index=rows.index)
+    out['RouteDelayMean_7d'] = _trailing(rows, ROUTE, 'DepDelayMinutes', 'mean')
+    out['OriginDelayMean_7d'] = _trailing(rows, ['OriginAirportID'], 'DepDelayMinutes', 'mean')
+    out['DestArrivals_7d'] = _trailing(rows, ['DestAirportID'], 'Flight_Number_Reporting_Airline', 'count')
+    by_day = rows.groupby(['OriginAirportID', 'FlightDate'], sort=False)
+    out['NumDepartures'] = by_day['FlightDate'].transform('size')
+    out['Departures_Today'] = by_day['Flight_Number_Reporting_Airline'].transform('count')
+    return out
+
+
+def _tail(rows):
+    # Last WINDOW rows of every route, origin and destination
+    keep = pd.Series(False, index=rows.index)
+    for key in (ROUTE, ['OriginAirportID'], ['DestAirportID']):
+        keep |= rows.groupby(key, sort=False).cumcount(ascending=False) < WINDOW
+    return rows[keep].reset_index(drop=True)
+
+
+def rolling_features(df):
+    """Full recompute: the five rolling features for every row of `df`, aligned to its index."""
+    rows = _prepare(df).sort_values(ORDER_COLUMNS, kind='stable')
+    return _compute(rows).reindex(df.index)
+
+
+def append_rows(state, df):
+    """Features for the new rows in `df` and the state to keep for the next append.
+
+    `state` is the frame returned by a previous append (or None to start
+    empty). New rows must cover whole days after the last day in the state.
+    """
+    rows = _prepare(df)
+    if state is not None and len(state) and len(rows):
+        last_day = state['FlightDate'].max()
+        if rows['FlightDate'].min() <= last_day:
+            raise ValueError(f"rows must start after {last_day.date()}, the last day already in the state")
+
+    # State rows take positions [0, n_state), new rows follow in input order
+    n_state = 0 if state is None else len(state)
+    combined = pd.concat([state, rows], ignore_index=True) if n_state else rows.reset_index(drop=True)
+    combined = combined.sort_values(ORDER_COLUMNS, kind='stable')
+    features = _compute(combined)
+
+    features = features[features.index >= n_state].sort_index().set_axis(df.index)
+    return features, _tail(combined)
+
+
+def load_state(path=DEFAULT_STATE):
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_state(state, path=DEFAULT_STATE):
+    tmp = path + '.tmp'
+    state.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def write_features(df, features, out_dir=DEFAULT_OUT):
+    """Writes `features` with the keys and date of each row, one file per Year/Month per append."""
+    frame = pd.concat([_prepare(df)[ORDER_COLUMNS], features], axis=1)
+    stamp = frame['FlightDate'].min().strftime('%Y-%m-%d')
+    for (year, month), part in frame.groupby([frame['FlightDate'].dt.year, frame['FlightDate'].dt.month]):
+        part_dir = os.path.join(out_dir, f"Year={year}", f"Month={month}")
+        os.makedirs(part_dir, exist_ok=True)
+        part.to_parquet(os.path.join(part_dir, f"{stamp}.parquet"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--append', required=True, help='CSV or Parquet of joined rows for the new day(s)')
+    parser.add_argument('--state', default=DEFAULT_STATE)
+    parser.add_argument('--out', default=DEFAULT_OUT, help='feature output directory')
+    parser.add_argument('--rebuild', action='store_true', help='ignore the saved state and start empty')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.append.endswith('.parquet'):
+        df = pd.read_parquet(args.append, columns=STATE_COLUMNS)
+    else:
+        df = pd.read_csv(args.append, usecols=STATE_COLUMNS)
+    state = None if args.rebuild else load_state(args.state)
+    if args.rebuild and os.path.isdir(args.out):
+        shutil.rmtree(args.out)
+    features, state = append_rows(state, df)
+    write_features(df, features, args.out)
+    save_state(state, args.state)
+    print(f"Appended {len(df):,} rows ({len(state):,} state rows) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Retrain the LightGBM delay regressor on the cached binary Dataset.
+
+Final fit after tuning, replacing the notebook's "Forecasting" cell. It
+loads the train/valid Datasets from lgb_dataset's cache; the first run on a
+split and feature set builds and saves them. Parameters come from
+the best trial of a tune.py study, or from a JSON file. With
+--all-features the best trial's early-stopped round count is reused;
+otherwise the fit early-stops on the validation set.
+
+By default the fit uses only DASHBOARD_FEATURES, the features
+Dashboard/predictor.py can build from a dashboard row, and the booster is
+saved where the dashboard loads it. --all-features fits every feature of the
+split instead, for offline evaluation; the dashboard cannot serve that
+model, since it lacks airport ids, departure counts and rolling delay means.
+
+Usage:
+    python Modeling/train.py                                   # best trial of the default study
+    python Modeling/train.py --params best_params.json --all-features --out full_model.txt
+"""
+import argparse
+import json
+import os
+import time
+
+import lightgbm as lgb
+import numpy as np
+
+from features import DASHBOARD_FEATURES
+from lgb_dataset import DEFAULT_CACHE_DIR, load_or_build
+from tune import (DEFAULT_SPLIT_DIR, DEFAULT_STORAGE, DEFAULT_STUDY, EARLY_STOPPING_ROUNDS, N_ESTIMATORS,
+                  booster_params, load_split, make_storage, open_study)
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_PATH = os.path.join(script_dir, '..', 'Dashboard', 'delay_model.txt')
+
+
+def best_trial(storage=DEFAULT_STORAGE, study_name=DEFAULT_STUDY):
+    """(params, best_iteration or None) of a tune.py study's best trial."""
+    trial = open_study(make_storage(storage), study_name).best_trial
+    return trial.params, trial.user_attrs.get('best_iteration')
+
+
+def feature_subset(split, features=DASHBOARD_FEATURES):
+    """The split restricted to `features` (in the split's order); the arrays are copied."""
+    positions = [i for i, name in enumerate(split['feature_names']) if name in features]
+    subset = dict(split, feature_names=[split['feature_names'][i] for i in positions])
+    for name in ('X_train', 'X_valid'):
+        subset[name] = np.ascontiguousarray(split[name][:, positions])
+    return subset
+
+
+def train(split, params, num_rounds=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Fits on the cached train Dataset; returns (booster, validation MAE in minutes, setup info)."""
+    start = time.perf_counter()
+    train_set, valid_set, hit = load_or_build(split, split['partition'], cache_dir)
+    setup = {'cache hit': hit, 'dataset seconds': time.perf_counter() - start}
+
+    if num_rounds:
+        booster = lgb.train(booster_params(params), train_set, num_boost_round=num_rounds)
+    else:
+        booster = lgb.train(booster_params(params), train_set, num_boost_round=N_ESTIMATORS,
+                            valid_sets=[valid_set], valid_names=['valid'],
+                            callbacks=[lgb.early_stopping(stopping_rounds=EARLY_STOPPING_ROUNDS, verbose=False)])
+
+    # Back-transform predictions to minutes
+    y_pred = np.expm1(booster.predict(split['X_valid'], num_iteration=booster.best_iteration or None))
+    mae = float(np.mean(np.abs(np.expm1(split['y_valid']) - y_pred)))
+    return booster, mae, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--split-dir', default=DEFAULT_SPLIT_DIR, help='split written by tune.py --data')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--storage', default=DEFAULT_STORAGE)
+    parser.add_argument('--study', default=DEFAULT_STUDY)
+    parser.add_argument('--params', help='JSON file of parameters; overrides the study')
+    parser.add_argument('--rounds', type=int, help='boosting rounds; default: the best trial\'s')
+    parser.add_argument('--all-features', action='store_true',
+                        help='fit every feature of the split; the dashboard cannot serve the result')
+    parser.add_argument('--out', default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args()
+
+    if args.params:
+        with open(args.params) as file:
+            params, best_iteration = json.load(file), None
+    else:
+        params, best_iteration = best_trial(args.storage, args.study)
+
+    start = time.perf_counter()
+    split = load_split(args.split_dir)
+    if not args.all_features:
+        split = feature_subset(split)
+        # The trial's round count was found on every feature; early-stop on the subset instead
+        best_iteration = None
+    booster, mae, setup = train(split, params, args.rounds or best_iteration, args.cache_dir)
+    booster.save_model(args.out)
+
+    print(f"Dataset {'loaded from cache' if setup['cache hit'] else 'built and cached'} "
+          f"in {setup['dataset seconds']:.2f}s")
+    print(f"{booster.current_iteration()} rounds in {time.perf_counter() - start:.1f}s, validation MAE {mae:.2f} min")
+    print(f"Saved {args.out} ({len(split['feature_names'])} features)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""Parallel, resumable Optuna tuning of the LightGBM delay regressor.
+
+Script version of the "Hyperparameter Tuning" cell in Modeling.ipynb: same
+features, 500k-row sample, time-based split, search space, log1p target and
+MAE-in-minutes objective. What changes:
+
+    * Origin/Dest/Month/DayOfWeek are native categorical features instead
+      of one-hot blocks, and the binned train/valid Datasets are built once
+      and reused from the binary cache in lgb_dataset.py;
+    * trials run in several worker processes that share one study store,
+      either an Optuna journal file (default) or an SQLite/RDB URL;
+    * every trial reports its validation L1 to a median or successive-halving
+      pruner each boosting round, through LightGBM's pruning callback, on top
+      of the notebook's 100-round early stopping;
+    * the study is resumed by name, and the trial budget counts trials the
+      study already finished, so rerunning after an interrupt only runs the
+      remainder. Trials left RUNNING by the interrupted run are marked FAIL
+      first, so do not resume a study another tune.py is still using;
+    * the parent splits the remaining budget into fixed per-worker quotas
+      that sum to it, so the workers never run more trials than asked for.
+
+The train/valid split is written once as .npy files that every worker
+memory-maps, so the processes share one copy of the data. Each worker loads
+the cached Datasets once and trains every one of its trials on them.
+
+Usage:
+    python Modeling/tune.py --data FINAL_DATASET.csv --trials 40 --workers 4
+    python Modeling/tune.py --data features/ --storage sqlite:///optuna.db --pruner halving
+    python Modeling/tune.py --data FINAL_DATASET.csv --trials 40 --serial    # the notebook's loop
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import optuna
+import pandas as pd
+import lightgbm as lgb
+from optuna.trial import TrialState
+
+from features import NOTEBOOK_FEATURES, TRAIN_END, VALID_END
+from lgb_dataset import CATEGORICAL_FEATURES, DEFAULT_CACHE_DIR, build_datasets, load_or_build
+
+try:
+    from optuna_integration import LightGBMPruningCallback
+except ImportError:  # optuna < 3.6 ships the callback itself
+    from optuna.integration import LightGBMPruningCallback
+
+
+DEFAULT_STORAGE = 'optuna_lgbm.journal'
+DEFAULT_STUDY = 'lgbm_delay'
+DEFAULT_SPLIT_DIR = 'tune_split'
+
+TARGET = 'DepDelayMinutes_log'
+SAMPLE_ROWS = 500_000
+
+N_ESTIMATORS = 2000
+EARLY_STOPPING_ROUNDS = 100
+FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+SPLIT_ARRAYS = ('X_train', 'y_train', 'X_valid', 'y_valid')
+
+
+# ==========================================
+# DATA
+# ==========================================
+def read_dataset(path):
+    """The modeling table from a CSV, a Parquet file or a Parquet directory."""
+    if os.path.isdir(path) or path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, low_memory=False)
+
+
+def describe_source(path):
+    """Identity of a source file or directory for the Dataset cache key."""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'bytes': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def make_split(df, sample_rows=SAMPLE_ROWS, seed=42, source=None):
+    """The notebook's sample and train/valid split as float32/float64 arrays.
+
+    `partition` describes the rows that went in, for the Dataset cache key.
+    """
+    if TARGET not in df.columns:
+        df = df.assign(**{TARGET: np.log1p(df['DepDelayMinutes'])})
+    columns = [c for c in NOTEBOOK_FEATURES if c in df.columns]
+
+    df = df[columns + [TARGET, 'FlightDate']].dropna(subset=columns + [TARGET])
+    if len(df) > sample_rows:
+        df = df.sample(sample_rows, random_state=seed)
+    flight_date = pd.to_datetime(df['FlightDate'])
+    train = (flight_date <= TRAIN_END).to_numpy()
+    valid = ((flight_date > TRAIN_END) & (flight_date <= VALID_END)).to_numpy()
+
+    X = df[columns].to_numpy(dtype=np.float32)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    partition = {'source': source, 'sample_rows': sample_rows, 'seed': seed,
+                 'train_end': TRAIN_END, 'valid_end': VALID_END}
+    return {'X_train': X[train], 'y_train': y[train], 'X_valid': X[valid], 'y_valid': y[valid],
+            'feature_names': columns, 'partition': partition}
+
+
+def save_split(split, split_dir=DEFAULT_SPLIT_DIR):
+    os.makedirs(split_dir, exist_ok=True)
+    for name in SPLIT_ARRAYS:
+        np.save(os.path.join(split_dir, f'{name}.npy'), split[name])
+    with open(os.path.join(split_dir, 'split.json'), 'w') as file:
+        json.dump({'feature_names': split['feature_names'], 'partition': split['partition']}, file, indent=2)
+
+
+def load_split(split_dir=DEFAULT_SPLIT_DIR):
+    """The saved split, memory-mapped so worker processes share the pages."""
+    split = {name: np.load(os.path.join(split_dir, f'{name}.npy'), mmap_mode='r') for name in SPLIT_ARRAYS}
+    with open(os.path.join(split_dir, 'split.json')) as file:
+        split.update(json.load(file))
+    return split
+
+
+# ==========================================
+# STUDY
+# ==========================================
+def make_storage(storage):
+    """Optuna storage for an RDB URL (e.g. sqlite:///optuna.db) or a journal file path."""
+    if '://' in storage:
+        return optuna.storages.RDBStorage(storage)
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # optuna < 4.0
+        return optuna.storages.JournalStorage(optuna.storages.JournalFileStorage(storage))
+    return optuna.storages.JournalStorage(JournalFileBackend(storage))
+
+
+def make_pruner(name, n_startup_trials=5):
+    if name == 'median':
+        # Let a trial build its first trees before judging it
+        return optuna.pruners.MedianPruner(n_startup_trials=n_startup_trials, n_warmup_steps=50)
+    if name == 'halving':
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=50, reduction_factor=3)
+    return optuna.pruners.NopPruner()
+
+
+def open_study(storage, study_name, pruner='median', seed=None):
+    """Creates or loads `study_name` in a storage built by make_storage()."""
+    return optuna.create_study(study_name=study_name, storage=storage, direction='minimize',
+                               pruner=make_pruner(pruner), sampler=optuna.samplers.TPESampler(seed=seed),
+                               load_if_exists=True)
+
+
+def fail_interrupted_trials(study, storage):
+    """Marks trials an interrupted run left RUNNING as FAIL; returns how many."""
+    study_id = storage.get_study_id_from_name(study.study_name)
+    stale = study.get_trials(deepcopy=False, states=(TrialState.RUNNING,))
+    for trial in stale:
+        trial_id = storage.get_trial_id_from_study_id_trial_number(study_id, trial.number)
+        storage.set_trial_state_values(trial_id, TrialState.FAIL)
+    return len(stale)
+
+
+def finished_trials(study):
+    return len(study.get_trials(deepcopy=False, states=FINISHED_STATES))
+
+
+# ==========================================
+# OBJECTIVE
+# ==========================================
+def suggest_params(trial):
+    """The notebook's search space."""
+    return {
+        'learning_rate': trial.suggest_float('learning_rate', 0.001, 0.05, log=True),
+        'num_leaves': trial.suggest_int('num_leaves', 20, 200),
+        'min_data_in_leaf': trial.suggest_int('min_data_in_leaf', 20, 500),
+        'feature_fraction': trial.suggest_float('feature_fraction', 0.5, 1.0),
+        'bagging_fraction': trial.suggest_float('bagging_fraction', 0.5, 1.0),
+        'lambda_l1': trial.suggest_float('lambda_l1', 0.0, 1.0),
+        'lambda_l2': trial.suggest_float('lambda_l2', 0.0, 1.0),
+    }
+
+
+def booster_params(params, n_threads=-1):
+    """lgb.train parameters for one fit: the notebook's LGBMRegressor defaults plus `params`."""
+    # l2 is what LGBMRegressor evaluates by default; the notebook added MAE
+    return {'objective': 'regression', 'metric': ['l2', 'l1'], 'seed': 42, 'num_threads': n_threads,
+            'verbose': -1, **params}
+
+
+def objective(trial, split, datasets=None, n_threads=-1, prune=True):
+    """Validation MAE in minutes of one LightGBM fit; log-space L1 is reported each round.
+
+    `datasets` is a constructed (train, valid) pair shared across trials; without
+    it they are rebuilt from the split's arrays, as the notebook did.
+    """
+    if datasets is None:
+        datasets = build_datasets(split, [c for c in CATEGORICAL_FEATURES if c in split['feature_names']])
+    train, valid = datasets
+    callbacks = [lgb.early_stopping(stopping_rounds=EARLY_STOPPING_ROUNDS, verbose=False)]
+    if prune:
+        callbacks.append(LightGBMPruningCallback(trial, 'l1', valid_name='valid'))
+    booster = lgb.train(booster_params(suggest_params(trial), n_threads), train, num_boost_round=N_ESTIMATORS,
+                        valid_sets=[valid], valid_names=['valid'], callbacks=callbacks)
+    trial.set_user_attr('best_iteration', int(booster.best_iteration or N_ESTIMATORS))
+
+    # Back-transform predictions to minutes
+    y_pred = np.expm1(booster.predict(split['X_valid'], num_iteration=booster.best_iteration))
+    return float(np.mean(np.abs(np.expm1(split['y_valid']) - y_pred)))
+
+
+# ==========================================
+# RUNNERS
+# ==========================================
+def worker_quotas(remaining, workers):
+    """Trials per worker process: `remaining` split as evenly as possible, without empty quotas."""
+    base, extra = divmod(remaining, workers)
+    return [base + (i < extra) for i in range(min(workers, remaining))]
+
+
+def run_worker(storage, study_name, split_dir, n_trials, n_threads, pruner, seed, cache_dir=DEFAULT_CACHE_DIR):
+    """One worker process: runs `n_trials` trials of the shared study (pruned ones included)."""
+    split = load_split(split_dir)
+    train, valid, _ = load_or_build(split, split['partition'], cache_dir)
+    study = open_study(make_storage(storage), study_name, pruner, seed)
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study.optimize(lambda trial: objective(trial, split, (train, valid), n_threads, prune=pruner != 'none'),
+                   n_trials=n_trials)
+
+
+def tune(split_dir, storage=DEFAULT_STORAGE, study_name=DEFAULT_STUDY, n_trials=40, workers=4,
+         pruner='median', seed=42, cache_dir=DEFAULT_CACHE_DIR):
+    """Runs `workers` processes on one shared study until it has `n_trials` finished trials."""
+    parent_storage = make_storage(storage)
+    study = open_study(parent_storage, study_name, pruner, seed)
+    interrupted = fail_interrupted_trials(study, parent_storage)
+    done = finished_trials(study)
+    if interrupted or done:
+        print(f"Resuming '{study_name}': {done} finished trials, {interrupted} interrupted marked FAIL")
+    if done >= n_trials:
+        return study
+
+    # Build the binary Dataset cache once, before any worker looks for it
+    split = load_split(split_dir)
+    load_or_build(split, split['partition'], cache_dir)
+
+    # Each worker checking the budget itself would let every one of them start
+    # a trial while the last few are still running, so the budget is split here
+    quotas = worker_quotas(n_trials - done, workers)
+    n_threads = max(1, (os.cpu_count() or 1) // len(quotas))
+    # spawn, not fork: LightGBM's OpenMP runtime does not survive a fork
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=run_worker,
+                        args=(storage, study_name, split_dir, quota, n_threads, pruner, seed + i + 1, cache_dir))
+        for i, quota in enumerate(quotas)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return open_study(parent_storage, study_name, pruner, seed)
+
+
+def tune_serial(split, n_trials=40, seed=42):
+    """The notebook's loop: one in-memory study, all threads and fresh Datasets per fit, early stopping only."""
+    study = optuna.create_study(direction='minimize', sampler=optuna.samplers.TPESampler(seed=seed))
+    study.optimize(lambda trial: objective(trial, split, prune=False), n_trials=n_trials)
+    return study
+
+
+def summarize(study):
+    states = {state.name: len(study.get_trials(deepcopy=False, states=(state,))) for state in TrialState}
+    print(f"Trials: {', '.join(f'{n} {name.lower()}' for name, n in states.items() if n)}")
+    print("Best hyperparameters:")
+    print(study.best_params)
+    print("Best MAE:", study.best_value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', help='modeling table (.csv, .parquet or Parquet directory); '
+                                       'omit to reuse the split already in --split-dir')
+    parser.add_argument('--split-dir', default=DEFAULT_SPLIT_DIR)
+    parser.add_argument('--storage', default=DEFAULT_STORAGE, help='journal file path or RDB URL')
+    parser.add_argument('--study', default=DEFAULT_STUDY)
+    parser.add_argument('--trials', type=int, default=40, help='finished trials the study should hold')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--pruner', choices=['median', 'halving', 'none'], default='median')
+    parser.add_argument('--sample-rows', type=int, default=SAMPLE_ROWS)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='binary Dataset cache')
+    parser.add_argument('--serial', action='store_true', help="run the notebook's serial loop instead")
+    args = parser.parse_args()
+
+    if args.data:
+        save_split(make_split(read_dataset(args.data), args.sample_rows, source=describe_source(args.data)),
+                   args.split_dir)
+
+    start = time.perf_counter()
+    if args.serial:
+        study = tune_serial(load_split(args.split_dir), args.trials)
+    else:
+        study = tune(args.split_dir, args.storage, args.study, args.trials, args.workers, args.pruner,
+                     cache_dir=args.cache_dir)
+    elapsed = time.perf_counter() - start
+
+    summarize(study)
+    print(f"Wall clock: {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
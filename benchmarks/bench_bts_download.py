@@ -0,0 +1,124 @@
+"""Per-month time and peak memory of Data/bts_download.py against a local HTTP stand-in.
+
+Builds BTS-shaped fixture zips (~110 columns, several carriers and airports),
+serves them from a local http.server, runs the downloader against it and
+prints the per-month peak memory of the streaming path next to the
+notebook's read-everything path (each measured in a fresh process).
+Correctness (streaming, the chunked filter, retry and backoff) is covered by
+tests/test_bts_download.py.
+
+Usage:
+    python benchmarks/bench_bts_download.py --rows 200000 --months 3
+"""
+import argparse
+import functools
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+
+import bts_download  # noqa: E402
+
+
+CARRIERS = ['WN', 'AA', 'DL', 'UA', 'B6', 'AS']
+OTHER_AIRPORTS = ['ATL', 'ORD', 'DEN', 'SEA', 'JFK', 'MCO', 'BNA', 'STL']
+
+
+def make_bts_month(year, month, n_rows, seed):
+    """A BTS-shaped monthly CSV: BTS_COLUMNS plus filler columns and the trailing empty one."""
+    rng = np.random.default_rng(seed)
+    airports = np.array(sorted(bts_download.SOUTHWEST_STATE_AIRPORTS) + OTHER_AIRPORTS)
+    columns = {}
+    for name in bts_download.BTS_COLUMNS:
+        columns[name] = rng.integers(0, 2400, n_rows).astype(str)
+    columns['Year'] = np.full(n_rows, str(year))
+    columns['Month'] = np.full(n_rows, str(month))
+    columns['FlightDate'] = np.array([f"{year}-{month:02d}-{d:02d}" for d in rng.integers(1, 29, n_rows)])
+    columns['Reporting_Airline'] = rng.choice(CARRIERS, n_rows)
+    columns['Origin'] = rng.choice(airports, n_rows)
+    columns['Dest'] = rng.choice(airports, n_rows)
+    columns['OriginCityName'] = np.char.add(columns['Origin'], ', XX')
+    columns['CancellationCode'] = rng.choice(['', '', '', 'A', 'B'], n_rows)
+    columns['WeatherDelay'] = np.where(rng.random(n_rows) < 0.8, '', columns['WeatherDelay'])
+    for i in range(110 - len(bts_download.BTS_COLUMNS)):
+        columns[f'Div{i}Airport'] = np.where(rng.random(n_rows) < 0.99, '', 'XYZ')
+    columns['Unnamed: 0'] = np.full(n_rows, '')
+    frame = pd.DataFrame(columns)
+    # BTS files end every line with a comma: an unnamed empty last column
+    frame = frame.rename(columns={'Unnamed: 0': ''})
+    return frame.to_csv(index=False)
+
+
+def build_fixtures(serve_dir, months, n_rows):
+    for i, (year, month) in enumerate(months):
+        name = bts_download.ZIP_NAME.format(year=year, month=month)
+        with zipfile.ZipFile(os.path.join(serve_dir, name), 'w', zipfile.ZIP_DEFLATED) as z:
+            z.writestr(name.replace('.zip', '.csv'), make_bts_month(year, month, n_rows, seed=i))
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def reference_filter(zip_path):
+    """The notebook's path: read the whole CSV into memory, then filter."""
+    with zipfile.ZipFile(zip_path) as z:
+        csv_name = next(name for name in z.namelist() if name.endswith('.csv'))
+        df = pd.read_csv(io.BytesIO(z.read(csv_name)), dtype=str, keep_default_na=False)
+    df = df[(df['Reporting_Airline'] == 'WN') & df['Origin'].isin(bts_download.SOUTHWEST_STATE_AIRPORTS)]
+    return df[bts_download.BTS_COLUMNS].reset_index(drop=True)
+
+
+def reference_peak_mb(zip_path):
+    reference_filter(zip_path)
+    return bts_download._peak_rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000, help='rows per fixture month')
+    parser.add_argument('--months', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    months = [(2019, m) for m in range(1, args.months + 1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        serve_dir = os.path.join(tmp, 'serve')
+        out_dir = os.path.join(tmp, 'out')
+        os.makedirs(serve_dir)
+        build_fixtures(serve_dir, months, args.rows)
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=serve_dir))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        try:
+            results, _ = bts_download.download_months(
+                months, out_dir, max_workers=args.workers, base_url=base_url, keep_zip=True,
+            )
+            context = multiprocessing.get_context('spawn')
+            print(f"\n{'month':<10}{'rows':>10}{'seconds':>10}{'peak MB':>10}{'notebook peak MB':>18}")
+            for r in results:
+                zip_path = os.path.join(out_dir, '.downloads', bts_download.ZIP_NAME.format(year=r['year'], month=r['month']))
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    notebook_mb = pool.submit(reference_peak_mb, zip_path).result()
+                print(f"{r['year']}-{r['month']:02d}   {r['rows']:>10,}{r['seconds']:>10.2f}"
+                      f"{r['peak_rss_mb']:>10.0f}{notebook_mb:>18.0f}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
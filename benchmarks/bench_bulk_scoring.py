@@ -0,0 +1,98 @@
+"""Throughput and peak RSS of chunked schedule scoring at growing file sizes.
+
+Writes synthetic schedules (gzip CSV) of each size, checks that the scored
+output matches score_frame() and that every top factor adds the points it
+claims, then scores each file into a gzip CSV in a fresh interpreter. Peak
+RSS should stay flat as the file grows, since only one chunk is in memory.
+
+Usage:
+    python benchmarks/bench_bulk_scoring.py --rows 100000 1000000 5000000
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard')
+sys.path.insert(0, DASHBOARD_DIR)
+
+from bulk_scoring import score_schedule  # noqa: E402
+from scoring import score_frame  # noqa: E402
+from synthetic import make_flights, write_flights_csv  # noqa: E402
+
+
+CHILD = """
+import gzip, json, resource, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+from bulk_scoring import score_schedule
+start = time.perf_counter()
+with gzip.open({out!r}, 'wt', compresslevel=1, newline='') as out:
+    tiers = score_schedule({path!r}, out, chunksize={chunksize})
+seconds = time.perf_counter() - start
+try:
+    with open('/proc/self/status') as status:
+        peak_kb = next(int(line.split()[1]) for line in status if line.startswith('VmHWM:'))
+except (OSError, StopIteration):
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': seconds, 'peak_mb': peak_kb / 1024, 'rows': sum(tiers.values())}}))
+"""
+
+# top_factors label -> the points it may add
+FACTOR_POINTS = {'Wind': (15, 30), 'Precipitation': (10, 35), 'Snow': (40,), 'Pressure': (10, 25),
+                 'Late Departure': (5,), 'Long Haul': (5,)}
+
+
+def check_output(n_rows=20_000):
+    schedule = make_flights(n_rows, seed=7)
+    out = io.StringIO()
+    score_schedule(io.StringIO(schedule.to_csv(index=False)), out, chunksize=3000)
+    scored = pd.read_csv(io.StringIO(out.getvalue()), keep_default_na=False)
+
+    assert len(scored) == n_rows
+    assert np.array_equal(scored['risk_score'].to_numpy(), score_frame(schedule)), 'scores differ from score_frame'
+    for factors, score in zip(scored['top_factors'], scored['risk_score']):
+        points = []
+        for factor in filter(None, factors.split('; ')):
+            label, added = factor[:-1].split(' (+')
+            assert int(added) in FACTOR_POINTS[label], f"{label} cannot add {added}"
+            points.append(int(added))
+        assert points == sorted(points, reverse=True)
+        assert score == 0 or points, 'a risky flight has no factors'
+
+
+def run_child(path, out, chunksize):
+    code = CHILD.format(dashboard_dir=os.path.abspath(DASHBOARD_DIR), path=path, out=out, chunksize=chunksize)
+    result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    args = parser.parse_args()
+
+    check_output()
+    print("Scored output matches score_frame() and the top factors add up\n")
+
+    print(f"{'rows':>12}{'file MB':>10}{'seconds':>10}{'rows/sec':>12}{'peak RSS MB':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = os.path.join(tmp, f'schedule_{n_rows}.csv.gz')
+            write_flights_csv(path, n_rows)
+            r = run_child(path, os.path.join(tmp, f'scored_{n_rows}.csv.gz'), args.chunksize)
+            with gzip.open(path, 'rb') as file:
+                size_mb = sum(len(block) for block in iter(lambda: file.read(1 << 20), b'')) / 1e6
+            print(f"{r['rows']:>12,}{size_mb:>10.0f}{r['seconds']:>10.1f}{r['rows'] / r['seconds']:>12,.0f}"
+                  f"{r['peak_mb']:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
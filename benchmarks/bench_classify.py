@@ -0,0 +1,158 @@
+"""Test-set metrics and peak memory of Modeling/classify.py against the notebook's classifiers.
+
+Builds a feature store (features.py) from synthetic joined rows in which
+delays and weather impact depend on wind, rain and departure hour, then
+trains each classifier two ways, each in a fresh process:
+  * notebook: the whole store read into pandas, then
+      - delay: RandomForestClassifier(class_weight='balanced', the tuned
+        depth 8 / 34 rows per leaf) on a 500k-row sample
+      - weather: every positive plus 1/10 of the negatives, MinMaxScaler,
+        the minority class oversampled to balance, LogisticRegression
+        (liblinear)
+  * streaming: classify.train(), LightGBM over an lgb.Sequence for delay,
+    SGD partial_fit for weather.
+Both are scored on the same time-based test split (flights after
+VALID_END). imblearn is not installed here, so the notebook path
+oversamples by drawing minority rows with replacement instead of SMOTE.
+Memory is the peak of the sampled anonymous resident memory (RssAnon), as
+in bench_weather_join.py; the memory-mapped arrays are page cache and do
+not count. Run at several sizes to see which paths grow with the data.
+
+Usage:
+    python benchmarks/bench_classify.py --rows 1000000 3000000 --trees 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Modeling'))
+
+import classify  # noqa: E402
+import features  # noqa: E402
+from bench_weather_join import in_fresh_process, peak_anon_mb  # noqa: E402
+from synthetic import make_joined  # noqa: E402
+
+
+SAMPLE_ROWS = 500_000
+
+
+def make_source(out_dir, n_rows, chunk=500_000, seed=7):
+    """Joined rows with a learnable delay and weather signal, as Parquet chunks."""
+    os.makedirs(out_dir)
+    for i, start in enumerate(range(0, n_rows, chunk)):
+        df = make_joined(min(chunk, n_rows - start), seed=seed + i)
+        rng = np.random.default_rng(seed + 1000 + i)
+        hour = df['CRSDepTime'].to_numpy() // 100
+        wind, rain = df['wspd'].to_numpy(), df['prcp'].to_numpy()
+        p_delay = 1 / (1 + np.exp(-(-1.4 + 0.05 * (wind - 15) + 0.12 * rain + 0.09 * (hour - 12))))
+        delay = np.where(rng.random(len(df)) < p_delay, 15 + rng.exponential(25.0, len(df)).round(),
+                         rng.integers(0, 15, len(df)).astype(float))
+        delay[df['Cancelled'].to_numpy() == 1] = np.nan
+        p_weather = 1 / (1 + np.exp(-(-3.6 + 0.07 * (wind - 15) + 0.2 * rain)))
+        df['DepDelayMinutes'] = delay
+        df['DepDel15'] = np.where(np.isnan(delay), np.nan, (delay >= 15).astype(float))
+        df['WeatherDelay'] = np.where(rng.random(len(df)) < p_weather, rng.exponential(30.0, len(df)).round() + 1,
+                                      np.nan)
+        df.to_parquet(os.path.join(out_dir, f'part-{i}.parquet'), index=False)
+
+
+def _notebook_frame(store_dir, target):
+    df = features.scan_features(store_dir).collect().to_pandas()
+    columns = [c for c in features.NOTEBOOK_FEATURES if c in df.columns]
+    if target == 'delay':
+        label = df['DepDel15']
+    else:
+        label = ((df['WeatherDelay'].fillna(0) > 0) | df['weatherCancellation'].fillna(False)).astype(float)
+    df = df[columns + ['FlightDate']].assign(label=label).dropna()
+    flight_date = pd.to_datetime(df['FlightDate'])
+    return df, columns, flight_date
+
+
+def _notebook_delay(store_dir, trees):
+    df, columns, flight_date = _notebook_frame(store_dir, 'delay')
+    test = df[flight_date > features.VALID_END]
+    sample = df.sample(min(SAMPLE_ROWS, len(df)), random_state=42)
+    train = sample[pd.to_datetime(sample['FlightDate']) <= features.TRAIN_END]
+    model = RandomForestClassifier(n_estimators=trees, max_depth=8, min_samples_leaf=34, n_jobs=-1,
+                                   random_state=42, class_weight='balanced')
+    model.fit(train[columns], train['label'])
+    return classify.evaluate(test['label'], model.predict_proba(test[columns])[:, 1])
+
+
+def _notebook_weather(store_dir):
+    df, columns, flight_date = _notebook_frame(store_dir, 'weather')
+    test = df[flight_date > features.VALID_END]
+    train = df[flight_date <= features.TRAIN_END]
+    positive, negative = train[train['label'] == 1], train[train['label'] == 0]
+    sampled = pd.concat([positive, negative.sample(len(negative) // 10, random_state=42)])
+
+    scaler = MinMaxScaler()
+    X = scaler.fit_transform(sampled[columns])
+    y = sampled['label'].to_numpy()
+    # SMOTE stand-in: minority rows drawn with replacement up to the majority count
+    minority = int(y.sum() < len(y) / 2)
+    rows = np.flatnonzero(y == minority)
+    extra = np.random.default_rng(42).choice(rows, abs(len(y) - 2 * len(rows)))
+    X, y = np.vstack([X, X[extra]]), np.concatenate([y, y[extra]])
+    model = LogisticRegression(solver='liblinear', random_state=42, max_iter=200)
+    model.fit(X, y)
+    return classify.evaluate(test['label'], model.predict_proba(scaler.transform(test[columns]))[:, 1])
+
+
+def notebook_run(store_dir, target, trees):
+    result = {}
+
+    def run():
+        result['scores'] = _notebook_delay(store_dir, trees) if target == 'delay' else _notebook_weather(store_dir)
+    peak_mb, seconds = peak_anon_mb(run)
+    return result['scores'], peak_mb, seconds
+
+
+def streaming_run(store_dir, arrays_dir, target):
+    result = {}
+
+    def run():
+        _, result['scores'], _ = classify.train(store_dir, arrays_dir, target)
+    peak_mb, seconds = peak_anon_mb(run)
+    return result['scores'], peak_mb, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 3_000_000])
+    parser.add_argument('--trees', type=int, default=100, help='Random Forest trees (the tuned notebook used 442)')
+    parser.add_argument('--max-auc-drop', type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'target':<8}{'path':<24}{'acc':>7}{'recall':>8}{'prec':>7}{'auc':>7}"
+          f"{'seconds':>9}{'anon MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            source, store = os.path.join(tmp, f'joined_{n_rows}'), os.path.join(tmp, f'features_{n_rows}')
+            make_source(source, n_rows)
+            features.build_feature_store(source, store)
+            for target in classify.TARGETS:
+                runs = [
+                    (f"notebook {'RF' if target == 'delay' else 'logistic'}",
+                     in_fresh_process(notebook_run, store, target, args.trees)),
+                    (f"streaming {classify.DEFAULT_LEARNER[target]}",
+                     in_fresh_process(streaming_run, store, os.path.join(tmp, f'arrays_{n_rows}'), target)),
+                ]
+                for name, (scores, peak_mb, seconds) in runs:
+                    print(f"{n_rows:>10,} {target:<8}{name:<24}{scores['accuracy']:>7.3f}{scores['recall']:>8.3f}"
+                          f"{scores['precision']:>7.3f}{scores['roc_auc']:>7.3f}{seconds:>9.1f}{peak_mb:>9.0f}")
+                reference, streaming = runs[0][1][0], runs[1][1][0]
+                assert streaming['roc_auc'] >= reference['roc_auc'] - args.max_auc_drop, \
+                    f"{target}: streaming ROC-AUC {streaming['roc_auc']:.3f} vs notebook {reference['roc_auc']:.3f}"
+    print(f"\nparity OK: streaming ROC-AUC within {args.max_auc_drop} of the notebook paths")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Cold-start time and peak RSS: gzip CSV parse vs. the partitioned Parquet store.
+
+Both paths stream into the same stratified reservoir sampler used by load_data.
+
+Each path runs in a fresh interpreter so peak RSS is not shared between them.
+
+Usage:
+    python benchmarks/bench_cold_start.py --rows 1000000
+    python benchmarks/bench_cold_start.py --csv Dashboard/procesed_flight_data.csv.gz
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard')
+sys.path.insert(0, DASHBOARD_DIR)
+
+from flight_store import PARTITION_COLUMNS, build_store  # noqa: E402
+from synthetic import make_flights  # noqa: E402
+
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+start = time.perf_counter()
+import flight_store, sampling
+df = sampling.stratified_reservoir_sample({call})
+seconds = time.perf_counter() - start
+# ru_maxrss survives exec (it would include the parent's data); VmHWM does not
+try:
+    with open('/proc/self/status') as status:
+        peak_kb = next(int(line.split()[1]) for line in status if line.startswith('VmHWM:'))
+except (OSError, StopIteration):
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': seconds, 'peak_mb': peak_kb / 1024, 'rows': len(df)}}))
+"""
+
+
+def run_child(call):
+    code = CHILD.format(dashboard_dir=os.path.abspath(DASHBOARD_DIR), call=call)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='synthetic rows when --csv is not given')
+    parser.add_argument('--extra-columns', type=int, default=100,
+                        help='unused numeric columns padded onto synthetic rows (the processed CSV is ~120 wide)')
+    parser.add_argument('--partition-by', nargs='+', default=PARTITION_COLUMNS)
+    parser.add_argument('--csv', help='existing processed .csv.gz to benchmark instead of synthetic data')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(tmp, 'flights.csv.gz')
+            print(f"Writing {args.rows:,} synthetic rows to {csv_path} ...")
+            df = make_flights(args.rows)
+            rng = np.random.default_rng(0)
+            for i in range(args.extra_columns):
+                df[f'extra_{i}'] = rng.random(len(df)).round(3)
+            df.to_csv(csv_path, index=False, compression='gzip')
+
+        store_dir = os.path.join(tmp, 'flight_store')
+        start = time.perf_counter()
+        build_store(csv_path, store_dir, partition_columns=args.partition_by)
+        print(f"Built store in {time.perf_counter() - start:.1f}s\n")
+
+        results = {
+            'gzip CSV (iter_csv)': run_child(f'flight_store.iter_csv({csv_path!r})'),
+            'Parquet store (iter_store)': run_child(f'flight_store.iter_store({store_dir!r})'),
+        }
+
+    print(f"{'path':<30}{'rows':>12}{'seconds':>12}{'peak RSS MB':>14}")
+    for name, r in results.items():
+        print(f"{name:<30}{r['rows']:>12,}{r['seconds']:>12.2f}{r['peak_mb']:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""Feature build: the notebook's eager pandas path vs. the lazy Polars feature store.
+
+The pandas path is the notebook's: read the whole joined CSV, then add each
+feature column in place. The Polars path is Modeling/features.py streaming the
+same CSV into the Year/Month Parquet store. Each runs in a fresh interpreter
+so peak RSS is measured separately. Before timing, both are run on a small
+sample and checked to produce the same feature values.
+
+Usage:
+    python benchmarks/bench_features.py --rows 1000000 --extra-columns 60
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELING_DIR = os.path.join(BENCH_DIR, '..', 'Modeling')
+sys.path.insert(0, MODELING_DIR)
+
+import features  # noqa: E402
+from synthetic import make_joined  # noqa: E402
+
+
+FEATURE_COLUMNS = [
+    'tavg', 'tmin', 'tmax', 'prcp', 'snow', 'wspd', 'pres',
+    'DepHour', 'DepMinute', 'DepTotalMinutes', 'DepTime_sin', 'DepTime_cos',
+    'ArrHour', 'ArrMinute', 'ArrTotalMinutes', 'ArrTime_sin', 'ArrTime_cos',
+    'TotalDisruptionMinutes', 'IsSevereDisruption', 'IsCancelledOrDiverted', 'IsDelayedOnly',
+    'weatherCancellation', 'DayOfYear', 'IsWeekend', 'IsHoliday', 'IsHolidayWindow',
+    'Dist_x_Wspd', 'TempRange', 'MonthxWeekday', 'DepDelayMinutes_log',
+]
+
+
+def pandas_features(df):
+    """The notebook's eager feature code (Modeling.ipynb cells 11, 13, 23-24, 39, 43)."""
+    for col in ["tavg", "tmin", "tmax"]:
+        df[col] = (df[col] * 9/5 + 32).round().astype("Int64")
+    for col in ["prcp", "snow"]:
+        df[col] = df[col] / 25.4
+    df["wspd"] = df["wspd"] / 1.60934
+    df["pres"] = df["pres"] * 0.02953
+
+    df['DepHour'] = df['CRSDepTime'] // 100
+    df['DepMinute'] = df['CRSDepTime'] % 100
+    df['DepTotalMinutes'] = df['DepHour'] * 60 + df['DepMinute']
+    df['DepTime_sin'] = np.sin(2*np.pi*df['DepTotalMinutes'] / 1440)
+    df['DepTime_cos'] = np.cos(2*np.pi*df['DepTotalMinutes'] / 1440)
+    df['ArrHour'] = df['CRSArrTime'] // 100
+    df['ArrMinute'] = df['CRSArrTime'] % 100
+    df['ArrTotalMinutes'] = df['ArrHour'] * 60 + df['ArrMinute']
+    df['ArrTime_sin'] = np.sin(2*np.pi*df['ArrTotalMinutes'] / 1440)
+    df['ArrTime_cos'] = np.cos(2*np.pi*df['ArrTotalMinutes'] / 1440)
+
+    df['TotalDisruptionMinutes'] = np.where(
+        (df['Cancelled'] == 1.0) | (df['Diverted'] == 1.0), 1000, df['DepDelayMinutes'])
+    df['IsSevereDisruption'] = np.where(
+        (df['Cancelled'] == 1.0) | (df['Diverted'] == 1.0) | (df['DepDel15'] == 1.0), 1.0, 0.0)
+    df['IsCancelledOrDiverted'] = np.where((df['Cancelled'] == 1.0) | (df['Diverted'] == 1.0), 1.0, 0.0)
+    df['IsDelayedOnly'] = np.where((df['DepDel15'] == 1.0) & (df['IsCancelledOrDiverted'] == 0.0), 1.0, 0.0)
+    df['DepDelayMinutes_log'] = np.log1p(df['DepDelayMinutes'])
+
+    df['FlightDate'] = pd.to_datetime(df['FlightDate'])
+    df['weatherCancellation'] = (df['Cancelled'] == 1) & (df['CancellationCode'] == 'B')
+    df['DayOfYear'] = df['FlightDate'].dt.dayofyear
+    df['IsWeekend'] = df['DayOfWeek'].isin([6, 7]).astype(int)
+    holidays = USFederalHolidayCalendar().holidays(start=df['FlightDate'].min(), end=df['FlightDate'].max())
+    df['IsHoliday'] = df['FlightDate'].isin(holidays)
+    df["IsHolidayWindow"] = list(zip(df["Month"], df["DayofMonth"]))
+    df["IsHolidayWindow"] = df["IsHolidayWindow"].isin(set(features.HOLIDAY_WINDOWS)).astype(int)
+    df['Dist_x_Wspd'] = df['Distance'] * df['wspd']
+    df['TempRange'] = df['tmax'] - df['tmin']
+    df['MonthxWeekday'] = df['Month'] * df['DayOfWeek']
+    return df
+
+
+def check_parity(n_rows=20_000):
+    df = make_joined(n_rows, seed=7)
+    expected = pandas_features(df.copy())[FEATURE_COLUMNS]
+    lf = features.add_features(features.pl.from_pandas(df).lazy())
+    got = lf.select(FEATURE_COLUMNS).collect().to_pandas()
+    for column in FEATURE_COLUMNS:
+        a = expected[column].astype('float64').to_numpy()
+        b = got[column].astype('float64').to_numpy()
+        assert np.allclose(a, b, equal_nan=True, rtol=1e-12), column
+
+
+CHILD = """
+import json, os, resource, sys, time
+sys.path.insert(0, {bench_dir!r})
+sys.path.insert(0, {modeling_dir!r})
+start = time.perf_counter()
+{body}
+seconds = time.perf_counter() - start
+try:
+    with open('/proc/self/status') as status:
+        peak_kb = next(int(line.split()[1]) for line in status if line.startswith('VmHWM:'))
+except (OSError, StopIteration):
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': seconds, 'peak_mb': peak_kb / 1024}}))
+"""
+
+PANDAS_BODY = """
+import pandas as pd
+from bench_features import pandas_features
+df = pandas_features(pd.read_csv({csv!r}))
+df.to_parquet({out!r}, partition_cols=['Year', 'Month'])
+"""
+
+POLARS_BODY = """
+import features
+features.build_feature_store({csv!r}, {out!r})
+"""
+
+
+def run_child(body):
+    code = CHILD.format(bench_dir=BENCH_DIR, modeling_dir=os.path.abspath(MODELING_DIR), body=body)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--extra-columns', type=int, default=60,
+                        help='unused numeric columns padded onto the joined rows (BTS + weather is ~120 wide)')
+    args = parser.parse_args()
+
+    check_parity()
+    print("parity OK: Polars features match the notebook's pandas code\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'joined_data.csv')
+        print(f"Writing {args.rows:,} synthetic joined rows ...")
+        make_joined(args.rows, extra_columns=args.extra_columns).to_csv(csv_path, index=False)
+        print(f"CSV is {os.path.getsize(csv_path) / 1024 ** 2:.0f} MB\n")
+
+        results = {
+            'pandas (eager)': run_child(PANDAS_BODY.format(csv=csv_path, out=os.path.join(tmp, 'pandas_store'))),
+            'Polars (lazy, streaming)': run_child(POLARS_BODY.format(csv=csv_path, out=os.path.join(tmp, 'store'))),
+        }
+        n_rows = features.scan_features(os.path.join(tmp, 'store')).select(features.pl.len()).collect().item()
+        assert n_rows == args.rows, n_rows
+
+    print(f"{'path':<28}{'seconds':>10}{'peak RSS MB':>14}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['seconds']:>10.2f}{r['peak_mb']:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
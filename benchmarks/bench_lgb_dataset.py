@@ -0,0 +1,97 @@
+"""Per-fit Dataset setup and memory: one-hot pandas vs cached categorical binary.
+
+The notebook hands LightGBM a float32 DataFrame with one-hot Origin_, Dest_,
+Month_ and DayOfWeek_ blocks, and every trial bins it again. lgb_dataset.py
+passes those four as native categorical features and saves the binned
+Dataset once. This times the setup each fit pays on both paths (building
+from one-hot pandas, building from categorical arrays, loading the binary
+cache) and compares the input matrix sizes. It also checks that a model
+trained on the loaded Dataset matches one trained on the freshly built one.
+
+Usage:
+    python benchmarks/bench_lgb_dataset.py --rows 500000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Modeling'))
+
+from lgb_dataset import CATEGORICAL_FEATURES, DATASET_PARAMS, build_datasets, load_or_build  # noqa: E402
+from synthetic import make_joined  # noqa: E402
+
+
+FEATURES = ['Month', 'DayOfWeek', 'Flight_Number_Reporting_Airline', 'OriginAirportID', 'DestAirportID',
+            'CRSDepTime', 'CRSArrTime', 'Distance', 'tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'pres']
+PARAMS = {'objective': 'regression', 'learning_rate': 0.05, 'num_leaves': 63, 'seed': 42, 'verbose': -1}
+
+
+def make_split(n_rows):
+    df = make_joined(n_rows).dropna(subset=['DepDelayMinutes'])
+    df['DayOfWeek'] = pd.to_datetime(df['FlightDate']).dt.dayofweek + 1
+    rng = np.random.default_rng(0)
+    y = np.log1p(df['DepDelayMinutes'].to_numpy() + rng.exponential(3.0, len(df))
+                 * (1 + (df['wspd'].to_numpy() > 30)))
+    train = (pd.to_datetime(df['FlightDate']) <= '2023-12-31').to_numpy()
+
+    X = df[FEATURES].to_numpy(dtype=np.float32)
+    split = {'X_train': X[train], 'y_train': y[train], 'X_valid': X[~train], 'y_valid': y[~train],
+             'feature_names': FEATURES}
+    # The notebook's layout: the four columns one-hot encoded on top of the rest
+    one_hot = pd.get_dummies(df[FEATURES], columns=['Month', 'DayOfWeek', 'OriginAirportID', 'DestAirportID'],
+                             prefix=['Month', 'DayOfWeek', 'Origin', 'Dest']).astype(np.float32)
+    one_hot = pd.concat([df[FEATURES].astype(np.float32), one_hot.drop(columns=FEATURES, errors='ignore')], axis=1)
+    return split, one_hot[train], y[train]
+
+
+def timed(call, repeats=3):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = call()
+        samples.append(time.perf_counter() - start)
+    return min(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    args = parser.parse_args()
+
+    split, one_hot_train, y_train = make_split(args.rows)
+    categorical = [c for c in CATEGORICAL_FEATURES if c in FEATURES]
+    partition = {'source': 'synthetic', 'rows': args.rows}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        one_hot_seconds, _ = timed(lambda: lgb.Dataset(one_hot_train, label=y_train,
+                                                       params=DATASET_PARAMS).construct())
+        build_seconds, (fresh_train, _) = timed(lambda: build_datasets(split, categorical))
+        load_or_build(split, partition, cache_dir)
+        load_seconds, (cached_train, cached_valid, hit) = timed(lambda: load_or_build(split, partition, cache_dir))
+        assert hit
+
+        fresh = lgb.train(PARAMS, fresh_train, num_boost_round=50)
+        cached = lgb.train(PARAMS, cached_train, num_boost_round=50, valid_sets=[cached_valid])
+        assert np.allclose(fresh.predict(split['X_valid']), cached.predict(split['X_valid']))
+        cache_bytes = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(cache_dir) for f in files)
+    print("parity OK: boosters trained on the built and the cached Dataset agree\n")
+
+    print(f"{len(y_train):,} training rows")
+    print(f"input matrix: one-hot {one_hot_train.shape[1]} cols, "
+          f"{one_hot_train.memory_usage(index=False).sum() / 1e6:.1f} MB; "
+          f"categorical {len(FEATURES)} cols, {split['X_train'].nbytes / 1e6:.1f} MB; "
+          f"binary cache {cache_bytes / 1e6:.1f} MB\n")
+    print(f"{'Dataset setup per fit':<36}{'seconds':>9}")
+    print(f"{'one-hot pandas (notebook)':<36}{one_hot_seconds:>9.3f}")
+    print(f"{'categorical arrays':<36}{build_seconds:>9.3f}")
+    print(f"{'binary cache load':<36}{load_seconds:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Bytes per row of the dashboard flight table before/after the compact schema.
+
+"Before" is the rows as pandas reads the processed CSV (every column,
+default dtypes); "after" is compact_frame() of the same rows. Both are
+measured with memory_usage(deep=True).
+
+Usage:
+    python benchmarks/bench_memory.py --rows 5000
+    python benchmarks/bench_memory.py --csv Dashboard/procesed_flight_data.csv.gz
+"""
+import argparse
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+
+from flight_schema import bytes_per_row, compact_frame  # noqa: E402
+from synthetic import make_flights  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000, help='synthetic rows (the app keeps 5,000)')
+    parser.add_argument('--extra-columns', type=int, default=100,
+                        help='unused numeric columns padded onto synthetic rows (the processed CSV is ~120 wide)')
+    parser.add_argument('--csv', help='read the first --rows rows of a real processed .csv.gz instead')
+    args = parser.parse_args()
+
+    if args.csv:
+        before = pd.read_csv(args.csv, compression='gzip', nrows=args.rows)
+        before.columns = before.columns.str.strip()
+    else:
+        df = make_flights(args.rows)
+        rng = np.random.default_rng(0)
+        extra = pd.DataFrame(rng.random((len(df), args.extra_columns)).round(3),
+                             columns=[f'extra_{i}' for i in range(args.extra_columns)])
+        df = pd.concat([df, extra], axis=1)
+        # Round-trip through CSV so dtypes are what read_csv actually produces
+        before = pd.read_csv(io.StringIO(df.to_csv(index=False)))
+
+    after = compact_frame(before)
+
+    print(f"{'table':<10}{'rows':>8}{'columns':>10}{'bytes/row':>12}{'total KB':>12}")
+    for name, frame in (('before', before), ('after', after)):
+        total = frame.memory_usage(deep=True).sum()
+        print(f"{name:<10}{len(frame):>8,}{frame.shape[1]:>10}{bytes_per_row(frame):>12.1f}{total / 1024:>12.1f}")
+    print(f"\n{bytes_per_row(before) / bytes_per_row(after):.1f}x smaller")
+    print("\nafter dtypes:")
+    print(after.dtypes.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Overhead of Dashboard/metrics.py.
+
+Times the per-call cost of the decorator and the context manager, disabled
+and enabled, and checks that disabled they add less than
+--max-disabled-share of one calculate_risk_score call, the cheapest call
+they wrap in the app that does real work. tests/test_metrics.py checks
+bucketing, quantiles, the Prometheus dump and that nothing is recorded
+while metrics are off.
+
+Usage:
+    python benchmarks/bench_metrics.py --calls 1000000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+
+import metrics  # noqa: E402
+from scoring import calculate_risk_score  # noqa: E402
+
+
+WEATHER = {'wspd': 42.0, 'prcp': 3.1, 'snow': 0.0, 'pres': 1001.5, 'tavg': 18.0}
+FLIGHT = {'dep_time': 1930, 'distance': 850}
+
+
+def per_call_ns(statement, calls, setup_globals):
+    return min(timeit.repeat(statement, globals=setup_globals, number=calls, repeat=5)) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=1_000_000)
+    parser.add_argument('--max-disabled-share', type=float, default=0.01)
+    args = parser.parse_args()
+
+    def bare():
+        return None
+    wrapped = metrics.timed('noop')(bare)
+    env = {'bare': bare, 'wrapped': wrapped, 'metrics': metrics, 'score': calculate_risk_score,
+           'WEATHER': WEATHER, 'FLIGHT': FLIGHT}
+
+    rows = []
+    for enabled in (False, True):
+        metrics.set_enabled(enabled)
+        base = per_call_ns('bare()', args.calls, env)
+        rows.append((enabled, 'decorator', per_call_ns('wrapped()', args.calls, env) - base))
+        empty = per_call_ns('pass', args.calls, env)
+        rows.append((enabled, 'context manager',
+                     per_call_ns("with metrics.timer('noop'):\n    pass", args.calls, env) - empty))
+    metrics.set_enabled(False)
+    score_ns = per_call_ns('score(WEATHER, FLIGHT)', args.calls // 10, env)
+
+    print(f"{'metrics':<10}{'wrapper':<18}{'overhead ns/call':>18}")
+    for enabled, kind, overhead in rows:
+        print(f"{'on' if enabled else 'off':<10}{kind:<18}{overhead:>18.0f}")
+    print(f"\nfor scale: calculate_risk_score takes {score_ns:,.0f} ns per call")
+
+    limit = args.max_disabled_share * score_ns
+    for enabled, kind, overhead in rows:
+        if not enabled:
+            assert overhead <= limit, f"disabled {kind} costs {overhead:.0f} ns per call (limit {limit:.0f})"
+    print(f"overhead OK: disabled wrappers cost under {args.max_disabled_share:.0%} of a score call ({limit:.0f} ns)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Per-prediction latency of the dashboard's LightGBM delay model.
+
+Trains a small booster on synthetic rows with the features the dashboard
+serves (plus one-hot months), saves it like Modeling/train.py would and
+loads it through predictor.py. The
+naive path is what a Streamlit rerun would otherwise do: build a one-row
+pandas DataFrame of features and call the booster. Also checks that both
+paths agree and that a missing model file falls back to the heuristic.
+
+Usage:
+    python benchmarks/bench_predictor.py --calls 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import lightgbm
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'Dashboard'))
+sys.path.insert(0, os.path.join(ROOT, 'Modeling'))
+
+from features import DASHBOARD_FEATURES  # noqa: E402
+from predictor import load_delay_model, model_inputs, predict_frame  # noqa: E402
+from scoring import score_frame  # noqa: E402
+from synthetic import make_flights  # noqa: E402
+
+
+# The served features, plus one-hot months to exercise that path too
+MODEL_FEATURES = DASHBOARD_FEATURES + [f'Month_{m}' for m in range(1, 13)]
+
+
+def dashboard_rows(n_rows, seed=42):
+    """Synthetic flights in the dashboard's columns (metric weather)."""
+    df = make_flights(n_rows, seed)
+    return df.drop(columns=['FlightDate', 'Quarter'])
+
+
+def training_matrix(df):
+    inputs = model_inputs({name: df[name].to_numpy() for name in df.columns}, len(df))
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({name: inputs[name] for name in DASHBOARD_FEATURES})
+    for month in range(1, 13):
+        X[f'Month_{month}'] = (df['Month'].to_numpy() == month).astype(np.float64)
+    y = np.log1p(np.clip(X['wspd'] * 0.8 + X['prcp'] * 20 + rng.exponential(5.0, len(df)), 0, None))
+    return X[MODEL_FEATURES], y
+
+
+def naive_predict(booster, row):
+    """One-row DataFrame of features, then booster.predict (the pandas path)."""
+    inputs = model_inputs({name: np.array([value]) for name, value in row.items()}, 1)
+    frame = pd.DataFrame({name: inputs.get(name, [np.nan]) for name in booster.feature_name()})
+    for month in range(1, 13):
+        frame[f'Month_{month}'] = float(row['Month'] == month)
+    return float(np.expm1(booster.predict(frame[booster.feature_name()])[0]))
+
+
+def percentile_us(samples, q):
+    return np.percentile(samples, q) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=5000)
+    args = parser.parse_args()
+
+    train = dashboard_rows(50_000)
+    X, y = training_matrix(train)
+    booster = lightgbm.train({'objective': 'regression', 'num_leaves': 63, 'verbose': -1, 'seed': 42},
+                             lightgbm.Dataset(X, y), num_boost_round=300)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'delay_model.txt')
+        booster.save_model(path)
+
+        start = time.perf_counter()
+        delay_model = load_delay_model(path)
+        load_seconds = time.perf_counter() - start
+        assert delay_model.unbuildable == []
+
+        # Fallback: no artifact -> heuristic scores
+        assert load_delay_model(os.path.join(tmp, 'missing.txt')) is None
+        batch = dashboard_rows(args.batch, seed=7)
+        values, kind = predict_frame(None, batch)
+        assert kind == 'risk score' and np.array_equal(values, score_frame(batch))
+
+    rows = batch.head(args.calls).to_dict('records')
+    for row in rows[:50]:
+        assert np.isclose(delay_model.predict_one(row), naive_predict(delay_model.booster, row), rtol=1e-9)
+    minutes, kind = predict_frame(delay_model, batch)
+    assert kind == 'minutes' and np.isfinite(minutes).all()
+    print("parity OK: compiled and pandas paths agree; missing model falls back to the heuristic\n")
+
+    timings = {}
+    for name, call in (('pandas DataFrame + predict', lambda r: naive_predict(delay_model.booster, r)),
+                       ('predict_one', delay_model.predict_one)):
+        samples = []
+        for row in rows:
+            start = time.perf_counter()
+            call(row)
+            samples.append(time.perf_counter() - start)
+        timings[name] = samples
+
+    start = time.perf_counter()
+    predict_frame(delay_model, batch)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"model load: {load_seconds * 1000:.1f} ms ({len(delay_model.feature_names)} features)\n")
+    print(f"{'single row':<30}{'p50 us':>10}{'p99 us':>10}")
+    for name, samples in timings.items():
+        print(f"{name:<30}{percentile_us(samples, 50):>10.0f}{percentile_us(samples, 99):>10.0f}")
+    print(f"\npredict_frame: {args.batch:,} rows in {batch_seconds * 1000:.1f} ms "
+          f"({args.batch / batch_seconds:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Build time and query latency of the network risk cube over 2015-2025.
+
+Generates a daily weather table for 21 airports over 2015-01-01..2025-12-31
+(with a few missing days) and a synthetic schedule, builds the airport x
+date x hour cube, saves it and reopens it memory-mapped. Before timing it
+checks sampled cells against the mean per-flight heuristic of that
+airport-hour's scheduled flights, and that days without weather are NaN.
+
+The "rescore" row is what the dashboard would otherwise do for one day's
+view: one calculate_risk_score() call per airport and hour.
+
+Usage:
+    python benchmarks/bench_risk_cube.py --flights 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+
+from risk_cube import RiskCube, build_cube, save_cube  # noqa: E402
+from scoring import calculate_risk_score, calculate_risk_scores  # noqa: E402
+
+
+AIRPORTS = ['ABQ', 'AUS', 'BUR', 'DAL', 'ELP', 'HOU', 'HRL', 'LAX', 'LBB', 'MAF', 'OAK',
+            'OKC', 'ONT', 'PHX', 'SAN', 'SAT', 'SJC', 'SMF', 'SNA', 'TUL', 'TUS']
+
+
+def make_weather(start='2015-01-01', end='2025-12-31', seed=42):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq='D')
+    df = pd.DataFrame({
+        'airport': np.repeat(AIRPORTS, len(dates)),
+        'date': np.tile(dates.strftime('%Y-%m-%d'), len(AIRPORTS)),
+    })
+    n = len(df)
+    df['wspd'] = rng.gamma(2.0, 8.0, n)
+    df['prcp'] = np.where(rng.random(n) < 0.2, rng.exponential(6.0, n), 0.0)
+    df['snow'] = np.where(rng.random(n) < 0.02, rng.exponential(20.0, n), 0.0)
+    df['pres'] = rng.normal(1013, 6, n)
+    # Meteostat gaps: a few rows missing, a few with no observations at all
+    df.loc[rng.random(n) < 0.01, ['wspd', 'prcp', 'snow', 'pres']] = np.nan
+    return df[rng.random(n) > 0.005].reset_index(drop=True)
+
+
+def make_schedule(n_flights, seed=7):
+    rng = np.random.default_rng(seed)
+    hour = rng.choice(np.arange(5, 23), n_flights)
+    return pd.DataFrame({
+        'Origin': rng.choice(AIRPORTS, n_flights),
+        'CRSDepTime': hour * 100 + rng.choice(np.arange(0, 60, 5), n_flights),
+        'Distance': np.where(rng.random(n_flights) < 0.05, rng.integers(2001, 2600, n_flights),
+                             rng.integers(150, 2000, n_flights)).astype(np.float64),
+    })
+
+
+def check_cells(cube, weather, schedule, n_cells=200, seed=0):
+    rng = np.random.default_rng(seed)
+    table = weather.set_index(['airport', 'date'])
+    for _ in range(n_cells):
+        code = str(rng.choice(cube.airports))
+        date = cube.dates[rng.integers(len(cube.dates))]
+        hour = int(rng.integers(0, 24))
+        key = (code, str(date))
+        value = cube.value(code, date, hour)
+        if key not in table.index or table.loc[key, ['wspd', 'prcp', 'snow', 'pres']].isna().all():
+            assert np.isnan(value)
+            continue
+        w = table.loc[key]
+        flights = schedule[(schedule['Origin'] == code) & (schedule['CRSDepTime'] // 100 == hour)]
+        if len(flights):
+            expected = calculate_risk_scores(w['wspd'], w['prcp'], w['snow'], w['pres'],
+                                             flights['CRSDepTime'].to_numpy(), flights['Distance'].to_numpy()).mean()
+        else:
+            expected = calculate_risk_scores(w['wspd'], w['prcp'], w['snow'], w['pres'], hour * 100 + 30, 0.0)
+        assert np.isclose(value, expected, atol=1e-4), (code, date, hour, value, expected)
+    print(f"parity OK: {n_cells} sampled cells match the per-flight heuristic; missing days are NaN\n")
+
+
+def percentile_us(samples, q):
+    return np.percentile(samples, q) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--flights', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    weather = make_weather()
+    schedule = make_schedule(args.flights)
+
+    start = time.perf_counter()
+    cube_arrays = build_cube(weather, schedule)
+    build_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        save_cube(cube_arrays, tmp)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        cube = RiskCube(tmp)
+        open_seconds = time.perf_counter() - start
+
+        check_cells(cube, weather, schedule)
+
+        rng = np.random.default_rng(1)
+        dates = cube.dates[rng.integers(len(cube.dates), size=args.queries)]
+        codes = rng.choice(cube.airports, size=args.queries)
+        day_slice = f'day slice ({len(cube.airports)} x 24)'
+        timings = {day_slice: [], 'airport month (31 x 24)': [], 'single cell': []}
+        for date, code in zip(dates, codes):
+            for name, call in ((day_slice, lambda: cube.day(date)),
+                               ('airport month (31 x 24)', lambda: cube.airport(code, date, min(date + 30, cube.dates[-1]))),
+                               ('single cell', lambda: cube.value(code, date, 17))):
+                t0 = time.perf_counter()
+                call()
+                timings[name].append(time.perf_counter() - t0)
+
+        # One day's view by rescoring every airport-hour on its own
+        table = weather.assign(date=pd.to_datetime(weather['date'])).set_index(['airport', 'date'])
+        day = pd.Timestamp(cube.dates[len(cube.dates) // 2])
+        rows = {code: table.loc[(code, day)] for code in cube.airports if (code, day) in table.index}
+        samples = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            for code, w in rows.items():
+                for hour in range(24):
+                    calculate_risk_score(w, {'dep_time': hour * 100 + 30, 'distance': 0.0})
+            samples.append(time.perf_counter() - t0)
+        timings['rescore one day (per call)'] = samples
+
+        risk = cube_arrays['risk']
+        print(f"cube: {risk.shape[0]} airports x {risk.shape[1]:,} days x {risk.shape[2]} hours, "
+              f"{risk.nbytes / 1e6:.1f} MB float32 from {len(weather):,} weather rows, {args.flights:,} flights")
+        print(f"build {build_seconds:.2f}s, save {save_seconds * 1000:.0f} ms, open (mmap) {open_seconds * 1000:.1f} ms\n")
+        print(f"{'query':<30}{'p50 us':>10}{'p99 us':>10}")
+        for name, samples in timings.items():
+            print(f"{name:<30}{percentile_us(samples, 50):>10.1f}{percentile_us(samples, 99):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Rolling delay features: full recompute vs. appending one day to the saved state.
+
+The full recompute is what the notebook does every run: the windows over the
+whole history. The incremental path keeps the last 7 rows per route, origin
+and destination and only processes the new day. tests/test_rolling.py checks
+that day-by-day appends match a full recompute.
+
+Usage:
+    python benchmarks/bench_rolling.py --rows 2000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Modeling'))
+
+import rolling  # noqa: E402
+from synthetic import make_joined, split_days  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    df = make_joined(args.rows)
+    history, days = split_days(df, 1)
+    print(f"{len(history):,} history rows, appending a day of {len(days[0]):,} rows\n")
+
+    start = time.perf_counter()
+    rolling.rolling_features(df)
+    full = time.perf_counter() - start
+
+    _, state = rolling.append_rows(None, history)
+    start = time.perf_counter()
+    rolling.append_rows(state, days[0])
+    incremental = time.perf_counter() - start
+
+    print(f"{'path':<28}{'seconds':>10}")
+    print(f"{'full recompute':<28}{full:>10.3f}")
+    print(f"{'append one day':<28}{incremental:>10.3f}")
+    print(f"\nstate: {len(state):,} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Hit rate and latency of the dashboard's quantized score cache.
+
+Replays a skewed stream of calculator queries, where a few popular inputs
+are entered over and over, through score_cache.ScoreCache and compares it
+with scoring every query. Before timing it checks that cached scores equal
+fresh ones, that the size limit evicts least-recently-used entries and that
+entries expire after the TTL.
+
+Usage:
+    python benchmarks/bench_score_cache.py --queries 100000 --distinct 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+
+from score_cache import ScoreCache, cached_predict_row, cached_risk_score, quantize  # noqa: E402
+from scoring import calculate_risk_score  # noqa: E402
+
+
+def calculator_inputs(n_distinct, seed=42):
+    """Distinct (weather, flight) pairs as the calculator form produces them."""
+    rng = np.random.default_rng(seed)
+    # Form values: 0.1 mph, 0.01 in, 0.01 inHg, HHMM, whole miles
+    wspd = rng.integers(0, 600, n_distinct) / 10 / 0.621371
+    prcp = rng.integers(0, 150, n_distinct) / 100 / 0.03937
+    snow = np.where(rng.random(n_distinct) < 0.1, rng.integers(1, 80, n_distinct) / 100, 0.0) / 0.03937
+    pres = rng.integers(2900, 3080, n_distinct) / 100 / 0.02953
+    dep_time = rng.integers(5, 23, n_distinct) * 100 + rng.integers(0, 12, n_distinct) * 5
+    distance = rng.integers(150, 2500, n_distinct).astype(np.float64)
+    return [
+        ({'wspd': w, 'prcp': p, 'snow': s, 'pres': pr, 'tavg': 20.0}, {'dep_time': int(d), 'distance': dist})
+        for w, p, s, pr, d, dist in zip(wspd, prcp, snow, pres, dep_time, distance)
+    ]
+
+
+def check_behaviour(inputs):
+    # Inputs within a step share a key and still score like fresh calls
+    keys = {quantize(w['wspd'], w['prcp'], w['snow'], w['pres'], f['dep_time'], f['distance'])
+            for w, f in inputs}
+    cache = ScoreCache(max_size=len(inputs))
+    for weather, flight in inputs + inputs:
+        assert cached_risk_score(cache, weather, flight) == calculate_risk_score(weather, flight)
+    assert cache.misses == len(keys) and cache.evictions == 0
+
+    # Size limit: the least recently used key goes first
+    small = ScoreCache(max_size=2)
+    for key in ('a', 'b', 'a', 'c'):
+        small.get_or_compute(key, lambda: key)
+    assert small.evictions == 1 and small.stats()['size'] == 2
+    small.get_or_compute('b', lambda: 'recomputed')
+    assert small.misses == 4
+
+    # TTL: an entry is recomputed once it has expired
+    now = [0.0]
+    timed = ScoreCache(ttl=10, clock=lambda: now[0])
+    timed.get_or_compute('k', lambda: 1)
+    now[0] = 11.0
+    assert timed.get_or_compute('k', lambda: 2) == 2 and timed.expirations == 1
+
+    # Heuristic fallback of the viewer path
+    row = {'wspd': 45.0, 'prcp': 2.0, 'snow': 0.0, 'pres': 1001.0, 'CRSDepTime': 1930, 'Distance': 850.0}
+    assert cached_predict_row(ScoreCache(), None, row) == (70.0, 'risk score')
+    print("checks OK: cached == fresh, LRU eviction, TTL expiry, heuristic row fallback\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=100_000)
+    parser.add_argument('--distinct', type=int, default=5_000)
+    parser.add_argument('--max-size', type=int, default=1024)
+    args = parser.parse_args()
+
+    inputs = calculator_inputs(args.distinct)
+    check_behaviour(inputs[:500])
+
+    # Zipf-distributed popularity: a few queries dominate
+    rng = np.random.default_rng(0)
+    picks = (rng.zipf(1.3, args.queries) - 1) % len(inputs)
+    stream = [inputs[i] for i in picks]
+
+    start = time.perf_counter()
+    for weather, flight in stream:
+        calculate_risk_score(weather, flight)
+    uncached = time.perf_counter() - start
+
+    cache = ScoreCache(max_size=args.max_size)
+    start = time.perf_counter()
+    for weather, flight in stream:
+        cached_risk_score(cache, weather, flight)
+    cached = time.perf_counter() - start
+
+    print(f"{args.queries:,} queries over {args.distinct:,} distinct inputs, max size {args.max_size:,}\n")
+    print(f"{'path':<20}{'us/query':>10}")
+    print(f"{'uncached':<20}{uncached / args.queries * 1e6:>10.1f}")
+    print(f"{'cached':<20}{cached / args.queries * 1e6:>10.1f}\n")
+    for name, value in cache.stats().items():
+        print(f"{name:<12}{value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Rows/sec of the batch risk scorer against a per-row loop.
+
+Usage:
+    python benchmarks/bench_scoring.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+
+from scoring import calculate_risk_score, score_frame  # noqa: E402
+from synthetic import make_flights  # noqa: E402
+
+
+def legacy_risk_score(weather, flight_data):
+    """The original pure-Python if/elif heuristic, kept here as the reference."""
+    risk = 0.0
+    if weather['wspd'] > 40:
+        risk += 30
+    elif weather['wspd'] > 25:
+        risk += 15
+    if weather['prcp'] > 15:
+        risk += 35
+    elif weather['prcp'] > 0:
+        risk += 10
+    if weather['snow'] > 0:
+        risk += 40
+    if weather['pres'] < 1005:
+        risk += 25
+    elif weather['pres'] > 1020:
+        risk += 10
+    if flight_data['dep_time'] > 1800:
+        risk += 5
+    if flight_data['distance'] > 2000:
+        risk += 5
+    return max(0.0, min(100.0, risk))
+
+
+def _row_dicts(df):
+    weather = df[['wspd', 'prcp', 'snow', 'pres']].to_dict('records')
+    flights = [
+        {'dep_time': dep, 'distance': dist}
+        for dep, dist in zip(df['CRSDepTime'].tolist(), df['Distance'].tolist())
+    ]
+    return weather, flights
+
+
+def _rate(n_rows, seconds):
+    return n_rows / seconds if seconds > 0 else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--loop-rows', type=int, default=50_000,
+                        help='rows scored by the per-row loops (they are slow)')
+    args = parser.parse_args()
+
+    df = make_flights(args.rows)
+    loop_df = df.iloc[:args.loop_rows]
+    weather, flights = _row_dicts(loop_df)
+
+    start = time.perf_counter()
+    batch = score_frame(df)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_risk_score(w, f) for w, f in zip(weather, flights)]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wrapped = [calculate_risk_score(w, f) for w, f in zip(weather, flights)]
+    wrapped_s = time.perf_counter() - start
+
+    if not np.array_equal(batch[:len(legacy)], np.asarray(legacy)):
+        raise SystemExit('batch scores differ from the legacy scalar heuristic')
+    if not np.array_equal(np.asarray(wrapped), np.asarray(legacy)):
+        raise SystemExit('calculate_risk_score differs from the legacy scalar heuristic')
+
+    print(f"{'path':<32}{'rows':>12}{'seconds':>12}{'rows/sec':>16}")
+    print(f"{'score_frame (batch)':<32}{len(df):>12,}{batch_s:>12.4f}{_rate(len(df), batch_s):>16,.0f}")
+    print(f"{'legacy if/elif loop':<32}{len(loop_df):>12,}{legacy_s:>12.4f}{_rate(len(loop_df), legacy_s):>16,.0f}")
+    print(f"{'calculate_risk_score loop':<32}{len(loop_df):>12,}{wrapped_s:>12.4f}{_rate(len(loop_df), wrapped_s):>16,.0f}")
+    print(f"\nBatch speedup over legacy loop: {_rate(len(df), batch_s) / _rate(len(loop_df), legacy_s):,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
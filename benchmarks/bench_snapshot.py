@@ -0,0 +1,125 @@
+"""Time to the viewer's working set: sampling the CSV vs. mapping the snapshot.
+
+Writes a synthetic processed CSV, builds the snapshot from it and checks
+that the mapped frame, dropdown flights and routes equal what the app
+computes from the CSV. Each path is then timed in a fresh interpreter, the
+way a new server process pays for it:
+
+    csv       sample_flights() + Risk > 0 filter + viewer_flights() + route_options()
+    snapshot  load_snapshot() with the staleness check, then viewer_frame()
+
+The staleness rules are checked in tests/test_snapshot.py.
+
+Usage:
+    python benchmarks/bench_snapshot.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard')
+sys.path.insert(0, DASHBOARD_DIR)
+
+from flight_index import build_flight_index, route_options, viewer_flights  # noqa: E402
+from flight_store import sample_flights  # noqa: E402
+from snapshot import load_snapshot, snapshot_params, write_snapshot  # noqa: E402
+from synthetic import ORIGIN_IATA, write_flights_csv  # noqa: E402
+
+
+AIRPORT_NAMES = {code: f'{code} International ({code})' for code in ORIGIN_IATA}
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+start = time.perf_counter()
+{code}
+print(json.dumps({{'seconds': time.perf_counter() - start, 'rows': rows}}))
+"""
+
+CSV_CODE = """
+import pickle
+import numpy as np
+from flight_index import build_flight_index, route_options, viewer_flights
+from flight_store import sample_flights
+df = sample_flights({csv!r}, {store!r})
+df = df[df['weatherScore'] > 0]
+viewer_df, flights = viewer_flights(df, {years!r})
+with open({encoders!r}, 'rb') as file:
+    origin_classes = np.asarray(pickle.load(file)['Origin'].classes_, dtype='U3')
+routes = route_options(build_flight_index(viewer_df), flights, origin_classes, {names!r})
+rows = len(df)
+"""
+
+SNAPSHOT_CODE = """
+from snapshot import load_snapshot, snapshot_params
+snapshot = load_snapshot({out!r}, {csv!r}, snapshot_params())
+viewer_df, flights, routes = snapshot.viewer_frame(), snapshot.flights, snapshot.routes
+rows = len(snapshot.frame)
+"""
+
+
+def run_child(code):
+    source = CHILD.format(dashboard_dir=os.path.abspath(DASHBOARD_DIR), code=code)
+    out = subprocess.run([sys.executable, '-c', source], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_equal(csv_path, store_dir, out, encoders):
+    params = snapshot_params()
+    df = sample_flights(csv_path, store_dir)
+    df = df[df['weatherScore'] > 0].reset_index(drop=True)
+    viewer_df, flights = viewer_flights(df, params['excluded_years'])
+    with open(encoders, 'rb') as file:
+        origin_classes = pickle.load(file)['Origin'].classes_
+    routes = route_options(build_flight_index(viewer_df), flights, origin_classes, AIRPORT_NAMES)
+
+    snapshot = load_snapshot(out, csv_path, params)
+    assert snapshot is not None, 'fresh snapshot did not load'
+    # copy() turns the memory-mapped columns into plain arrays; pandas 3 rejects memmap vs ndarray
+    pd.testing.assert_frame_equal(snapshot.frame.copy(), df)
+    pd.testing.assert_frame_equal(snapshot.viewer_frame().reset_index(drop=True).copy(),
+                                  viewer_df.reset_index(drop=True))
+    assert snapshot.flights == flights
+    assert snapshot.routes == routes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='synthetic rows in the processed CSV')
+    parser.add_argument('--encoders', default=os.path.join(DASHBOARD_DIR, 'label_encoders.pkl'))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'flights.csv.gz')
+        store_dir = os.path.join(tmp, 'no_store')
+        out = os.path.join(tmp, 'snapshot')
+        print(f"Writing {args.rows:,} synthetic rows to {csv_path} ...")
+        write_flights_csv(csv_path, args.rows)
+
+        start = time.perf_counter()
+        manifest = write_snapshot(csv_path, store_dir, out, encoders_path=args.encoders, airport_names=AIRPORT_NAMES)
+        print(f"Built snapshot of {manifest['rows']:,} rows in {time.perf_counter() - start:.1f}s\n")
+        check_equal(csv_path, store_dir, out, args.encoders)
+
+        fmt = {'csv': csv_path, 'store': store_dir, 'out': out, 'encoders': args.encoders,
+               'years': snapshot_params()['excluded_years'], 'names': AIRPORT_NAMES}
+        results = {
+            'CSV sample + index': run_child(CSV_CODE.format(**fmt)),
+            'mapped snapshot': run_child(SNAPSHOT_CODE.format(**fmt)),
+        }
+
+    print(f"{'path':<24}{'rows':>8}{'seconds':>12}")
+    for name, r in results.items():
+        print(f"{name:<24}{r['rows']:>8,}{r['seconds']:>12.4f}")
+    print("\nSnapshot matches the CSV path")
+
+
+if __name__ == '__main__':
+    main()
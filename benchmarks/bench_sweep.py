@@ -0,0 +1,70 @@
+"""What-if sweep time: one broadcast call against per-point calculate_risk_score().
+
+Sweeps wind 0-60 mph x precipitation 0-3 in at a fixed departure time and
+distance, checks sampled grid points against calculate_risk_score() and
+times the sweep, the plot downsampling and the CSV export. The per-point
+time is measured on --sample points and scaled up to the full grid.
+
+Usage:
+    python benchmarks/bench_sweep.py --steps 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard'))
+
+from scoring import calculate_risk_score  # noqa: E402
+from sweep import axis_values, display_grid, sweep_csv, sweep_scores, to_metric  # noqa: E402
+
+
+FIXED = {'snow': 0.0, 'pres': 29.7, 'dep_time': 1930.0, 'distance': 250.0}
+
+
+def point_score(wspd, prcp):
+    weather = {'wspd': float(to_metric('wspd', wspd)), 'prcp': float(to_metric('prcp', prcp)),
+               'snow': float(to_metric('snow', FIXED['snow'])), 'pres': float(to_metric('pres', FIXED['pres']))}
+    return calculate_risk_score(weather, {'dep_time': FIXED['dep_time'], 'distance': FIXED['distance']})
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--steps', type=int, default=1000, help='grid steps per axis')
+    parser.add_argument('--sample', type=int, default=20000, help='points scored one by one')
+    args = parser.parse_args()
+
+    x_values = axis_values('wspd', 0, 60, args.steps)
+    y_values = axis_values('prcp', 0, 3, args.steps)
+    scores, sweep_seconds = timed(sweep_scores, 'wspd', x_values, 'prcp', y_values, FIXED)
+    assert scores.shape == (len(y_values), len(x_values))
+
+    rng = np.random.default_rng(0)
+    rows = rng.integers(0, len(y_values), args.sample)
+    cols = rng.integers(0, len(x_values), args.sample)
+    start = time.perf_counter()
+    expected = [point_score(x_values[c], y_values[r]) for r, c in zip(rows, cols)]
+    per_point = (time.perf_counter() - start) / args.sample
+    assert np.array_equal(scores[rows, cols], expected), 'sweep disagrees with calculate_risk_score'
+
+    shown, display_seconds = timed(display_grid, x_values, y_values, scores)
+    csv, csv_seconds = timed(sweep_csv, 'wspd', x_values, 'prcp', y_values, scores)
+
+    print(f"{scores.size:,} points ({args.steps} x {args.steps}), {args.sample:,} checked against calculate_risk_score\n")
+    print(f"{'step':<34}{'seconds':>10}")
+    print(f"{'sweep_scores (one call)':<34}{sweep_seconds:>10.3f}")
+    print(f"{'calculate_risk_score per point':<34}{per_point * scores.size:>10.1f}  (scaled from the sample)")
+    print(f"{'display_grid':<34}{display_seconds:>10.4f}  -> {shown[2].shape[0]} x {shown[2].shape[1]} cells")
+    print(f"{'sweep_csv':<34}{csv_seconds:>10.2f}  -> {len(csv) / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
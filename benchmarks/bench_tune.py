@@ -0,0 +1,91 @@
+"""Wall-clock speedup of Modeling/tune.py over the notebook's serial Optuna loop.
+
+Builds the tuning split from synthetic joined rows (FlightDate spans
+2015-2025, so the notebook's train/valid cut applies), then runs the same
+trial budget twice: the notebook's loop (one process, every thread per fit,
+early stopping only) and tune.py's worker processes on a shared journal
+file with pruning. It then interrupts a parallel run partway, resumes it and
+checks that the study ends with exactly the budget of finished trials.
+
+Usage:
+    python benchmarks/bench_tune.py --rows 200000 --trials 24 --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import optuna
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Modeling'))
+
+import tune  # noqa: E402
+from synthetic import make_joined  # noqa: E402
+
+
+def count_states(study):
+    return {state.name.lower(): len(study.get_trials(deepcopy=False, states=(state,)))
+            for state in (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED,
+                          optuna.trial.TrialState.FAIL)}
+
+
+def check_resume(split_dir, tmp, n_trials, workers, pruner, cache_dir):
+    """Kills a worker mid-study after its first finished trial, then resumes the study."""
+    storage = os.path.join(tmp, 'resume.journal')
+    study = tune.open_study(tune.make_storage(storage), 'resume', pruner)
+    worker = multiprocessing.get_context('spawn').Process(
+        target=tune.run_worker, args=(storage, 'resume', split_dir, n_trials, 1, pruner, 0, cache_dir))
+    worker.start()
+    while worker.is_alive() and tune.finished_trials(study) < 1:
+        time.sleep(0.2)
+    worker.kill()
+    worker.join()
+    before = tune.finished_trials(study)
+
+    resumed = tune.tune(split_dir, storage, 'resume', n_trials, workers, pruner, cache_dir=cache_dir)
+    after = tune.finished_trials(resumed)
+    assert before < n_trials == after, (before, after)
+    print(f"resume OK: killed after {before} finished trials, resumed to {after} (budget {n_trials})\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--trials', type=int, default=24)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--pruner', choices=['median', 'halving'], default='median')
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    split = tune.make_split(make_joined(args.rows), sample_rows=args.rows)
+    print(f"split: {len(split['y_train']):,} train / {len(split['y_valid']):,} valid rows, "
+          f"{len(split['feature_names'])} features, {os.cpu_count()} CPUs\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        split_dir = os.path.join(tmp, 'split')
+        cache_dir = os.path.join(tmp, 'lgb_cache')
+        tune.save_split(split, split_dir)
+        check_resume(split_dir, tmp, min(args.trials, 2 * args.workers), args.workers, args.pruner, cache_dir)
+
+        start = time.perf_counter()
+        serial = tune.tune_serial(tune.load_split(split_dir), args.trials)
+        serial_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = tune.tune(split_dir, os.path.join(tmp, 'bench.journal'), 'bench', args.trials,
+                             args.workers, args.pruner, cache_dir=cache_dir)
+        parallel_seconds = time.perf_counter() - start
+        assert tune.finished_trials(parallel) == args.trials, count_states(parallel)
+
+        # The parallel study lives in the journal file, so read it before tmp is removed
+        print(f"{'run':<36}{'seconds':>9}{'best MAE':>10}  trials")
+        print(f"{'notebook (serial, early stopping)':<36}{serial_seconds:>9.1f}{serial.best_value:>10.3f}  "
+              f"{count_states(serial)}")
+        print(f"{f'tune.py ({args.workers} workers, {args.pruner})':<36}{parallel_seconds:>9.1f}"
+              f"{parallel.best_value:>10.3f}  {count_states(parallel)}")
+    print(f"\nspeedup: {serial_seconds / parallel_seconds:.2f}x for {args.trials} trials")
+
+if __name__ == '__main__':
+    main()
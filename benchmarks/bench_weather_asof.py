@@ -0,0 +1,75 @@
+"""Throughput of the hourly as-of weather join in Data/weather_join.py.
+
+The daily join gives every flight of a day the same wspd/prcp. With
+--hourly, each flight gets the latest hourly observation at or before its
+scheduled departure (and arrival) instead. This times HourlyIndex.lookup
+against Polars' join_asof (by airport, backward, same tolerance) over a
+decade of hourly rows, and the whole join with and without --hourly
+--arrivals. tests/test_weather_asof.py checks a hand-built fixture and
+parity with join_asof.
+
+Usage:
+    python benchmarks/bench_weather_asof.py --lookups 1000000 10000000 --rows 1200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+
+import weather_ingest  # noqa: E402
+import weather_join  # noqa: E402
+from bench_weather_join import make_flights_zip, make_weather  # noqa: E402
+from synthetic import make_hourly, make_lookups, polars_asof  # noqa: E402
+
+
+def timed(call):
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lookups', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--rows', type=int, default=1_200_000, help='flights in the end-to-end join')
+    args = parser.parse_args()
+    tolerance = weather_join.TOLERANCE_MINUTES
+
+    hourly = make_hourly()
+    index_seconds, observations = timed(lambda: weather_join.local_observations(hourly))
+    build_seconds, index = timed(lambda: weather_join.HourlyIndex(observations))
+
+    print(f"{len(observations):,} hourly rows: local time {index_seconds:.2f}s, index {build_seconds:.2f}s\n")
+    print(f"{'lookups':>12}{'searchsorted s':>16}{'rows/s':>14}{'join_asof s':>14}{'rows/s':>14}")
+    for n in args.lookups:
+        airports, dates, clock = make_lookups(n)
+        minutes = weather_join._local_minutes(dates, clock)
+        ours, _ = timed(lambda: index.lookup(airports, minutes, tolerance))
+        theirs, _ = timed(lambda: polars_asof(observations, airports, minutes, tolerance))
+        print(f"{n:>12,}{ours:>16.2f}{n / ours:>14,.0f}{theirs:>14.2f}{n / theirs:>14,.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, 'meteostat_hourly')
+        for (airport, year), rows in hourly.groupby(['airport', hourly['date'].dt.year]):
+            weather_ingest.write_partition(store, airport, year, rows, datetime.now())
+        weather_path, zip_path = os.path.join(tmp, 'weather.csv'), os.path.join(tmp, 'flights.zip')
+        make_weather(weather_path)
+        make_flights_zip(zip_path, args.rows)
+
+        daily, _ = timed(lambda: weather_join.join(zip_path, weather_path, os.path.join(tmp, 'daily')))
+        both, _ = timed(lambda: weather_join.join(zip_path, weather_path, os.path.join(tmp, 'hourly'),
+                                                  hourly=store, arrivals=True))
+        joined = weather_join.read_joined(os.path.join(tmp, 'hourly'), columns=['dep_wspd', 'arr_wspd'])
+    print(f"\nend-to-end, {args.rows:,} flights ({len(joined):,} joined)")
+    print(f"{'daily join':<34}{daily:>8.1f}s")
+    print(f"{'daily + hourly dep/arr as-of':<34}{both:>8.1f}s")
+    print(f"dep_wspd filled {joined['dep_wspd'].notna().mean():.1%}, arr_wspd {joined['arr_wspd'].notna().mean():.1%} "
+          f"(Dest outside the SW airports has no observations)")
+
+
+if __name__ == '__main__':
+    main()
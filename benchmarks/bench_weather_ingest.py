@@ -0,0 +1,131 @@
+"""Offline check of Data/weather_ingest.py with a fake Meteostat backend.
+
+The fake returns a year of hourly rows per call after a fixed simulated
+network latency and counts its calls. Runs, all with a pinned clock:
+  1. cold store (Jan 5)        -> every (airport, year) is fetched
+  2. same day                  -> nothing is fetched
+  3. next day                  -> this year and last year (still settling) are refetched
+  4. after the settle window   -> both again; last year now counts as settled
+  5. later that day            -> nothing is fetched
+  6. two days later            -> only this year is refetched
+The cold run is what the notebook does on every refresh (refetch every
+year). Finally the cached store is read back and checked against a fresh
+fetch of the settled years.
+
+Usage:
+    python benchmarks/bench_weather_ingest.py --workers 4 8 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+
+import weather_ingest  # noqa: E402
+
+
+class FakeMeteostat:
+    """Deterministic hourly observations; the values depend on the fetch generation."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = []
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, airport, lat, lon, start, end):
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((airport, start.year))
+        dates = pd.date_range(start, end, freq='h')
+        seed = abs(hash((airport, start.year, self.generation))) % 2 ** 32
+        rng = np.random.default_rng(seed)
+        n = len(dates)
+        df = pd.DataFrame({
+            'date': dates,
+            'temp': rng.normal(20, 8, n).round(1),
+            'prcp': np.where(rng.random(n) < 0.9, 0.0, rng.exponential(2, n).round(1)),
+            'wspd': rng.gamma(2, 6, n).round(1),
+            'pres': rng.normal(1013, 6, n).round(1),
+            # Meteostat leaves whole columns empty for some stations
+            'snow': np.full(n, np.nan) if airport in ('HOU', 'LAX') else rng.random(n).round(1),
+        })
+        if airport == 'HRL' and start.year == 2016:
+            return df.iloc[:0]
+        return df
+
+
+def run(store, fake, now, workers, **kwargs):
+    start = time.perf_counter()
+    before = len(fake.calls)
+    results = weather_ingest.ingest(store, weather_ingest.SWA_AIRPORTS, 2015, fetch=fake,
+                                    max_workers=workers, pause=0, now=now, **kwargs)
+    assert not any(r['error'] for r in results), results
+    return len(fake.calls) - before, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[4, 8])
+    parser.add_argument('--latency', type=float, default=0.05, help='simulated seconds per fetch')
+    args = parser.parse_args()
+
+    day = datetime(2025, 1, 5, 6, 0)
+    n_years = day.year - 2015 + 1
+    n_airports = len(weather_ingest.SWA_AIRPORTS)
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as store:
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w')
+            try:
+                fake = FakeMeteostat(args.latency)
+                cold = run(store, fake, day, workers)
+                same_day = run(store, fake, day + timedelta(hours=3), workers)
+                fake.generation += 1
+                next_day = run(store, fake, day + timedelta(days=1), workers)
+                settled = run(store, fake, datetime(2025, 2, 1), workers)
+                again = run(store, fake, datetime(2025, 2, 1, 12), workers)
+                later = run(store, fake, datetime(2025, 2, 3), workers)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+
+            assert cold[0] == n_airports * n_years
+            assert same_day[0] == 0
+            assert next_day[0] == 2 * n_airports              # 2025 + 2024 (fetched before it settled)
+            assert settled[0] == 2 * n_airports               # 2025 + 2024, first time after settling
+            assert again[0] == 0                              # 2025 is only 12h old
+            assert later[0] == n_airports                     # 2024 is settled for good
+
+            cached = weather_ingest.read_weather(store)
+            expected = pd.concat(
+                [FakeMeteostat(0)(a, *weather_ingest.SWA_AIRPORTS[a], datetime(y, 1, 1), datetime(y, 12, 31, 23, 59))
+                 .assign(airport=a, year=y)
+                 for a in weather_ingest.SWA_AIRPORTS for y in range(2015, 2024)],
+                ignore_index=True,
+            )
+            got = cached[cached['year'] < 2024].astype({'airport': str, 'year': 'int64'})
+            key = ['airport', 'date']
+            got = got.sort_values(key).reset_index(drop=True)[expected.columns]
+            expected = expected.sort_values(key).reset_index(drop=True)
+            pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+            print(f"workers={workers}")
+            print(f"  cold        {cold[0]:>4} fetches {cold[1]:6.2f}s   (= every refresh without the cache)")
+            print(f"  same day    {same_day[0]:>4} fetches {same_day[1]:6.2f}s")
+            print(f"  next day    {next_day[0]:>4} fetches {next_day[1]:6.2f}s")
+            print(f"  settled     {settled[0]:>4} fetches {settled[1]:6.2f}s")
+            print(f"  2 days on   {later[0]:>4} fetches {later[1]:6.2f}s")
+            print(f"  cached rows {len(cached):,}; 2015-2023 match a fresh fetch")
+
+
+if __name__ == '__main__':
+    main()
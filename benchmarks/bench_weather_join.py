@@ -0,0 +1,160 @@
+"""Peak memory and output of Data/weather_join.py against the notebook's join.
+
+Builds a zipped BTS-shaped flights CSV (2015-2025, the SW airports plus
+others that have no weather) and a daily weather table, then joins them
+both ways, each in a fresh process:
+  * notebook: z.read() into BytesIO, pl.scan_csv, join, sink_csv
+  * streaming: weather_join.join() into Year/Month Parquet partitions
+Memory is the peak of the sampled anonymous resident memory (RssAnon):
+Polars memory-maps CSV inputs, so peak RSS would also count page cache of
+the file being read. Checks that both produce the same rows and that a
+one-month read returns just that month. Run at several archive sizes to see
+whether peak memory grows with the archive.
+
+Usage:
+    python benchmarks/bench_weather_join.py --rows 300000 1200000 4800000
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+
+import bts_download  # noqa: E402
+import weather_join  # noqa: E402
+from synthetic import OTHER_AIRPORTS  # noqa: E402
+
+
+SW_AIRPORTS = sorted(bts_download.SOUTHWEST_STATE_AIRPORTS)
+
+
+def make_weather(path, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2015-01-01', '2025-12-31', freq='D')
+    n = len(dates) * len(SW_AIRPORTS)
+    pd.DataFrame({
+        'airport': np.repeat(SW_AIRPORTS, len(dates)),
+        'date': np.tile(dates.strftime('%Y-%m-%d'), len(SW_AIRPORTS)),
+        'tavg': rng.normal(20, 8, n).round(1), 'tmin': rng.normal(12, 8, n).round(1),
+        'tmax': rng.normal(28, 8, n).round(1), 'prcp': rng.exponential(1.0, n).round(1),
+        'snow': np.zeros(n), 'wdir': rng.integers(0, 360, n), 'wspd': rng.gamma(2.0, 8.0, n).round(1),
+        'wpgt': np.full(n, np.nan), 'pres': rng.normal(1013, 6, n).round(1), 'tsun': np.full(n, np.nan),
+    }).to_csv(path, index=False)
+
+
+def make_flights_zip(path, n_rows, seed=1, chunk=500_000):
+    """Zipped BTS-like CSV written in chunks, so the fixture itself stays small in memory."""
+    rng = np.random.default_rng(seed)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z, z.open('combined_data.csv', 'w') as out:
+        for start in range(0, n_rows, chunk):
+            n = min(chunk, n_rows - start)
+            day = np.sort(rng.integers(0, 4018, n))
+            date = pd.Timestamp('2015-01-01') + pd.to_timedelta(day, unit='D')
+            frame = pd.DataFrame({
+                'Year': date.year, 'Month': date.month, 'DayofMonth': date.day, 'DayOfWeek': date.dayofweek + 1,
+                'FlightDate': date.strftime('%Y-%m-%d'), 'Reporting_Airline': 'WN',
+                'Flight_Number_Reporting_Airline': rng.integers(1, 9999, n),
+                'Origin': rng.choice(SW_AIRPORTS + OTHER_AIRPORTS, n),
+                'Dest': rng.choice(SW_AIRPORTS + OTHER_AIRPORTS, n),
+                'CRSDepTime': rng.integers(5, 23, n) * 100, 'CRSArrTime': rng.integers(6, 24, n) * 100 % 2400,
+                'DepDelayMinutes': rng.exponential(10, n).round(), 'Distance': rng.integers(150, 2500, n),
+                'Cancelled': (rng.random(n) < 0.01).astype(float),
+            })
+            out.write(frame.to_csv(index=False, header=start == 0).encode())
+
+
+def _rss_anon_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def peak_anon_mb(func, *args):
+    """Runs func(*args) while sampling RssAnon; returns (peak MB, seconds)."""
+    peak, done = [_rss_anon_mb()], threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], _rss_anon_mb())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        func(*args)
+    finally:
+        done.set()
+        sampler.join()
+    return max(peak[0], _rss_anon_mb()), time.perf_counter() - start
+
+
+def _notebook_join(zip_path, weather_path, out_path):
+    with zipfile.ZipFile(zip_path) as z:
+        csv_name = next(name for name in z.namelist() if name.endswith('.csv'))
+        flights = pl.scan_csv(io.BytesIO(z.read(csv_name)), low_memory=True)
+    weather = pl.scan_csv(weather_path, low_memory=True)
+    flights.join(weather, how='inner', left_on=['Origin', 'FlightDate'], right_on=['airport', 'date']) \
+        .sink_csv(out_path)
+
+
+def notebook_join(zip_path, weather_path, out_path):
+    return peak_anon_mb(_notebook_join, zip_path, weather_path, out_path)
+
+
+def streaming_join(zip_path, weather_path, out_dir):
+    return peak_anon_mb(weather_join.join, zip_path, weather_path, out_dir)
+
+
+def in_fresh_process(func, *args):
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(func, *args).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[300_000, 1_200_000, 4_800_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'zip MB':>9}{'joined':>11}{'seconds':>9}{'anon MB':>9}{'notebook anon MB':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        weather_path = os.path.join(tmp, 'weather.csv')
+        make_weather(weather_path)
+        for n_rows in args.rows:
+            zip_path = os.path.join(tmp, f'flights_{n_rows}.zip')
+            make_flights_zip(zip_path, n_rows)
+            out_dir = os.path.join(tmp, f'joined_{n_rows}')
+            csv_path = os.path.join(tmp, f'joined_{n_rows}.csv')
+
+            peak_mb, seconds = in_fresh_process(streaming_join, zip_path, weather_path, out_dir)
+            notebook_mb, _ = in_fresh_process(notebook_join, zip_path, weather_path, csv_path)
+
+            joined = weather_join.read_joined(out_dir)
+            expected = pd.read_csv(csv_path)
+            assert len(joined) == len(expected)
+            key = ['FlightDate', 'Origin', 'Flight_Number_Reporting_Airline', 'CRSDepTime']
+            assert (joined[key].astype(str).sort_values(key).to_numpy()
+                    == expected[key].astype(str).sort_values(key).to_numpy()).all()
+            month = weather_join.read_joined(out_dir, years=[2019], months=[3])
+            assert len(month) == (expected['FlightDate'].str.startswith('2019-03')).sum()
+
+            print(f"{n_rows:>10,}{os.path.getsize(zip_path) / 1e6:>9.1f}{len(joined):>11,}{seconds:>9.1f}"
+                  f"{peak_mb:>9.0f}{notebook_mb:>18.0f}")
+    print("\nparity OK: same joined rows as the notebook; a month read returns just that month")
+
+
+if __name__ == '__main__':
+    main()
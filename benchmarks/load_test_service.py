@@ -0,0 +1,115 @@
+"""Load test for the scoring service: p50/p99 latency and throughput per batch size.
+
+Point it at a running service, e.g. a multi-worker one:
+    gunicorn --workers 4 --bind 127.0.0.1:8000 --chdir Dashboard service:app
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8000
+
+Without --url it starts the stdlib development server on a free port.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from synthetic import make_flights
+
+
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dashboard', 'service.py')
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"service at {url} did not come up")
+
+
+def _payloads(batch_size, n_requests, explain):
+    df = make_flights(batch_size * min(n_requests, 20))
+    flights = [
+        {'wspd': w, 'prcp': p, 'snow': s, 'pres': pr, 'dep_time': d, 'distance': dist, 'tavg': t}
+        for w, p, s, pr, d, dist, t in zip(
+            df['wspd'].tolist(), df['prcp'].tolist(), df['snow'].tolist(), df['pres'].tolist(),
+            df['CRSDepTime'].tolist(), df['Distance'].tolist(), df['tavg'].tolist(),
+        )
+    ]
+    bodies = [
+        json.dumps({'flights': flights[i:i + batch_size], 'explain': explain}).encode('utf-8')
+        for i in range(0, len(flights), batch_size)
+    ]
+    return [bodies[i % len(bodies)] for i in range(n_requests)]
+
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_level(url, batch_size, n_requests, concurrency, explain):
+    bodies = _payloads(batch_size, n_requests, explain)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(lambda body: _post(f"{url}/score/batch", body), bodies)))
+    wall = time.perf_counter() - start
+    return {
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'requests_per_s': n_requests / wall,
+        'flights_per_s': n_requests * batch_size / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='base URL of a running service')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--requests', type=int, default=200, help='requests per batch size')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--no-explain', action='store_true', help='skip factor explanations')
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen([sys.executable, SERVICE_PATH, '--port', str(port)], stdout=subprocess.DEVNULL)
+    url = url.rstrip('/')
+
+    try:
+        _wait_until_up(url)
+        print(f"{url}  concurrency={args.concurrency}  requests/level={args.requests}  explain={not args.no_explain}\n")
+        print(f"{'batch':>8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'flights/s':>14}")
+        for batch_size in args.batch_sizes:
+            r = run_level(url, batch_size, args.requests, args.concurrency, not args.no_explain)
+            print(f"{batch_size:>8}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+                  f"{r['requests_per_s']:>10.0f}{r['flights_per_s']:>14,.0f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""Timing suite for the dashboard and data pipeline hot paths, with stored baselines.
+
+Each case times one hot path on synthetic data of a given size (10k, 1M and
+10M rows by default):
+
+    load_data.csv        stratified 5000-row sample streamed from the gzip CSV, compacted
+    load_data.store      the same sample from the partitioned Parquet store
+    route_index          the landing page's dropdown flights, flight index and route options
+    risk_score.call      10,000 calculate_risk_score() calls (per-rerun calculator path)
+    risk_score.frame     score_frame() over every row
+    ingest.flight_store  building the Parquet flight store from the gzip CSV
+    join.weather         weather_join.join() of a zipped BTS-shaped CSV with daily weather
+
+Fixtures are generated once per size and kept in --data-dir, so later runs
+only pay for the timings. A case is run until --repeat samples or --budget
+seconds, whichever comes first, and short calls are looped so a sample is
+at least 0.2s. The best sample is compared with the last recorded one in
+baselines.json: slower by more than --threshold shows as REGRESSED, and
+--check turns that into a non-zero exit. --save records each result as
+the new baseline as soon as it is measured; cases and sizes not run keep
+their old numbers. Baselines only compare on the machine that recorded
+them; the suite warns when the machine differs.
+
+Usage:
+    python benchmarks/suite.py                                  # every case at 10k, 1M and 10M rows
+    python benchmarks/suite.py --sizes 10000 1000000 --check    # exit 1 on a regression
+    python benchmarks/suite.py --cases load_data route_index --save
+"""
+import argparse
+import datetime
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'Dashboard'))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'Data'))
+
+import weather_join  # noqa: E402
+from flight_index import build_flight_index, pick_dropdown_flights, route_options  # noqa: E402
+from flight_schema import compact_frame  # noqa: E402
+from flight_store import build_store, iter_csv, iter_store  # noqa: E402
+from sampling import stratified_reservoir_sample  # noqa: E402
+from scoring import calculate_risk_score, score_frame  # noqa: E402
+from bench_weather_join import make_flights_zip, make_weather  # noqa: E402
+from synthetic import N_DESTS, ORIGIN_IATA, write_flights_csv  # noqa: E402
+
+
+SIZES = (10_000, 1_000_000, 10_000_000)
+DEFAULT_BASELINES = os.path.join(BENCH_DIR, 'baselines.json')
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'swa_bench_suite')
+MIN_SAMPLE_SECONDS = 0.2
+SAMPLE_SIZE = 5000   # app.SAMPLE_SIZE
+
+CASES = {}
+
+
+def case(name, sizes=SIZES):
+    """Registers `setup(data) -> run` as case `name`; run() is what gets timed."""
+    def register(setup):
+        CASES[name] = (setup, tuple(sizes))
+        return setup
+    return register
+
+
+# ==========================================
+# FIXTURES
+# ==========================================
+class Data:
+    """Synthetic inputs for one size, generated on first use and kept on disk."""
+
+    def __init__(self, root, n_rows):
+        self.root = root
+        self.n_rows = n_rows
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.root, f'{name}_{self.n_rows}')
+
+    def _cached(self, path, build):
+        # Built under a temporary name so an interrupted run is rebuilt next time
+        if not os.path.exists(path):
+            tmp = f'{path}.partial'
+            build(tmp)
+            os.replace(tmp, path)
+        return path
+
+    def csv(self):
+        """The processed-schema flights as a gzip CSV."""
+        return self._cached(self._path('flights') + '.csv.gz',
+                            lambda tmp: write_flights_csv(tmp, self.n_rows))
+
+    def parquet(self):
+        return self._cached(self._path('flights') + '.parquet', self._write_parquet)
+
+    def _write_parquet(self, tmp):
+        reader = pcsv.open_csv(self.csv())
+        with pq.ParquetWriter(tmp, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+
+    def frame(self, columns):
+        return pd.read_parquet(self.parquet(), columns=columns)
+
+    def store(self):
+        """The partitioned Parquet flight store built from csv()."""
+        return self._cached(self._path('flight_store'), lambda tmp: build_store(self.csv(), tmp))
+
+    def flights_zip(self):
+        """Zipped BTS-shaped flights for the weather join."""
+        return self._cached(self._path('bts') + '.zip', lambda tmp: make_flights_zip(tmp, self.n_rows))
+
+    def weather_csv(self):
+        return self._cached(os.path.join(self.root, 'weather.csv'), make_weather)
+
+    def scratch(self, name):
+        return os.path.join(self.root, 'scratch', f'{name}_{self.n_rows}')
+
+
+# ==========================================
+# CASES
+# ==========================================
+@case('load_data.csv')
+def load_data_csv(data):
+    path = data.csv()
+    return lambda: compact_frame(stratified_reservoir_sample(iter_csv(path), 'weatherScore', total=SAMPLE_SIZE))
+
+
+@case('load_data.store')
+def load_data_store(data):
+    path = data.store()
+    return lambda: compact_frame(stratified_reservoir_sample(iter_store(path), 'weatherScore', total=SAMPLE_SIZE))
+
+
+# The whole table rather than the app's 5000-row sample, so the cost per row
+# shows; 10M rows would hold millions of index groups in memory
+@case('route_index', sizes=(10_000, 1_000_000))
+def route_index(data):
+    df = data.frame(['Flight_Number_Reporting_Airline', 'Origin', 'Dest', 'weatherScore'])
+    origin_classes = np.concatenate([ORIGIN_IATA, [f'D{i:02d}' for i in range(N_DESTS)]])
+    airport_names = {code: f'{code} International' for code in ORIGIN_IATA}
+
+    def run():
+        flights = pick_dropdown_flights(df)
+        return route_options(build_flight_index(df), flights, origin_classes, airport_names)
+    return run
+
+
+@case('risk_score.call', sizes=(10_000,))
+def risk_score_call(data):
+    df = data.frame(['wspd', 'prcp', 'snow', 'pres', 'CRSDepTime', 'Distance'])
+    rows = [({'wspd': r.wspd, 'prcp': r.prcp, 'snow': r.snow, 'pres': r.pres},
+             {'dep_time': r.CRSDepTime, 'distance': r.Distance}) for r in df.itertuples(index=False)]
+
+    def run():
+        for weather, flight in rows:
+            calculate_risk_score(weather, flight)
+    return run
+
+
+@case('risk_score.frame')
+def risk_score_frame(data):
+    df = data.frame(['wspd', 'prcp', 'snow', 'pres', 'CRSDepTime', 'Distance'])
+    return lambda: score_frame(df)
+
+
+@case('ingest.flight_store')
+def ingest_flight_store(data):
+    path, out = data.csv(), data.scratch('flight_store')
+    return lambda: build_store(path, out)
+
+
+@case('join.weather')
+def join_weather(data):
+    flights, weather, out = data.flights_zip(), data.weather_csv(), data.scratch('joined')
+    return lambda: weather_join.join(flights, weather, out)
+
+
+# ==========================================
+# TIMING
+# ==========================================
+def measure(run, repeat, budget):
+    """Seconds per call of run(): (best, median, samples), looping short calls to MIN_SAMPLE_SECONDS."""
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    first = time.perf_counter() - start
+    number = max(1, math.ceil(MIN_SAMPLE_SECONDS / max(first, 1e-9))) if first < MIN_SAMPLE_SECONDS else 1
+
+    samples, spent = [], first
+    while len(samples) < repeat and (not samples or spent < budget):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number)
+        spent += elapsed
+    return min(samples), statistics.median(samples), len(samples)
+
+
+def machine_info():
+    return {'node': platform.node(), 'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'python': platform.python_version()}
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                             text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ==========================================
+# BASELINES
+# ==========================================
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {'machine': None, 'results': {}}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_baselines(path, baselines, results, revision=None):
+    """Merges results into the file; cases and sizes not in `results` keep their old numbers."""
+    recorded = datetime.datetime.now().isoformat(timespec='seconds')
+    for (name, n_rows), (best, median, samples) in results.items():
+        baselines['results'].setdefault(name, {})[str(n_rows)] = {
+            'best': best, 'median': median, 'samples': samples, 'recorded': recorded, 'revision': revision}
+    baselines['machine'] = machine_info()
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write('\n')
+    os.replace(tmp, path)
+
+
+def compare(best, baseline, threshold):
+    """(ratio to the baseline, status) for one result."""
+    if baseline is None:
+        return None, 'new'
+    ratio = best / baseline['best']
+    if ratio > threshold:
+        return ratio, 'REGRESSED'
+    if ratio < 1 / threshold:
+        return ratio, 'faster'
+    return ratio, 'ok'
+
+
+def _fmt(seconds):
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f}us'
+    if seconds < 1:
+        return f'{seconds * 1e3:.1f}ms'
+    return f'{seconds:.2f}s'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--cases', nargs='+', help='case names or prefixes (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='samples per case')
+    parser.add_argument('--budget', type=float, default=30.0, help='stop sampling a case after this many seconds')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio that counts as a regression')
+    parser.add_argument('--baselines', default=DEFAULT_BASELINES)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='where generated fixtures are kept')
+    parser.add_argument('--save', action='store_true',
+                        help='record each result as the new baseline as soon as it is measured')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 when a case regressed')
+    args = parser.parse_args()
+
+    selected = [name for name in CASES if not args.cases
+                or any(name == prefix or name.startswith(prefix + '.') for prefix in args.cases)]
+    if not selected:
+        parser.error(f"no case matches {args.cases}; cases: {', '.join(CASES)}")
+    baselines = load_baselines(args.baselines)
+    if baselines['machine'] and baselines['machine'] != machine_info():
+        print(f"warning: baselines were recorded on {baselines['machine']}, this is {machine_info()}\n")
+
+    print(f"{'case':<22}{'rows':>12}{'best':>11}{'median':>11}{'baseline':>11}{'ratio':>8}  status")
+    results, regressed = {}, []
+    revision = git_revision()
+    for n_rows in sorted(args.sizes):
+        data = Data(args.data_dir, n_rows)
+        for name in selected:
+            setup, sizes = CASES[name]
+            if n_rows not in sizes:
+                continue
+            best, median, samples = measure(setup(data), args.repeat, args.budget)
+            results[(name, n_rows)] = (best, median, samples)
+            baseline = baselines['results'].get(name, {}).get(str(n_rows))
+            if args.save:
+                # Written per result, so an interrupted 10M run keeps what it measured
+                save_baselines(args.baselines, baselines, {(name, n_rows): results[(name, n_rows)]}, revision)
+            ratio, status = compare(best, baseline, args.threshold)
+            if status == 'REGRESSED':
+                regressed.append((name, n_rows))
+            print(f"{name:<22}{n_rows:>12,}{_fmt(best):>11}{_fmt(median):>11}"
+                  f"{_fmt(baseline and baseline['best']):>11}{'-' if ratio is None else f'{ratio:.2f}x':>8}  {status}",
+                  flush=True)
+
+    if args.save:
+        print(f"\nRecorded {len(results)} results in {args.baselines}")
+    if regressed:
+        print(f"\n{len(regressed)} regressed by more than {args.threshold:.2f}x: "
+              + ', '.join(f'{name} @ {n:,}' for name, n in regressed))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Synthetic flight rows shaped like the dashboard's processed CSV.
+
+Values are drawn to roughly match the real sample: encoded Origin/Dest ids,
+float flight numbers, metric Meteostat weather and a weatherScore that is
+zero for most flights. make_joined() adds the BTS outcome columns of the
+joined flight+weather data the modeling notebook starts from, and
+write_flights_csv() writes processed rows of any size a chunk at a time.
+make_hourly() and make_lookups() build Meteostat hourly rows and as-of
+lookups for the hourly weather join, and polars_asof() is its reference.
+Nothing here has import-time side effects; tests import it too.
+"""
+import gzip
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+N_ORIGINS = 21   # len(label_encoders['Origin'].classes_)
+N_DESTS = 80
+
+
+def make_flights(n_rows, seed=42):
+    """Returns a DataFrame of `n_rows` synthetic processed flight rows."""
+    rng = np.random.default_rng(seed)
+
+    dates = pd.to_datetime('2015-01-01') + pd.to_timedelta(rng.integers(0, 4018, n_rows), unit='D')
+    dep_hour = rng.integers(5, 23, n_rows)
+    dep_time = dep_hour * 100 + rng.choice([0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55], n_rows)
+    block_minutes = rng.integers(45, 300, n_rows)
+    arr_total = (dep_hour * 60 + dep_time % 100 + block_minutes) % 1440
+    arr_time = (arr_total // 60) * 100 + arr_total % 60
+
+    # Roughly 85% of flights carry no weather impact at all
+    impacted = rng.random(n_rows) < 0.15
+    weather_score = np.where(impacted, np.clip(rng.gamma(2.0, 12.0, n_rows), 0.1, 100.0), 0.0)
+    weather_score[impacted & (rng.random(n_rows) < 0.02)] = 100.0
+
+    tavg = rng.normal(20.0, 8.0, n_rows)
+    spread = rng.uniform(4.0, 14.0, n_rows)
+
+    return pd.DataFrame({
+        'Year': dates.year.astype(np.int64),
+        'Quarter': dates.quarter.astype(np.int64),
+        'Month': dates.month.astype(np.int64),
+        'DayofMonth': dates.day.astype(np.int64),
+        'DayOfWeek': (dates.dayofweek + 1).astype(np.int64),
+        'FlightDate': dates.strftime('%Y-%m-%d'),
+        'Flight_Number_Reporting_Airline': rng.integers(1, 6000, n_rows).astype(np.float64),
+        'Origin': rng.integers(0, N_ORIGINS, n_rows).astype(np.float64),
+        'Dest': rng.integers(0, N_DESTS, n_rows).astype(np.float64),
+        'CRSDepTime': dep_time.astype(np.int64),
+        'CRSArrTime': arr_time.astype(np.int64),
+        'Distance': rng.gamma(2.5, 300.0, n_rows).round(),
+        'tavg': tavg.round(1),
+        'tmin': (tavg - spread / 2).round(1),
+        'tmax': (tavg + spread / 2).round(1),
+        'prcp': np.where(rng.random(n_rows) < 0.7, 0.0, rng.exponential(6.0, n_rows)).round(1),
+        'snow': np.where(rng.random(n_rows) < 0.97, 0.0, rng.exponential(20.0, n_rows)).round(0),
+        'wspd': rng.gamma(3.0, 5.0, n_rows).round(1),
+        'pres': rng.normal(1013.0, 7.0, n_rows).round(1),
+        'weatherScore': weather_score,
+    })
+
+
+def write_flights_csv(path, n_rows, seed=42, chunk_rows=1_000_000, extra_columns=0):
+    """Writes `n_rows` make_flights() rows to a gzip CSV, holding one chunk in memory at a time."""
+    rng = np.random.default_rng(seed)
+    with gzip.open(path, 'wt', compresslevel=1, newline='') as out:
+        for i, start in enumerate(range(0, n_rows, chunk_rows)):
+            df = make_flights(min(chunk_rows, n_rows - start), seed=seed + i)
+            for j in range(extra_columns):
+                df[f'extra_{j}'] = rng.random(len(df)).round(3)
+            df.to_csv(out, index=False, header=i == 0)
+
+
+ORIGIN_IATA = np.array([
+    "PHX", "TUS", "ABQ", "DAL", "HOU", "AUS", "SAT", "ELP", "LBB", "MAF", "HRL",
+    "OKC", "TUL", "LAX", "SAN", "OAK", "SJC", "BUR", "SNA", "ONT", "SMF",
+])
+HOURLY_AIRPORTS = sorted(ORIGIN_IATA.tolist())
+OTHER_AIRPORTS = ['ATL', 'ORD', 'DEN', 'SEA']   # destinations without SW weather
+
+
+def make_joined(n_rows, seed=42, extra_columns=0):
+    """Synthetic joined BTS + daily weather rows (IATA codes, delays, cancellations)."""
+    df = make_flights(n_rows, seed)
+    rng = np.random.default_rng(seed + 1)
+
+    origin = df['Origin'].to_numpy().astype(np.int64)
+    dest = df['Dest'].to_numpy().astype(np.int64)
+    cancelled = (rng.random(n_rows) < 0.015).astype(np.float64)
+    diverted = ((rng.random(n_rows) < 0.003) & (cancelled == 0)).astype(np.float64)
+    delay = np.where(rng.random(n_rows) < 0.65, 0.0, rng.exponential(25.0, n_rows).round())
+    delay[cancelled == 1] = np.nan
+    code = np.where(cancelled == 1, rng.choice(np.array(['A', 'B', 'C']), n_rows), None)
+
+    df = df.drop(columns=['weatherScore'])
+    df['Reporting_Airline'] = 'WN'
+    df['Origin'] = ORIGIN_IATA[origin]
+    df['Dest'] = np.char.add('D', (dest + 10).astype(str))
+    df['OriginAirportID'] = 10_000 + origin
+    df['DestAirportID'] = 10_000 + N_ORIGINS + dest
+    df['DepDelayMinutes'] = delay
+    df['DepDel15'] = np.where(np.isnan(delay), np.nan, (delay >= 15).astype(np.float64))
+    df['Cancelled'] = cancelled
+    df['Diverted'] = diverted
+    df['CancellationCode'] = code
+    df['WeatherDelay'] = np.where(rng.random(n_rows) < 0.05, rng.exponential(30.0, n_rows).round(), np.nan)
+    if extra_columns:
+        extra = pd.DataFrame(rng.random((n_rows, extra_columns)).round(3),
+                             columns=[f'extra_{i}' for i in range(extra_columns)])
+        df = pd.concat([df, extra], axis=1)
+    return df
+
+
+def split_days(df, n_days):
+    """History before the last `n_days` days, and one frame per remaining day."""
+    dates = pd.to_datetime(df['FlightDate'])
+    days = np.sort(dates.unique())[-n_days:]
+    history = df[dates < days[0]]
+    return history, [df[dates == day] for day in days]
+
+
+# ==========================================
+# HOURLY WEATHER
+# ==========================================
+def make_hourly(seed=0, missing=0.03, start='2015-01-01', end='2025-12-31 23:00'):
+    """UTC hourly rows for every SW airport, 2015-2025 by default, with a few hours missing."""
+    rng = np.random.default_rng(seed)
+    hours = pd.date_range(start, end, freq='h')
+    n = len(hours) * len(HOURLY_AIRPORTS)
+    df = pd.DataFrame({
+        'airport': np.repeat(HOURLY_AIRPORTS, len(hours)), 'date': np.tile(hours, len(HOURLY_AIRPORTS)),
+        'temp': rng.normal(20, 8, n).round(1), 'dwpt': rng.normal(8, 6, n).round(1),
+        'rhum': rng.uniform(5, 100, n).round(), 'prcp': rng.exponential(0.2, n).round(1),
+        'snow': np.zeros(n), 'wdir': rng.integers(0, 360, n).astype(float),
+        'wspd': rng.gamma(2.0, 8.0, n).round(1), 'wpgt': np.full(n, np.nan),
+        'pres': rng.normal(1013, 6, n).round(1), 'coco': rng.integers(1, 27, n).astype(float),
+    })
+    return df[rng.random(n) >= missing].reset_index(drop=True)
+
+
+def make_lookups(n, seed=1, start='2015-01-01', days=4018):
+    """(airports, dates, HHMM clock) for `n` flights, some at airports without observations."""
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64(start) + rng.integers(0, days, n).astype('timedelta64[D]')
+    clock = rng.integers(0, 24, n) * 100 + rng.integers(0, 60, n)
+    return rng.choice(HOURLY_AIRPORTS + OTHER_AIRPORTS, n).astype(object), dates, clock
+
+
+def polars_asof(observations, airports, minutes, tolerance):
+    """Polars join_asof (by airport, backward) of local-minute lookups; wspd and temp per row."""
+    import polars as pl
+
+    flights = pl.DataFrame({'row': np.arange(len(minutes)), 'Origin': airports.astype(str),
+                            'time': minutes.astype('datetime64[m]').astype('datetime64[us]')})
+    obs = pl.from_pandas(observations[['airport', 'date', 'wspd', 'temp']]) \
+        .with_columns(pl.col('date').cast(pl.Datetime('us')))
+    with warnings.catch_warnings():
+        # Sorted by time; Polars cannot verify that within 'by' groups
+        warnings.filterwarnings('ignore', message='Sortedness of columns')
+        joined = flights.sort('time').join_asof(obs.sort('date'), left_on='time', right_on='date',
+                                                by_left='Origin', by_right='airport', strategy='backward',
+                                                tolerance=f'{tolerance}m')
+    return joined.sort('row')
@@ -0,0 +1,7 @@
+"""Puts the repo's script directories on sys.path, as the benchmarks do."""
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for directory in ('Dashboard', 'Data', 'Modeling', 'benchmarks'):
+    sys.path.insert(0, os.path.join(ROOT, directory))
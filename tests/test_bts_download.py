@@ -0,0 +1,158 @@
+import functools
+import io
+import os
+import threading
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+import bts_download
+
+OTHER_AIRPORTS = ['ATL', 'ORD', 'DEN']
+
+
+def make_month_csv(year, month, n_rows, seed=0):
+    """A small BTS-shaped month: BTS_COLUMNS, a filler column and the trailing empty one."""
+    rng = np.random.default_rng(seed)
+    airports = sorted(bts_download.SOUTHWEST_STATE_AIRPORTS) + OTHER_AIRPORTS
+    frame = pd.DataFrame({name: rng.integers(0, 2400, n_rows).astype(str) for name in bts_download.BTS_COLUMNS})
+    frame['Year'], frame['Month'] = str(year), str(month)
+    frame['Reporting_Airline'] = rng.choice(['WN', 'AA', 'DL'], n_rows)
+    frame['Origin'] = rng.choice(airports, n_rows)
+    frame['CancellationCode'] = rng.choice(['', 'A'], n_rows)
+    frame['Div1Airport'] = ''
+    frame[''] = ''
+    return frame.to_csv(index=False)
+
+
+def write_zip(path, text):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr(os.path.basename(path).replace('.zip', '.csv'), text)
+
+
+def full_read_filter(zip_path):
+    """The notebook's path: read the whole CSV, then filter."""
+    with zipfile.ZipFile(zip_path) as z:
+        df = pd.read_csv(io.BytesIO(z.read(z.namelist()[0])), dtype=str, keep_default_na=False)
+    df = df[(df['Reporting_Airline'] == 'WN') & df['Origin'].isin(bts_download.SOUTHWEST_STATE_AIRPORTS)]
+    return df[bts_download.BTS_COLUMNS].reset_index(drop=True)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serves tmp_path/serve on localhost; `failures[path]` 503s to send before serving a file."""
+    serve_dir = tmp_path / 'serve'
+    serve_dir.mkdir()
+    failures, seen = {}, []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.path)
+            if failures.get(self.path, 0) > 0:
+                failures[self.path] -= 1
+                self.send_error(503)
+                return
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(Handler, directory=str(serve_dir)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield {'dir': serve_dir, 'url': f"http://127.0.0.1:{httpd.server_address[1]}",
+           'failures': failures, 'seen': seen}
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(bts_download.time, 'sleep', delays.append)
+    return delays
+
+
+def test_fetch_streams_the_body_to_disk(server, tmp_path, monkeypatch):
+    body = os.urandom(300_000)
+    (server['dir'] / 'month.zip').write_bytes(body)
+    blocks = []
+    iter_content = requests.Response.iter_content
+
+    def recording_iter_content(response, chunk_size=1, decode_unicode=False):
+        for block in iter_content(response, chunk_size, decode_unicode):
+            blocks.append(len(block))
+            yield block
+    monkeypatch.setattr(requests.Response, 'iter_content', recording_iter_content)
+
+    dest = str(tmp_path / 'month.zip')
+    bts_download.fetch_to_file(f"{server['url']}/month.zip", dest, chunk_bytes=64 * 1024)
+    with open(dest, 'rb') as f:
+        assert f.read() == body
+    assert len(blocks) > 1 and max(blocks) <= 64 * 1024
+    assert not os.path.exists(dest + '.part')
+
+
+def test_fetch_retries_503_with_exponential_backoff(server, tmp_path, sleeps):
+    (server['dir'] / 'month.zip').write_bytes(b'zip')
+    server['failures']['/month.zip'] = 3
+    dest = str(tmp_path / 'month.zip')
+    bts_download.fetch_to_file(f"{server['url']}/month.zip", dest, retries=4, backoff=1.0)
+    assert server['seen'] == ['/month.zip'] * 4
+    assert len(sleeps) == 3
+    for attempt, delay in enumerate(sleeps):
+        assert 0.5 * 2 ** attempt <= delay < 1.5 * 2 ** attempt
+
+
+def test_fetch_gives_up_once_retries_run_out(server, tmp_path, sleeps):
+    (server['dir'] / 'month.zip').write_bytes(b'zip')
+    server['failures']['/month.zip'] = 10
+    dest = str(tmp_path / 'month.zip')
+    with pytest.raises(requests.exceptions.HTTPError):
+        bts_download.fetch_to_file(f"{server['url']}/month.zip", dest, retries=2, backoff=1.0)
+    assert len(server['seen']) == 3 and len(sleeps) == 2
+    assert not os.path.exists(dest) and not os.path.exists(dest + '.part')
+
+
+def test_fetch_does_not_retry_404(server, tmp_path, sleeps):
+    with pytest.raises(requests.exceptions.HTTPError):
+        bts_download.fetch_to_file(f"{server['url']}/missing.zip", str(tmp_path / 'missing.zip'))
+    assert len(server['seen']) == 1 and not sleeps
+
+
+def test_filter_zip_matches_a_full_read_across_chunks(tmp_path):
+    zip_path = str(tmp_path / 'month.zip')
+    write_zip(zip_path, make_month_csv(2019, 1, 2_000))
+    out_path = str(tmp_path / 'out.csv')
+    n_rows = bts_download.filter_zip(zip_path, out_path, chunksize=300)
+    expected = full_read_filter(zip_path)
+    assert n_rows == len(expected) > 0
+    pd.testing.assert_frame_equal(pd.read_csv(out_path, dtype=str, keep_default_na=False), expected)
+
+
+def test_filter_zip_writes_a_header_when_nothing_matches(tmp_path):
+    zip_path = str(tmp_path / 'month.zip')
+    write_zip(zip_path, make_month_csv(2019, 1, 500))
+    out_path = str(tmp_path / 'out.csv')
+    assert bts_download.filter_zip(zip_path, out_path, airline='XX', chunksize=100) == 0
+    with open(out_path) as f:
+        assert f.read().strip().split(',') == bts_download.BTS_COLUMNS
+
+
+def test_download_month_reports_errors_and_reruns_skip_present_months(server, tmp_path, sleeps):
+    write_zip(str(server['dir'] / bts_download.ZIP_NAME.format(year=2019, month=1)), make_month_csv(2019, 1, 800))
+    out_dir = str(tmp_path / 'out')
+    server['failures']['/' + bts_download.ZIP_NAME.format(year=2019, month=1)] = 1
+
+    result = bts_download.download_month(2019, 1, out_dir, base_url=server['url'])
+    assert result['error'] is None and result['rows'] > 0 and len(sleeps) == 1
+    assert not os.listdir(os.path.join(out_dir, '.downloads'))
+
+    missing = bts_download.download_month(2019, 2, out_dir, base_url=server['url'])
+    assert missing['error'] == 'HTTP 404' and len(sleeps) == 1
+
+    # Present months are skipped before any worker is started
+    assert bts_download.download_months([(2019, 1)], out_dir, base_url=server['url']) == ([], [(2019, 1)])
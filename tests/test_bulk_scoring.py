@@ -0,0 +1,54 @@
+import io
+import os
+import wsgiref.util
+
+import pandas as pd
+
+from bulk_scoring import DEFAULT_CHUNKSIZE, new_result_path, read_result, remove_expired
+from service import app
+from synthetic import make_flights
+
+
+def post_csv(body):
+    environ = {'REQUEST_METHOD': 'POST', 'PATH_INFO': '/score/csv', 'CONTENT_LENGTH': str(len(body)),
+               'wsgi.input': io.BytesIO(body)}
+    wsgiref.util.setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, headers):
+        response['status'], response['headers'] = status, dict(headers)
+    response['body'] = b''.join(app(environ, start_response))
+    return response
+
+
+def test_score_csv_sends_the_whole_file():
+    schedule = make_flights(1000, seed=3)
+    response = post_csv(schedule.to_csv(index=False).encode())
+    assert response['status'] == '200 OK'
+    assert int(response['headers']['Content-Length']) == len(response['body'])
+    assert len(pd.read_csv(io.BytesIO(response['body']))) == 1000
+
+
+def test_score_csv_rejects_a_bad_row_after_the_first_chunk():
+    text = make_flights(DEFAULT_CHUNKSIZE + 100, seed=3).to_csv(index=False)
+    text += '1,2,3' + ',4' * 40 + '\n'
+    response = post_csv(text.encode())
+    assert response['status'] == '400 Bad Request'
+    assert b'invalid schedule' in response['body']
+
+
+def test_remove_expired_keeps_fresh_files(tmp_path):
+    old, fresh = new_result_path('.csv', str(tmp_path)), new_result_path('.csv', str(tmp_path))
+    os.utime(old, (0, 0))
+    assert remove_expired(str(tmp_path), ttl=3600) == 1
+    assert not os.path.exists(old) and os.path.exists(fresh)
+    assert read_result(old) == b''
+    assert remove_expired(str(tmp_path / 'missing')) == 0
+
+
+def test_read_result_refuses_files_over_the_download_limit(tmp_path):
+    path = new_result_path('.csv', str(tmp_path))
+    with open(path, 'wb') as f:
+        f.write(b'x' * (1024 * 1024 + 1))
+    assert read_result(path, max_mb=1) == b''
+    assert len(read_result(path, max_mb=2)) == 1024 * 1024 + 1
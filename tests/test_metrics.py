@@ -0,0 +1,88 @@
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def enabled():
+    was_enabled = metrics.is_enabled()
+    metrics.reset()
+    metrics.set_enabled(True)
+    yield
+    metrics.reset()
+    metrics.set_enabled(was_enabled)
+
+
+@pytest.fixture
+def check(enabled):
+    hist = metrics.histogram('check')
+    for seconds in [0.00005] * 50 + [0.003] * 40 + [0.2] * 9 + [20.0]:
+        hist.observe(seconds)
+    return hist
+
+
+def test_buckets_and_quantiles(check):
+    counts, count, total, maximum = check.snapshot()
+    assert count == 100 and maximum == 20.0 and abs(total - (0.0025 + 0.12 + 1.8 + 20.0)) < 1e-9
+    assert counts[0] == 50 and counts[metrics.BUCKETS.index(0.005)] == 40 and counts[-1] == 1
+    # Median falls at the top of the first bucket; p95 inside (0.1, 0.25]
+    assert abs(check.quantile(0.5) - 0.0001) < 1e-12 and 0.1 < check.quantile(0.95) <= 0.25
+
+
+def test_decorator_and_timer_record(enabled):
+    @metrics.timed('decorated')
+    def fail():
+        raise ValueError
+    with pytest.raises(ValueError):
+        fail()
+    with metrics.timer('block'):
+        pass
+    assert metrics.histogram('decorated').count == 1 and metrics.histogram('block').count == 1
+
+
+def test_prometheus_dump(check, tmp_path):
+    text = metrics.render_prometheus()
+    assert '# TYPE dashboard_check_seconds histogram' in text
+    assert 'dashboard_check_seconds_bucket{le="0.0001"} 50' in text
+    assert 'dashboard_check_seconds_bucket{le="+Inf"} 100' in text
+    assert 'dashboard_check_seconds_count 100' in text
+    buckets = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+               if line.startswith('dashboard_check_seconds_bucket')]
+    assert buckets == sorted(buckets)
+
+    path = metrics.write_prometheus(str(tmp_path / 'dashboard_metrics.prom'))
+    with open(path) as file:
+        assert file.read() == text
+    assert metrics.write_prometheus_if_due(path, interval=3600) is None
+
+
+def test_nothing_recorded_while_off(enabled):
+    metrics.set_enabled(False)
+    noop = metrics.timed('off')(lambda: None)
+    noop()
+    with metrics.timer('off'):
+        pass
+    assert not metrics.HISTOGRAMS and metrics.summary_frame().empty
+
+
+def test_disabled_path_never_reads_the_clock(enabled, monkeypatch):
+    metrics.set_enabled(False)
+
+    def clock():
+        raise AssertionError('perf_counter called while metrics are off')
+    monkeypatch.setattr(metrics.time, 'perf_counter', clock)
+
+    assert metrics.timer('off') is metrics.timer('other') is metrics._NOOP
+    with metrics.timer('off'):
+        pass
+
+    calls = []
+
+    def func(*args, **kwargs):
+        calls.append((args, kwargs))
+        return 'result'
+    wrapped = metrics.timed('off')(func)
+    assert wrapped(1, key=2) == 'result'
+    assert calls == [((1,), {'key': 2})]
+    assert wrapped.__wrapped__ is func
+    assert not metrics.HISTOGRAMS
@@ -0,0 +1,36 @@
+import warnings
+
+import lightgbm
+import numpy as np
+import pytest
+
+from features import DASHBOARD_FEATURES
+from predictor import MODEL_INPUT_NAMES, load_delay_model
+
+
+def save_booster(path, feature_names, n_rows=500):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n_rows, len(feature_names)))
+    y = X[:, 0] + rng.normal(scale=0.1, size=n_rows)
+    booster = lightgbm.train({'verbose': -1, 'num_leaves': 4},
+                             lightgbm.Dataset(X, label=y, feature_name=list(feature_names)), num_boost_round=5)
+    booster.save_model(str(path))
+
+
+def test_dashboard_features_are_buildable():
+    assert set(DASHBOARD_FEATURES) <= MODEL_INPUT_NAMES
+
+
+def test_dashboard_feature_model_loads_quietly(tmp_path):
+    save_booster(tmp_path / 'model.txt', DASHBOARD_FEATURES)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        model = load_delay_model(str(tmp_path / 'model.txt'))
+    assert model.unbuildable == []
+
+
+def test_warns_on_features_the_dashboard_cannot_build(tmp_path):
+    save_booster(tmp_path / 'model.txt', ['wspd', 'NumDepartures', 'RouteDelayMean_7d'])
+    with pytest.warns(UserWarning, match='NumDepartures, RouteDelayMean_7d'):
+        model = load_delay_model(str(tmp_path / 'model.txt'))
+    assert model.unbuildable == ['NumDepartures', 'RouteDelayMean_7d']
@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+import rolling
+from synthetic import make_joined, split_days
+
+
+@pytest.fixture(scope='module')
+def joined():
+    return make_joined(50_000, seed=3)
+
+
+def test_day_by_day_appends_match_a_full_recompute(joined):
+    expected = rolling.rolling_features(joined)
+    history, days = split_days(joined, 5)
+    state = None
+    for chunk in [history] + days:
+        got, state = rolling.append_rows(state, chunk)
+        pd.testing.assert_frame_equal(got, expected.loc[chunk.index], check_dtype=False)
+
+
+def test_reappending_a_day_is_rejected(joined):
+    history, days = split_days(joined, 1)
+    _, state = rolling.append_rows(None, history)
+    _, state = rolling.append_rows(state, days[0])
+    with pytest.raises(ValueError):
+        rolling.append_rows(state, days[0])
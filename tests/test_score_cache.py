@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+
+from score_cache import QUANTA, ScoreCache, cached_predict_row, cached_risk_score, dequantize, quantize
+from scoring import calculate_risk_score
+
+# Heuristic thresholds per input, and offsets within a quantization step of them
+THRESHOLDS = {'wspd': (25, 40), 'prcp': (0, 15), 'snow': (0,), 'pres': (1005, 1020),
+              'dep_time': (1800,), 'distance': (2000,)}
+OFFSETS = (-0.2, -0.004, -0.0001, 0.0, 0.0001, 0.004, 0.2)
+BASE = {'wspd': 10.0, 'prcp': 0.0, 'snow': 0.0, 'pres': 1010.0, 'dep_time': 1200.0, 'distance': 500.0}
+
+
+def split(values):
+    weather = {name: values[name] for name in ('wspd', 'prcp', 'snow', 'pres')}
+    return weather, {'dep_time': values['dep_time'], 'distance': values['distance']}
+
+
+def test_thresholds_are_multiples_of_their_step():
+    for name, step in QUANTA:
+        assert all(threshold % step == 0 for threshold in THRESHOLDS[name]), name
+
+
+def test_quantized_inputs_score_like_the_raw_ones():
+    for name, thresholds in THRESHOLDS.items():
+        for threshold, offset in itertools.product(thresholds, OFFSETS):
+            values = dict(BASE, **{name: threshold + offset})
+            quantized = dict(zip(BASE, dequantize(quantize(**values))))
+            assert calculate_risk_score(*split(quantized)) == calculate_risk_score(*split(values)), \
+                (name, threshold + offset)
+
+
+def test_hits_match_fresh_scores_near_thresholds():
+    cache = ScoreCache()
+    for name, thresholds in THRESHOLDS.items():
+        for threshold, first, second in itertools.product(thresholds, OFFSETS, OFFSETS):
+            cache.clear()
+            for offset in (first, second):
+                weather, flight = split(dict(BASE, **{name: threshold + offset}))
+                assert cached_risk_score(cache, weather, flight) == calculate_risk_score(weather, flight), \
+                    (name, threshold + first, threshold + second)
+
+
+def test_nearby_inputs_share_an_entry():
+    cache = ScoreCache()
+    for wspd in (30.01, 30.1, 30.2, 30.25):
+        weather, flight = split(dict(BASE, wspd=wspd))
+        assert cached_risk_score(cache, weather, flight) == 15.0
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert quantize(np.nan, 0, 0, 1010, 1200, 500) == quantize(np.nan, 0, 0, 1010.5, 1200, 500)
+
+
+def test_heuristic_row_without_model():
+    row = {'wspd': 45.0, 'prcp': 0.004, 'snow': 0.0, 'pres': 1010.0, 'CRSDepTime': 1900, 'Distance': 500}
+    assert cached_predict_row(ScoreCache(), None, row) == (45.0, 'risk score')
@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from scoring import FRAME_COLUMNS, calculate_risk_score, calculate_risk_scores, risk_terms, score_frame
+
+nan = np.nan
+# Each threshold, the closest value on its other side, and NaN
+EDGES = {
+    'wspd': (nan, 25, np.nextafter(25, 99), 40, np.nextafter(40, 99)),
+    'prcp': (nan, 0, np.nextafter(0, 1), 15, np.nextafter(15, 99)),
+    'snow': (nan, 0, np.nextafter(0, 1)),
+    'pres': (nan, np.nextafter(1005, 0), 1005, 1020, np.nextafter(1020, 2000)),
+    'dep_time': (nan, 1800, 1801),
+    'distance': (nan, 2000, np.nextafter(2000, 3000)),
+}
+
+
+def if_elif_score(wspd, prcp, snow, pres, dep_time, distance):
+    """The dashboard's original scalar if/elif heuristic."""
+    risk = 0.0
+    if wspd > 40:
+        risk += 30
+    elif wspd > 25:
+        risk += 15
+    if prcp > 15:
+        risk += 35
+    elif prcp > 0:
+        risk += 10
+    if snow > 0:
+        risk += 40
+    if pres < 1005:
+        risk += 25
+    elif pres > 1020:
+        risk += 10
+    if dep_time > 1800:
+        risk += 5
+    if distance > 2000:
+        risk += 5
+    return max(0.0, min(100.0, risk))
+
+
+def edge_grid():
+    return pd.DataFrame(list(itertools.product(*EDGES.values())), columns=list(EDGES))
+
+
+def test_batch_matches_the_scalar_heuristic_on_every_edge():
+    grid = edge_grid()
+    expected = np.array([if_elif_score(*row) for row in grid.itertuples(index=False)])
+    np.testing.assert_array_equal(calculate_risk_scores(*(grid[name] for name in EDGES)), expected)
+
+    frame = grid.rename(columns={'dep_time': FRAME_COLUMNS['dep_time'], 'distance': FRAME_COLUMNS['distance']})
+    np.testing.assert_array_equal(score_frame(frame), expected)
+
+    scalar = [calculate_risk_score({'wspd': w, 'prcp': p, 'snow': s, 'pres': b},
+                                   {'dep_time': t, 'distance': d})
+              for w, p, s, b, t, d in grid.itertuples(index=False)]
+    np.testing.assert_array_equal(scalar, expected)
+
+
+def test_missing_values_add_nothing():
+    terms = risk_terms(nan, nan, nan, nan, nan, nan)
+    assert all(points == 0 for points in terms.values())
+    assert calculate_risk_score({'wspd': 50, 'prcp': nan, 'snow': nan, 'pres': nan},
+                                {'dep_time': nan, 'distance': nan}) == 30.0
+
+
+def test_scores_are_clipped_to_100():
+    assert calculate_risk_score({'wspd': 50, 'prcp': 20, 'snow': 5, 'pres': 990},
+                                {'dep_time': 2000, 'distance': 2500}) == 100.0
+
+
+def test_score_frame_reads_nullable_columns():
+    frame = pd.DataFrame({'wspd': pd.array([30.0, None], dtype='Float64'), 'prcp': [0.0, 1.0],
+                          'snow': [0.0, 0.0], 'pres': [1010.0, 1010.0],
+                          'CRSDepTime': pd.array([1900, None], dtype='Int64'), 'Distance': [500.0, 500.0]})
+    np.testing.assert_array_equal(score_frame(frame), [20.0, 10.0])
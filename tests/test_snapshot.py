@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from flight_store import build_store
+from snapshot import ENCODERS_PATH, load_snapshot, read_manifest, snapshot_params, stale_reason, write_snapshot
+from synthetic import ORIGIN_IATA, write_flights_csv
+
+AIRPORT_NAMES = {code: f'{code} International ({code})' for code in ORIGIN_IATA}
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'flights.csv.gz')
+    write_flights_csv(path, 20_000)
+    return path
+
+
+def build(csv_path, store_dir, out):
+    return write_snapshot(csv_path, store_dir, out, encoders_path=ENCODERS_PATH, airport_names=AIRPORT_NAMES)
+
+
+def test_touched_csv_is_fresh_and_changed_csv_is_stale(csv_path, tmp_path):
+    out, params = str(tmp_path / 'snapshot'), snapshot_params()
+    build(csv_path, str(tmp_path / 'no_store'), out)
+
+    stat = os.stat(csv_path)
+    os.utime(csv_path, (stat.st_atime, stat.st_mtime + 60))
+    assert stale_reason(read_manifest(out), csv_path, params) is None
+    assert stale_reason(read_manifest(out), csv_path, snapshot_params(seed=7)) is not None
+    with open(csv_path, 'ab') as file:
+        file.write(b'\0')
+    assert stale_reason(read_manifest(out), csv_path, params) is not None
+    assert load_snapshot(out, csv_path, params) is None
+
+
+def test_store_built_after_the_snapshot_is_stale(csv_path, tmp_path):
+    out, store_dir, params = str(tmp_path / 'snapshot'), str(tmp_path / 'flight_store'), snapshot_params()
+    build(csv_path, store_dir, out)
+    assert read_manifest(out)['store'] is None
+    assert load_snapshot(out, csv_path, params, store_dir) is not None
+
+    build_store(csv_path, store_dir)
+    assert stale_reason(read_manifest(out), csv_path, params, store_dir) == 'flight_store was built after the snapshot'
+    assert load_snapshot(out, csv_path, params, store_dir) is None
+
+
+def test_changed_store_is_stale(csv_path, tmp_path):
+    out, store_dir, params = str(tmp_path / 'snapshot'), str(tmp_path / 'flight_store'), snapshot_params()
+    build_store(csv_path, store_dir)
+    build(csv_path, store_dir, out)
+    assert stale_reason(read_manifest(out), csv_path, params, store_dir) is None
+
+    # Touching every file keeps it fresh; rebuilding from other data does not
+    for root, _, names in os.walk(store_dir):
+        for name in names:
+            os.utime(os.path.join(root, name))
+    assert stale_reason(read_manifest(out), csv_path, params, store_dir) is None
+    other_csv = str(tmp_path / 'other.csv.gz')
+    write_flights_csv(other_csv, 20_000, seed=7)
+    build_store(other_csv, store_dir)
+    assert stale_reason(read_manifest(out), csv_path, params, store_dir).startswith('flight_store changed')
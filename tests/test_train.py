@@ -0,0 +1,37 @@
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip('optuna')
+
+from features import DASHBOARD_FEATURES, NOTEBOOK_FEATURES  # noqa: E402
+from predictor import load_delay_model  # noqa: E402
+from train import feature_subset, train  # noqa: E402
+
+
+def make_split(n_rows=2000):
+    rng = np.random.default_rng(0)
+    X = rng.integers(1, 12, size=(n_rows, len(NOTEBOOK_FEATURES))).astype(np.float32)
+    y = np.log1p(X[:, NOTEBOOK_FEATURES.index('wspd')] + rng.exponential(5.0, n_rows))
+    half = n_rows // 2
+    return {'X_train': X[:half], 'y_train': y[:half], 'X_valid': X[half:], 'y_valid': y[half:],
+            'feature_names': list(NOTEBOOK_FEATURES), 'partition': {'source': 'test'}}
+
+
+def test_feature_subset_keeps_dashboard_features_in_order():
+    split = make_split()
+    subset = feature_subset(split)
+    assert subset['feature_names'] == [name for name in NOTEBOOK_FEATURES if name in DASHBOARD_FEATURES]
+    column = NOTEBOOK_FEATURES.index('wspd')
+    assert np.array_equal(subset['X_valid'][:, subset['feature_names'].index('wspd')], split['X_valid'][:, column])
+
+
+def test_default_fit_is_servable(tmp_path):
+    booster, _, _ = train(feature_subset(make_split()), {'num_leaves': 7}, num_rounds=5,
+                          cache_dir=str(tmp_path / 'lgb_cache'))
+    booster.save_model(str(tmp_path / 'delay_model.txt'))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        model = load_delay_model(str(tmp_path / 'delay_model.txt'))
+    assert model.booster.feature_name() == feature_subset(make_split())['feature_names']
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('optuna')
+
+import tune  # noqa: E402
+from features import NOTEBOOK_FEATURES  # noqa: E402
+
+
+def test_worker_quotas_sum_to_the_remaining_budget():
+    assert tune.worker_quotas(24, 4) == [6, 6, 6, 6]
+    assert tune.worker_quotas(7, 3) == [3, 2, 2]
+    assert tune.worker_quotas(2, 4) == [1, 1]
+
+
+def test_workers_stop_at_the_budget(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.integers(1, 12, size=(600, len(NOTEBOOK_FEATURES))).astype(np.float32)
+    y = np.log1p(X[:, NOTEBOOK_FEATURES.index('wspd')] + rng.exponential(5.0, 600))
+    split = {'X_train': X[:400], 'y_train': y[:400], 'X_valid': X[400:], 'y_valid': y[400:],
+             'feature_names': list(NOTEBOOK_FEATURES), 'partition': {'source': 'test'}}
+    split_dir = str(tmp_path / 'split')
+    tune.save_split(split, split_dir)
+
+    storage = str(tmp_path / 'study.journal')
+    study = tune.tune(split_dir, storage, 'test', n_trials=5, workers=2, cache_dir=str(tmp_path / 'cache'))
+    assert len(study.trials) == tune.finished_trials(study) == 5
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+import weather_join
+from synthetic import make_hourly, make_lookups, polars_asof
+
+
+def test_hand_built_fixture():
+    hourly = pd.DataFrame({
+        'airport': ['LAX', 'LAX', 'PHX', 'PHX'],
+        'date': pd.to_datetime(['2019-07-01 19:00', '2019-07-01 20:00', '2019-07-01 19:00', '2019-07-02 07:00']),
+        'wspd': [10.0, 20.0, 30.0, 40.0],
+    })
+    index = weather_join.HourlyIndex(weather_join.local_observations(hourly))
+    flights = pa.table({
+        'FlightDate': pa.array([datetime(2019, 7, 1).date()] * 7, pa.date32()),
+        'Origin': ['LAX', 'LAX', 'LAX', 'LAX', 'PHX', 'ATL', 'LAX'],
+        'Dest': ['PHX', 'PHX', 'PHX', 'PHX', 'LAX', 'LAX', 'PHX'],
+        'CRSDepTime': [1230, 1300, 1800, 1159, 2400, 1300, 2330],
+        'CRSArrTime': [1400, 1430, 1930, 1330, 100, 1500, 130],
+    })
+    out = weather_join.attach_hourly(flights, index, arrivals=True).to_pandas()
+    nan = np.nan
+    # LAX 12:00/13:00 PDT and PHX 12:00 Jul 1 / 00:00 Jul 2 MST, local time
+    expected_dep = [10, 20, nan, nan, 40, nan, nan]
+    # PHX arrivals see the 12:00 row for 3h; the 01:30 arrival lands on Jul 2
+    # and sees the midnight row; the 01:00 LAX arrival (Jul 2) finds nothing recent
+    expected_arr = [30, 30, nan, 30, nan, 20, 40]
+    np.testing.assert_array_equal(out['dep_wspd'].to_numpy(), np.array(expected_dep, dtype=np.float32))
+    np.testing.assert_array_equal(out['arr_wspd'].to_numpy(), np.array(expected_arr, dtype=np.float32))
+
+
+def test_lookup_matches_polars_join_asof():
+    tolerance = weather_join.TOLERANCE_MINUTES
+    observations = weather_join.local_observations(make_hourly(start='2019-01-01', end='2020-12-31 23:00'))
+    index = weather_join.HourlyIndex(observations)
+
+    airports, dates, clock = make_lookups(200_000, seed=2, start='2019-01-01', days=731)
+    minutes = weather_join._local_minutes(dates, clock)
+    values = index.lookup(airports, minutes, tolerance)
+    reference = polars_asof(observations, airports, minutes, tolerance)
+    for column in ('wspd', 'temp'):
+        np.testing.assert_array_equal(values[:, index.columns.index(column)],
+                                      reference[column].cast(pl.Float32).fill_null(np.nan).to_numpy())
@@ -0,0 +1,81 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+import weather_ingest
+
+AIRPORTS = {'PHX': weather_ingest.SWA_AIRPORTS['PHX'], 'HOU': weather_ingest.SWA_AIRPORTS['HOU']}
+JAN_5 = datetime(2025, 1, 5, 6, 0)
+
+
+class FakeFetch:
+    """Two observations per (airport, year); raises for the pairs in `fail`."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def __call__(self, airport, lat, lon, start, end):
+        self.calls.append((airport, start.year))
+        if (airport, start.year) in self.fail:
+            raise ConnectionError(f"no data for {airport}")
+        return pd.DataFrame({'date': [start, end], 'temp': [10.0, 20.0], 'wspd': [5.0, 7.5]})
+
+
+def ingest(store, fetch, now, **kwargs):
+    return weather_ingest.ingest(str(store), AIRPORTS, 2023, fetch=fetch, max_workers=2, pause=0, now=now, **kwargs)
+
+
+def test_partitions_are_cached_per_airport_and_year(tmp_path):
+    fetch = FakeFetch()
+    results = ingest(tmp_path, fetch, JAN_5)
+    expected = {(airport, year) for airport in AIRPORTS for year in (2023, 2024, 2025)}
+    assert sorted(fetch.calls) == sorted(expected)
+    assert all(r['error'] is None and r['rows'] == 2 for r in results)
+
+    assert ingest(tmp_path, fetch, JAN_5) == [] and len(fetch.calls) == len(expected)
+    weather = weather_ingest.read_weather(str(tmp_path))
+    assert len(weather) == 2 * len(expected)
+    assert set(zip(weather['airport'], weather['year'])) == expected
+
+
+def test_current_and_unsettled_years_are_refetched_when_stale(tmp_path):
+    ingest(tmp_path, FakeFetch(), JAN_5)
+
+    fetch = FakeFetch()
+    ingest(tmp_path, fetch, datetime(2025, 1, 5, 18, 0))
+    assert fetch.calls == []
+
+    # 2024 was fetched before its settle window ended, so it is refetched with 2025
+    ingest(tmp_path, fetch, datetime(2025, 1, 20, 6, 0))
+    assert sorted(fetch.calls) == sorted((airport, year) for airport in AIRPORTS for year in (2024, 2025))
+
+    # Fetched after the window, 2024 is now settled
+    fetch.calls.clear()
+    ingest(tmp_path, fetch, datetime(2025, 1, 22, 6, 0))
+    assert sorted(fetch.calls) == [('HOU', 2025), ('PHX', 2025)]
+
+
+def test_failed_fetches_are_skipped_and_retried_next_run(tmp_path):
+    results = ingest(tmp_path, FakeFetch(fail={('HOU', 2024)}), JAN_5)
+    failed = [r for r in results if r['error']]
+    assert [(r['airport'], r['year'], r['rows']) for r in failed] == [('HOU', 2024, 0)]
+    assert 'no data for HOU' in failed[0]['error']
+    assert not os.path.exists(weather_ingest.partition_path(str(tmp_path), 'HOU', 2024))
+    assert os.path.exists(weather_ingest.partition_path(str(tmp_path), 'PHX', 2024))
+
+    fetch = FakeFetch()
+    results = ingest(tmp_path, fetch, JAN_5)
+    assert fetch.calls == [('HOU', 2024)] and results[0]['error'] is None
+
+
+def test_empty_results_are_stored_and_not_refetched(tmp_path):
+    fetch = FakeFetch()
+
+    def empty(*args):
+        return fetch(*args).iloc[:0]
+
+    ingest(tmp_path, empty, datetime(2024, 3, 1))
+    assert ingest(tmp_path, fetch, datetime(2024, 3, 1, 12, 0)) == []
+    assert len(fetch.calls) == 2 * len(AIRPORTS)